@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api import auth, avcb, dashboard, licenses, reports, residues, users
+from app.api import auth, avcb, dashboard, documents, exports, jobs, licenses, reports, residues, search, users
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
@@ -8,5 +8,9 @@ api_router.include_router(users.router)
 api_router.include_router(licenses.router)
 api_router.include_router(avcb.router)
 api_router.include_router(residues.router)
+api_router.include_router(documents.router)
+api_router.include_router(search.router)
 api_router.include_router(reports.router)
+api_router.include_router(exports.router)
 api_router.include_router(dashboard.router)
+api_router.include_router(jobs.router)
@@ -3,54 +3,64 @@ from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import deps as app_deps
 from app.config import get_settings
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, password_hasher
 from app.crud.user import user_crud
 from app.models.user import PasswordResetToken, User
 from app.schemas.auth import LoginRequest, PasswordResetConfirm, PasswordResetRequest, Token
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.schemas.user import UserCreate, UserRead
 from app.services.email import email_service
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 settings = get_settings()
 
 
+async def _authenticate(db: AsyncSession, email: str, password: str) -> User:
+    """Confere a senha no pool do bcrypt e, se o custo configurado mudou, grava o novo hash."""
+    user = await db.run_sync(user_crud.get_by_email, email)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
+    valid, new_hash = await password_hasher.verify_and_update_async(password, user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
+    if new_hash:
+        await db.run_sync(user_crud.set_password_hash, user, new_hash)
+    return user
+
+
+def _token_for(user: User) -> Token:
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    access_token = create_access_token(subject=str(user.id), expires_delta=access_token_expires)
+    return Token(access_token=access_token)
+
+
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_user(user_in: UserCreate, db: Session = Depends(app_deps.get_db)) -> User:
-    existing_user = user_crud.get_by_email(db, user_in.email)
+async def register_user(user_in: UserCreate, db: AsyncSession = Depends(app_deps.get_async_db)) -> User:
+    existing_user = await db.run_sync(user_crud.get_by_email, user_in.email)
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="E-mail já cadastrado")
-    user = user_crud.create(db, user_in)
-    return user
+    hashed_password = await password_hasher.hash_async(user_in.password)
+    return await db.run_sync(user_crud.create, user_in, hashed_password)
 
 
 @router.post("/login", response_model=Token)
-def login_user(
+async def login_user(
     login_in: LoginRequest,
-    db: Session = Depends(app_deps.get_db),
+    db: AsyncSession = Depends(app_deps.get_async_db),
 ) -> Token:
-    user = user_crud.get_by_email(db, login_in.email)
-    if not user or not verify_password(login_in.password, user.hashed_password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(subject=str(user.id), expires_delta=access_token_expires)
-    return Token(access_token=access_token)
+    return _token_for(await _authenticate(db, login_in.email, login_in.password))
 
 
 @router.post("/token", response_model=Token)
-def login_with_form(
+async def login_with_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(app_deps.get_db),
+    db: AsyncSession = Depends(app_deps.get_async_db),
 ) -> Token:
-    user = user_crud.get_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(subject=str(user.id), expires_delta=access_token_expires)
-    return Token(access_token=access_token)
+    return _token_for(await _authenticate(db, form_data.username, form_data.password))
 
 
 @router.post("/password/reset/request", status_code=status.HTTP_202_ACCEPTED)
@@ -70,29 +80,40 @@ def request_password_reset(
     return {"message": "Se o e-mail existir, enviaremos instruções"}
 
 
-@router.post("/password/reset/confirm")
-def confirm_password_reset(
-    payload: PasswordResetConfirm,
-    db: Session = Depends(app_deps.get_db),
-) -> dict[str, str]:
-    token_obj = (
+def _valid_reset_token(db: Session, token: str) -> PasswordResetToken | None:
+    return (
         db.query(PasswordResetToken)
         .filter(
-            PasswordResetToken.token == payload.token,
+            PasswordResetToken.token == token,
             PasswordResetToken.used.is_(False),
             PasswordResetToken.expires_at > datetime.utcnow(),
         )
         .first()
     )
-    if token_obj is None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token inválido ou expirado")
+
+
+def _apply_password_reset(db: Session, token_obj: PasswordResetToken, hashed_password: str) -> bool:
     user = user_crud.get(db, token_obj.user_id)
     if user is None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuário não encontrado")
-    user_crud.update(db, user, UserUpdate(password=payload.new_password))
+        return False
     token_obj.used = True
     db.add(token_obj)
-    db.commit()
+    user_crud.set_password_hash(db, user, hashed_password)
+    return True
+
+
+@router.post("/password/reset/confirm")
+async def confirm_password_reset(
+    payload: PasswordResetConfirm,
+    db: AsyncSession = Depends(app_deps.get_async_db),
+) -> dict[str, str]:
+    # O token é conferido antes do hash, para que pedidos inválidos não consumam o pool do bcrypt.
+    token_obj = await db.run_sync(_valid_reset_token, payload.token)
+    if token_obj is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token inválido ou expirado")
+    hashed_password = await password_hasher.hash_async(payload.new_password)
+    if not await db.run_sync(_apply_password_reset, token_obj, hashed_password):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuário não encontrado")
     return {"message": "Senha atualizada com sucesso"}
 
 
@@ -1,126 +1,163 @@
-from datetime import date, timedelta
+from datetime import date
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import deps as app_deps
-from app.api.deps import get_current_active_user
+from app.api.deps import (
+    PageParams,
+    expiry_filters,
+    get_current_active_user_async,
+    get_page_params,
+    save_pdf_upload,
+)
+from app.api.documents import document_response
 from app.crud.avcb import avcb_crud
+from app.crud.base import ExpiryFilters
+from app.crud.pagination import InvalidCursorError
 from app.models.avcb import Avcb, AvcbStatus
 from app.models.user import User
 from app.schemas.avcb import AvcbCreate, AvcbNotificationRequest, AvcbRead, AvcbUpdate
+from app.schemas.pagination import Page
+from app.services.documents import stream_zip
 from app.services.email import email_service
-from app.utils.file_storage import save_upload
+from app.services.search import document_search_service
 
 router = APIRouter(prefix="/avcb", tags=["avcb"])
 
 
-@router.get("/", response_model=list[AvcbRead])
-def list_avcb(
-    status_filter: str | None = None,
-    days_until_expiry: int | None = None,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> list[Avcb]:
-    query = db.query(Avcb)
-    if status_filter:
-        try:
-            status_enum = AvcbStatus(status_filter)
-        except ValueError as exc:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Status inválido") from exc
-        query = query.filter(Avcb.status == status_enum)
-    if days_until_expiry is not None:
-        target_date = date.today() + timedelta(days=days_until_expiry)
-        query = query.filter(Avcb.expiry_date <= target_date)
-    avcb_crud.mark_overdue_conditions(db, date.today())
-    return query.order_by(Avcb.expiry_date.asc()).all()
+def _serialize(avcb_obj: Avcb) -> AvcbRead:
+    return AvcbRead.model_validate(avcb_obj)
+
+
+_avcb_filters = expiry_filters(AvcbStatus)
+
+
+@router.get("/", response_model=Page[AvcbRead])
+async def list_avcb(
+    filters: ExpiryFilters = Depends(_avcb_filters),
+    page: PageParams = Depends(get_page_params),
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> Page[AvcbRead]:
+    try:
+        items, next_cursor = await db.run_sync(
+            lambda session: avcb_crud.get_page(
+                session, page.cursor, page.limit, status=filters.status, expiring_before=filters.expiring_before
+            )
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+    return Page[AvcbRead](items=items, next_cursor=next_cursor)
+
+
+@router.get("/export.zip")
+async def export_avcb_zip(
+    filters: ExpiryFilters = Depends(_avcb_filters),
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> StreamingResponse:
+    documents = await db.run_sync(
+        lambda session: avcb_crud.get_documents(
+            session, status=filters.status, expiring_before=filters.expiring_before
+        )
+    )
+    filename = f"avcbs_{date.today().isoformat()}.zip"
+    return StreamingResponse(
+        stream_zip(documents),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.post("/", response_model=AvcbRead, status_code=status.HTTP_201_CREATED)
-def create_avcb(
+async def create_avcb(
     avcb_in: AvcbCreate,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> Avcb:
-    return avcb_crud.create(db, avcb_in)
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> AvcbRead:
+    return await db.run_sync(lambda session: _serialize(avcb_crud.create(session, avcb_in)))
 
 
 @router.get("/{avcb_id}", response_model=AvcbRead)
-def read_avcb(
+async def read_avcb(
     avcb_id: int,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> Avcb:
-    avcb_obj = avcb_crud.get(db, avcb_id)
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> AvcbRead:
+    avcb_obj = await db.run_sync(avcb_crud.get, avcb_id)
     if avcb_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="AVCB não encontrado")
-    return avcb_obj
+    return _serialize(avcb_obj)
 
 
 @router.put("/{avcb_id}", response_model=AvcbRead)
 @router.patch("/{avcb_id}", response_model=AvcbRead)
-def update_avcb(
+async def update_avcb(
     avcb_id: int,
     avcb_in: AvcbUpdate,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> Avcb:
-    avcb_obj = avcb_crud.get(db, avcb_id)
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> AvcbRead:
+    avcb_obj = await db.run_sync(avcb_crud.get, avcb_id)
     if avcb_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="AVCB não encontrado")
-    return avcb_crud.update(db, avcb_obj, avcb_in)
+    return await db.run_sync(lambda session: _serialize(avcb_crud.update(session, avcb_obj, avcb_in)))
 
 
 @router.delete("/{avcb_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_avcb(
+async def delete_avcb(
     avcb_id: int,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
 ) -> None:
-    avcb_obj = avcb_crud.get(db, avcb_id)
+    avcb_obj = await db.run_sync(avcb_crud.get, avcb_id)
     if avcb_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="AVCB não encontrado")
-    avcb_crud.remove(db, avcb_id)
+    await db.run_sync(avcb_crud.remove, avcb_id)
 
 
 @router.post("/{avcb_id}/upload", response_model=AvcbRead)
-def upload_avcb_pdf(
+async def upload_avcb_pdf(
     avcb_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> Avcb:
-    avcb_obj = avcb_crud.get(db, avcb_id)
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> AvcbRead:
+    avcb_obj = await db.run_sync(avcb_crud.get, avcb_id)
     if avcb_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="AVCB não encontrado")
-    if not file.filename or not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie um arquivo PDF")
-    path = save_upload(file, "avcb")
-    return avcb_crud.set_pdf_path(db, avcb_obj, path)
+    stored = await run_in_threadpool(save_pdf_upload, file)
+    updated = await db.run_sync(lambda session: _serialize(avcb_crud.set_pdf_path(session, avcb_obj, stored)))
+    document_search_service.submit(stored)
+    return updated
 
 
 @router.get("/{avcb_id}/download")
-def download_avcb_pdf(
+async def download_avcb_pdf(
     avcb_id: int,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> FileResponse:
-    avcb_obj = avcb_crud.get(db, avcb_id)
-    if avcb_obj is None or not avcb_obj.pdf_path:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Documento não encontrado")
-    return FileResponse(path=avcb_obj.pdf_path, media_type="application/pdf", filename=f"avcb_{avcb_id}.pdf")
+    request: Request,
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> Response:
+    avcb_obj = await db.run_sync(avcb_crud.get, avcb_id)
+    path = avcb_obj.pdf_path if avcb_obj is not None else None
+    return document_response(request, path, f"avcb_{avcb_id}.pdf", disposition="attachment")
 
 
 @router.post("/{avcb_id}/notify")
-def notify_avcb_expiry(
+async def notify_avcb_expiry(
     avcb_id: int,
     payload: AvcbNotificationRequest,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
 ) -> dict[str, str]:
-    avcb_obj = avcb_crud.get(db, avcb_id)
+    avcb_obj = await db.run_sync(avcb_crud.get, avcb_id)
     if avcb_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="AVCB não encontrado")
-    email_service.send_license_expiry_notification(payload.emails, avcb_obj.property_name, payload.days_left)
+    await run_in_threadpool(
+        email_service.send_license_expiry_notification, payload.emails, avcb_obj.property_name, payload.days_left
+    )
     return {"status": "ok"}
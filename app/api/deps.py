@@ -1,45 +1,137 @@
-from fastapi import Depends, HTTPException, status
+from collections.abc import Callable
+from datetime import date, timedelta
+from enum import Enum
+from typing import NamedTuple
+
+from fastapi import Depends, HTTPException, Query, UploadFile, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import deps as app_deps
 from app.config import get_settings
+from app.core.auth_cache import auth_cache
+from app.crud.base import ExpiryFilters
 from app.crud.user import user_crud
 from app.models.user import User
 from app.schemas.auth import TokenPayload
+from app.utils.file_storage import StoredUpload, UploadTooLargeError, save_upload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 settings = get_settings()
 
 
-def get_current_user(
-    db: Session = Depends(app_deps.get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Credenciais inválidas",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _user_id_from_token(token: str) -> int:
+    user_id = auth_cache.token_user_id(token)
+    if user_id is not None:
+        return user_id
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         sub = payload.get("sub")
         if sub is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = TokenPayload(sub=sub)
     except JWTError as exc:
-        raise credentials_exception from exc
+        raise _credentials_exception() from exc
     try:
-        user_id = int(token_data.sub) if token_data.sub is not None else None
+        user_id = int(token_data.sub)
     except ValueError as exc:
-        raise credentials_exception from exc
-    user = user_crud.get(db, user_id) if user_id is not None else None
+        raise _credentials_exception() from exc
+    auth_cache.remember_token(token, user_id, payload.get("exp"))
+    return user_id
+
+
+def _ensure_active(user: User) -> User:
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuário inativo")
+    return user
+
+
+def get_current_user(
+    db: Session = Depends(app_deps.get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    user_id = _user_id_from_token(token)
+    user = auth_cache.get_user(user_id, lambda: user_crud.get(db, user_id))
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
-    if not current_user.is_active:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuário inativo")
-    return current_user
\ No newline at end of file
+    return _ensure_active(current_user)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(app_deps.get_async_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    user_id = _user_id_from_token(token)
+    user = auth_cache.cached_user(user_id) or await db.run_sync(
+        lambda session: auth_cache.load_user(user_id, lambda: user_crud.get(session, user_id))
+    )
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+async def get_current_active_user_async(current_user: User = Depends(get_current_user_async)) -> User:
+    return _ensure_active(current_user)
+
+
+def get_current_active_superuser(current_user: User = Depends(get_current_active_user)) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso restrito a administradores")
+    return current_user
+
+
+class PageParams(NamedTuple):
+    cursor: str | None
+    limit: int
+
+
+def get_page_params(
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=settings.page_size_max),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit or settings.page_size_default)
+
+
+def parse_expiry_filters(
+    status_enum: type[Enum] | None, status_filter: str | None, days_until_expiry: int | None
+) -> ExpiryFilters:
+    status_value = None
+    if status_filter and status_enum is not None:
+        try:
+            status_value = status_enum(status_filter)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Status inválido") from exc
+    expiring_before = None
+    if days_until_expiry is not None:
+        expiring_before = date.today() + timedelta(days=days_until_expiry)
+    return ExpiryFilters(status_value, expiring_before)
+
+
+def expiry_filters(status_enum: type[Enum]) -> Callable[..., ExpiryFilters]:
+    """Dependência com ``status_filter`` e ``days_until_expiry``, os filtros das listagens."""
+
+    def dependency(status_filter: str | None = None, days_until_expiry: int | None = None) -> ExpiryFilters:
+        return parse_expiry_filters(status_enum, status_filter, days_until_expiry)
+
+    return dependency
+
+
+def save_pdf_upload(file: UploadFile) -> StoredUpload:
+    if not file.filename or not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie um arquivo PDF")
+    try:
+        return save_upload(file)
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)) from exc
@@ -0,0 +1,58 @@
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app import deps as app_deps
+from app.api.deps import get_current_active_user
+from app.models import Avcb, License, Recipient, Transporter
+from app.models.user import User
+from app.services.documents import DocumentNotFoundError, serve_document
+from app.utils.file_storage import object_path
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+DOCUMENT_SOURCES = {
+    "licenses": (License, "pdf_path", "licenca"),
+    "avcb": (Avcb, "pdf_path", "avcb"),
+    "transporters": (Transporter, "license_pdf_path", "transportador"),
+    "recipients": (Recipient, "license_pdf_path", "destinatario"),
+}
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def document_response(
+    request: Request, path: str | None, filename: str, *, immutable: bool = False, disposition: str = "inline"
+) -> Response:
+    try:
+        return serve_document(request, path, filename, immutable=immutable, disposition=disposition)
+    except DocumentNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+@router.get("/objects/{sha256}")
+def read_document_object(
+    sha256: str,
+    request: Request,
+    _: User = Depends(get_current_active_user),
+) -> Response:
+    if not SHA256_PATTERN.match(sha256):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Documento não encontrado")
+    return document_response(request, str(object_path(sha256)), f"{sha256}.pdf", immutable=True)
+
+
+@router.get("/{entity}/{entity_id}")
+def read_document(
+    entity: str,
+    entity_id: int,
+    request: Request,
+    db: Session = Depends(app_deps.get_db),
+    _: User = Depends(get_current_active_user),
+) -> Response:
+    source = DOCUMENT_SOURCES.get(entity)
+    if source is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tipo de documento inválido")
+    model, path_attribute, filename_prefix = source
+    db_obj = db.get(model, entity_id)
+    path = getattr(db_obj, path_attribute) if db_obj is not None else None
+    return document_response(request, path, f"{filename_prefix}_{entity_id}.pdf")
@@ -0,0 +1,48 @@
+from collections.abc import Iterator
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_active_user, parse_expiry_filters
+from app.crud.base import ExpiryFilters
+from app.models.user import User
+from app.services.exports import EXPORTS, export_service
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _export_filters(
+    entity: str, status_filter: str | None = None, days_until_expiry: int | None = None
+) -> ExpiryFilters:
+    definition = EXPORTS.get(entity)
+    if definition is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exportação não encontrada")
+    return parse_expiry_filters(definition.status_enum, status_filter, days_until_expiry)
+
+
+def _attachment(entity: str, extension: str, content: Iterator[bytes], media_type: str) -> StreamingResponse:
+    filename = f"{EXPORTS[entity].filename}_{date.today().isoformat()}.{extension}"
+    return StreamingResponse(
+        content, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/{entity}.csv")
+def export_csv(
+    entity: str,
+    filters: ExpiryFilters = Depends(_export_filters),
+    _: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    return _attachment(entity, "csv", export_service.stream_csv(entity, filters), "text/csv; charset=utf-8")
+
+
+@router.get("/{entity}.xlsx")
+def export_xlsx(
+    entity: str,
+    filters: ExpiryFilters = Depends(_export_filters),
+    _: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    return _attachment(entity, "xlsx", export_service.stream_xlsx(entity, filters), XLSX_MEDIA_TYPE)
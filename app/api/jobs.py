@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app import deps as app_deps
+from app.api.deps import get_current_active_superuser
+from app.models.user import User
+from app.services.jobs import JOBS, JobResult, execute_job
+from app.services.scheduler import scheduler
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/")
+def list_jobs(_: User = Depends(get_current_active_superuser)) -> dict[str, dict]:
+    return {
+        name: {
+            "interval_seconds": scheduler.intervals.get(name),
+            "last_result": scheduler.last_results.get(name),
+        }
+        for name in JOBS
+    }
+
+
+@router.post("/{job_name}/run")
+def run_job_now(
+    job_name: str,
+    db: Session = Depends(app_deps.get_db),
+    _: User = Depends(get_current_active_superuser),
+) -> JobResult:
+    if job_name not in JOBS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado")
+    return execute_job(job_name, db)
@@ -1,131 +1,214 @@
 from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import deps as app_deps
-from app.api.deps import get_current_active_user
+from app.api.deps import (
+    PageParams,
+    expiry_filters,
+    get_current_active_user_async,
+    get_page_params,
+    save_pdf_upload,
+)
+from app.api.documents import document_response
+from app.crud.base import ExpiryFilters
 from app.crud.license import license_crud
+from app.crud.pagination import InvalidCursorError
 from app.models.license import License, LicenseStatus
 from app.models.user import User
 from app.schemas.license import (
+    LicenseBulkNotificationRequest,
+    LicenseBulkNotificationResponse,
     LicenseCreate,
     LicenseNotificationRequest,
+    LicenseNotificationResult,
     LicenseRead,
     LicenseUpdate,
 )
+from app.schemas.pagination import Page
+from app.services.documents import stream_zip
 from app.services.email import email_service
-from app.utils.file_storage import save_upload
+from app.services.search import document_search_service
 
 router = APIRouter(prefix="/licenses", tags=["licenses"])
 
 
-@router.get("/", response_model=list[LicenseRead])
-def list_licenses(
-    status_filter: str | None = None,
-    days_until_expiry: int | None = None,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> list[License]:
-    query = db.query(License)
-    if status_filter:
-        try:
-            status_enum = LicenseStatus(status_filter)
-        except ValueError as exc:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Status inválido") from exc
-        query = query.filter(License.status == status_enum)
-    if days_until_expiry is not None:
-        target_date = date.today() + timedelta(days=days_until_expiry)
-        query = query.filter(License.expiry_date <= target_date)
-    license_crud.mark_overdue_conditions(db, date.today())
-    return query.order_by(License.expiry_date.asc()).all()
+def _serialize(license_obj: License) -> LicenseRead:
+    return LicenseRead.model_validate(license_obj)
+
+
+_license_filters = expiry_filters(LicenseStatus)
+
+
+@router.get("/", response_model=Page[LicenseRead])
+async def list_licenses(
+    filters: ExpiryFilters = Depends(_license_filters),
+    page: PageParams = Depends(get_page_params),
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> Page[LicenseRead]:
+    try:
+        items, next_cursor = await db.run_sync(
+            lambda session: license_crud.get_page(
+                session, page.cursor, page.limit, status=filters.status, expiring_before=filters.expiring_before
+            )
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+    return Page[LicenseRead](items=items, next_cursor=next_cursor)
+
+
+@router.get("/export.zip")
+async def export_licenses_zip(
+    filters: ExpiryFilters = Depends(_license_filters),
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> StreamingResponse:
+    documents = await db.run_sync(
+        lambda session: license_crud.get_documents(
+            session, status=filters.status, expiring_before=filters.expiring_before
+        )
+    )
+    filename = f"licencas_{date.today().isoformat()}.zip"
+    return StreamingResponse(
+        stream_zip(documents),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.post("/", response_model=LicenseRead, status_code=status.HTTP_201_CREATED)
-def create_license(
+async def create_license(
     license_in: LicenseCreate,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> License:
-    return license_crud.create(db, license_in)
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> LicenseRead:
+    return await db.run_sync(lambda session: _serialize(license_crud.create(session, license_in)))
 
 
 @router.get("/{license_id}", response_model=LicenseRead)
-def read_license(
+async def read_license(
     license_id: int,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> License:
-    license_obj = license_crud.get(db, license_id)
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> LicenseRead:
+    license_obj = await db.run_sync(license_crud.get, license_id)
     if license_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Licença não encontrada")
-    return license_obj
+    return _serialize(license_obj)
 
 
 @router.put("/{license_id}", response_model=LicenseRead)
 @router.patch("/{license_id}", response_model=LicenseRead)
-def update_license(
+async def update_license(
     license_id: int,
     license_in: LicenseUpdate,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> License:
-    license_obj = license_crud.get(db, license_id)
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> LicenseRead:
+    license_obj = await db.run_sync(license_crud.get, license_id)
     if license_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Licença não encontrada")
-    return license_crud.update(db, license_obj, license_in)
+    return await db.run_sync(lambda session: _serialize(license_crud.update(session, license_obj, license_in)))
 
 
 @router.delete("/{license_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_license(
+async def delete_license(
     license_id: int,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
 ) -> None:
-    license_obj = license_crud.get(db, license_id)
+    license_obj = await db.run_sync(license_crud.get, license_id)
     if license_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Licença não encontrada")
-    license_crud.remove(db, license_id)
+    await db.run_sync(license_crud.remove, license_id)
 
 
 @router.post("/{license_id}/upload", response_model=LicenseRead)
-def upload_license_pdf(
+async def upload_license_pdf(
     license_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> License:
-    license_obj = license_crud.get(db, license_id)
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> LicenseRead:
+    license_obj = await db.run_sync(license_crud.get, license_id)
     if license_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Licença não encontrada")
-    if not file.filename or not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie um arquivo PDF")
-    path = save_upload(file, "licenses")
-    return license_crud.set_pdf_path(db, license_obj, path)
+    stored = await run_in_threadpool(save_pdf_upload, file)
+    updated = await db.run_sync(lambda session: _serialize(license_crud.set_pdf_path(session, license_obj, stored)))
+    document_search_service.submit(stored)
+    return updated
 
 
 @router.get("/{license_id}/download")
-def download_license_pdf(
+async def download_license_pdf(
     license_id: int,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
-) -> FileResponse:
-    license_obj = license_crud.get(db, license_id)
-    if license_obj is None or not license_obj.pdf_path:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Documento não encontrado")
-    return FileResponse(path=license_obj.pdf_path, media_type="application/pdf", filename=f"licenca_{license_id}.pdf")
+    request: Request,
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> Response:
+    license_obj = await db.run_sync(license_crud.get, license_id)
+    path = license_obj.pdf_path if license_obj is not None else None
+    return document_response(request, path, f"licenca_{license_id}.pdf", disposition="attachment")
+
+
+def _queue_notifications(db: Session, payload: LicenseBulkNotificationRequest) -> LicenseBulkNotificationResponse:
+    """Enfileira um aviso por licença em uma única transação; o job ``email-outbox`` faz a entrega.
+
+    IDs pedidos que não existem ou não atendem aos filtros voltam como ``not_found``.
+    """
+    today = date.today()
+    expiring_before = None
+    if payload.days_until_expiry is not None:
+        expiring_before = today + timedelta(days=payload.days_until_expiry)
+    targets = license_crud.get_notification_targets(db, payload.license_ids, payload.status, expiring_before)
+    items = []
+    for license_id, name, expiry_date in targets:
+        days_left = (expiry_date - today).days
+        message_id = email_service.send_license_expiry_notification(payload.emails, name, days_left, db=db)
+        items.append(
+            LicenseNotificationResult(
+                license_id=license_id,
+                status="queued" if message_id else "skipped",
+                days_left=days_left,
+                message_id=message_id,
+            )
+        )
+    db.commit()
+    found = {item.license_id for item in items}
+    items.extend(
+        LicenseNotificationResult(license_id=license_id, status="not_found")
+        for license_id in dict.fromkeys(payload.license_ids or ())
+        if license_id not in found
+    )
+    queued = sum(item.status == "queued" for item in items)
+    return LicenseBulkNotificationResponse(queued=queued, items=items)
+
+
+@router.post("/notify", response_model=LicenseBulkNotificationResponse, status_code=status.HTTP_202_ACCEPTED)
+async def notify_licenses_expiry(
+    payload: LicenseBulkNotificationRequest,
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
+) -> LicenseBulkNotificationResponse:
+    return await db.run_sync(_queue_notifications, payload)
 
 
 @router.post("/{license_id}/notify")
-def notify_license_expiry(
+async def notify_license_expiry(
     license_id: int,
     payload: LicenseNotificationRequest,
-    db: Session = Depends(app_deps.get_db),
-    _: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(app_deps.get_async_db),
+    _: User = Depends(get_current_active_user_async),
 ) -> dict[str, str]:
-    license_obj = license_crud.get(db, license_id)
+    license_obj = await db.run_sync(license_crud.get, license_id)
     if license_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Licença não encontrada")
-    email_service.send_license_expiry_notification(payload.emails, license_obj.name, payload.days_left)
+    await run_in_threadpool(
+        email_service.send_license_expiry_notification, payload.emails, license_obj.name, payload.days_left
+    )
     return {"status": "ok"}
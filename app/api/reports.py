@@ -1,39 +1,67 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app import deps as app_deps
 from app.api.deps import get_current_active_user
-from app.models.license import License
+from app.api.documents import document_response
 from app.models.user import User
-from app.services.reports import pdf_report_service
+from app.schemas.report import ReportJobRead
+from app.services.reports import REPORTS, EmptyReportError, report_job_service
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 
-@router.get("/licenses")
-def generate_license_report(
+def _job_read(job: dict[str, Any]) -> ReportJobRead:
+    return ReportJobRead(
+        id=job["id"],
+        report=job["report"],
+        status=job["status"],
+        filters=job["filters"],
+        created_at=datetime.fromtimestamp(job["created_at"]),
+        finished_at=datetime.fromtimestamp(job["finished_at"]) if job["finished_at"] else None,
+        error=job["error"],
+        download_url=f"/reports/jobs/{job['id']}/download" if job["status"] == "done" else None,
+    )
+
+
+def _get_job(job_id: str) -> dict[str, Any]:
+    job = report_job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Relatório não encontrado")
+    return job
+
+
+@router.post("/{report_name}", response_model=ReportJobRead, status_code=status.HTTP_202_ACCEPTED)
+def submit_report(
+    report_name: str,
     days_until_expiry: int | None = None,
     db: Session = Depends(app_deps.get_db),
     _: User = Depends(get_current_active_user),
-) -> FileResponse:
-    query = db.query(License)
+) -> ReportJobRead:
+    if report_name not in REPORTS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Relatório não encontrado")
+    expiring_before = None
     if days_until_expiry is not None:
-        target_date = date.today() + timedelta(days=days_until_expiry)
-        query = query.filter(License.expiry_date <= target_date)
-    licenses = query.order_by(License.expiry_date.asc()).all()
-    if not licenses:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nenhuma licença encontrada")
-    entries = [
-        {
-            "name": license.name,
-            "issuing_agency": license.issuing_agency,
-            "expiry_date": license.expiry_date.isoformat() if license.expiry_date else "",
-            "status": getattr(license.status, "value", license.status),
-        }
-        for license in licenses
-    ]
-    report_path = pdf_report_service.generate_license_expiry_report(entries)
-    return FileResponse(path=report_path, media_type="application/pdf", filename=report_path.name)
+        expiring_before = (date.today() + timedelta(days=days_until_expiry)).isoformat()
+    try:
+        job = report_job_service.submit(db, report_name, {"expiring_before": expiring_before})
+    except EmptyReportError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return _job_read(job)
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobRead)
+def read_report_job(job_id: str, _: User = Depends(get_current_active_user)) -> ReportJobRead:
+    return _job_read(_get_job(job_id))
+
+
+@router.get("/jobs/{job_id}/download")
+def download_report(job_id: str, request: Request, _: User = Depends(get_current_active_user)) -> Response:
+    job = _get_job(job_id)
+    if job["status"] != "done":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Relatório ainda não está pronto")
+    filename = f"{job['report']}_{datetime.fromtimestamp(job['created_at']).date().isoformat()}.pdf"
+    return document_response(request, job["path"], filename, disposition="attachment")
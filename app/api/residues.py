@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app import deps as app_deps
-from app.api.deps import get_current_active_user
+from app.api.deps import PageParams, get_current_active_user, get_page_params, save_pdf_upload
+from app.crud.pagination import InvalidCursorError
 from app.crud.residue import (
     recipient_crud,
     storage_code_crud,
@@ -11,6 +12,7 @@ from app.crud.residue import (
 )
 from app.models.residue import Recipient, StorageCode, Transporter, WasteCode
 from app.models.user import User
+from app.schemas.pagination import Page
 from app.schemas.residue import (
     RecipientCreate,
     RecipientRead,
@@ -25,18 +27,23 @@ from app.schemas.residue import (
     WasteCodeRead,
     WasteCodeUpdate,
 )
-from app.utils.file_storage import save_upload
+from app.services.search import document_search_service
 
 router = APIRouter(prefix="/residues", tags=["residues"])
 
 
 # Waste Codes
-@router.get("/codes", response_model=list[WasteCodeRead])
+@router.get("/codes", response_model=Page[WasteCodeRead])
 def list_waste_codes(
+    page: PageParams = Depends(get_page_params),
     db: Session = Depends(app_deps.get_db),
     _: User = Depends(get_current_active_user),
-) -> list[WasteCode]:
-    return waste_code_crud.get_multi(db)
+) -> Page[WasteCodeRead]:
+    try:
+        items, next_cursor = waste_code_crud.get_page(db, page.cursor, page.limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+    return Page[WasteCodeRead](items=items, next_cursor=next_cursor)
 
 
 @router.post("/codes", response_model=WasteCodeRead, status_code=status.HTTP_201_CREATED)
@@ -74,12 +81,17 @@ def delete_waste_code(
 
 
 # Storage Codes
-@router.get("/storage", response_model=list[StorageCodeRead])
+@router.get("/storage", response_model=Page[StorageCodeRead])
 def list_storage_codes(
+    page: PageParams = Depends(get_page_params),
     db: Session = Depends(app_deps.get_db),
     _: User = Depends(get_current_active_user),
-) -> list[StorageCode]:
-    return storage_code_crud.get_multi(db)
+) -> Page[StorageCodeRead]:
+    try:
+        items, next_cursor = storage_code_crud.get_page(db, page.cursor, page.limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+    return Page[StorageCodeRead](items=items, next_cursor=next_cursor)
 
 
 @router.post("/storage", response_model=StorageCodeRead, status_code=status.HTTP_201_CREATED)
@@ -117,12 +129,17 @@ def delete_storage_code(
 
 
 # Transporters
-@router.get("/transporters", response_model=list[TransporterRead])
+@router.get("/transporters", response_model=Page[TransporterRead])
 def list_transporters(
+    page: PageParams = Depends(get_page_params),
     db: Session = Depends(app_deps.get_db),
     _: User = Depends(get_current_active_user),
-) -> list[Transporter]:
-    return transporter_crud.get_multi(db)
+) -> Page[TransporterRead]:
+    try:
+        items, next_cursor = transporter_crud.get_page(db, page.cursor, page.limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+    return Page[TransporterRead](items=items, next_cursor=next_cursor)
 
 
 @router.post("/transporters", response_model=TransporterRead, status_code=status.HTTP_201_CREATED)
@@ -169,19 +186,24 @@ def upload_transporter_license(
     db_obj = transporter_crud.get(db, transporter_id)
     if db_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transportador não encontrado")
-    if not file.filename or not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie um arquivo PDF")
-    path = save_upload(file, "transporters")
-    return transporter_crud.set_pdf_path(db, db_obj, path)
+    stored = save_pdf_upload(file)
+    db_obj = transporter_crud.set_pdf_path(db, db_obj, stored)
+    document_search_service.submit(stored)
+    return db_obj
 
 
 # Recipients
-@router.get("/recipients", response_model=list[RecipientRead])
+@router.get("/recipients", response_model=Page[RecipientRead])
 def list_recipients(
+    page: PageParams = Depends(get_page_params),
     db: Session = Depends(app_deps.get_db),
     _: User = Depends(get_current_active_user),
-) -> list[Recipient]:
-    return recipient_crud.get_multi(db)
+) -> Page[RecipientRead]:
+    try:
+        items, next_cursor = recipient_crud.get_page(db, page.cursor, page.limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+    return Page[RecipientRead](items=items, next_cursor=next_cursor)
 
 
 @router.post("/recipients", response_model=RecipientRead, status_code=status.HTTP_201_CREATED)
@@ -228,7 +250,7 @@ def upload_recipient_license(
     db_obj = recipient_crud.get(db, recipient_id)
     if db_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Destinatário não encontrado")
-    if not file.filename or not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Envie um arquivo PDF")
-    path = save_upload(file, "recipients")
-    return recipient_crud.set_pdf_path(db, db_obj, path)
+    stored = save_pdf_upload(file)
+    db_obj = recipient_crud.set_pdf_path(db, db_obj, stored)
+    document_search_service.submit(stored)
+    return db_obj
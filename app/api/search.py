@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import deps as app_deps
+from app.api.deps import get_current_active_user
+from app.models.user import User
+from app.schemas.search import DocumentRecordRef, DocumentSearchHit, DocumentSearchResults
+from app.services.search import document_search_service
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/documents", response_model=DocumentSearchResults)
+def search_documents(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(app_deps.get_db),
+    _: User = Depends(get_current_active_user),
+) -> DocumentSearchResults:
+    hits = document_search_service.search(db, q, limit)
+    return DocumentSearchResults(
+        query=q,
+        items=[
+            DocumentSearchHit(
+                sha256=hit["sha256"],
+                snippet=hit["snippet"],
+                score=hit["score"],
+                records=[
+                    DocumentRecordRef(**record, url=f"/documents/{record['entity']}/{record['id']}")
+                    for record in hit["records"]
+                ],
+            )
+            for hit in hits
+        ],
+    )
@@ -2,9 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import deps as app_deps
-from app.api.deps import get_current_active_user
+from app.api.deps import PageParams, get_current_active_user, get_page_params
+from app.crud.pagination import InvalidCursorError
 from app.crud.user import user_crud
 from app.models.user import User
+from app.schemas.pagination import Page
 from app.schemas.user import UserRead, UserUpdate
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -25,12 +27,17 @@ def update_current_user(
     return updated_user
 
 
-@router.get("/", response_model=list[UserRead])
+@router.get("/", response_model=Page[UserRead])
 def list_users(
+    page: PageParams = Depends(get_page_params),
     db: Session = Depends(app_deps.get_db),
     _: User = Depends(get_current_active_user),
-) -> list[User]:
-    return db.query(User).order_by(User.created_at.desc()).limit(100).all()
+) -> Page[UserRead]:
+    try:
+        items, next_cursor = user_crud.get_page(db, page.cursor, page.limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+    return Page[UserRead](items=items, next_cursor=next_cursor)
 
 
 @router.get("/{user_id}", response_model=UserRead)
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import AnyUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -9,19 +10,62 @@ class Settings(BaseSettings):
     secret_key: str = "change-me"
     access_token_expire_minutes: int = 60 * 24
     algorithm: str = "HS256"
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 1024
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
 
     db_host: str = "185.239.210.103"
     db_name: str = "u625101450_Controle_LO"
     db_user: str = "u625101450_ekozen"
     db_password: str = "Asr$340522$Roxo"
     db_port: int = 3306
+    database_url: str | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle_seconds: int = 1800
+    db_pool_timeout_seconds: int = 30
+    db_pre_ping: Literal["always", "idle", "never"] = "idle"
+    db_pre_ping_idle_seconds: int = 300
 
     sendgrid_api_key: str | None = None
     sendgrid_sender_email: str | None = None
+    sendgrid_api_base_url: str = "https://api.sendgrid.com"
+    email_batch_size: int = 200
+    email_send_concurrency: int = 8
+    email_max_attempts: int = 6
+    email_retry_base_seconds: int = 60
+    email_retry_max_seconds: int = 3600
+    email_claim_lease_seconds: int = 300
+    email_default_locale: str = "pt_BR"
+    expiry_notification_lead_days: list[int] = [90, 60, 30, 7]
+    expiry_notification_emails: list[str] = []
 
     file_storage_dir: str = "uploads"
+    upload_max_bytes: int = 600 * 1024 * 1024
+    upload_chunk_bytes: int = 1024 * 1024
+    document_accel_redirect_prefix: str | None = None
+    text_extraction_workers: int = 2
+    report_workers: int = 2
+
+    metrics_cache_ttl_seconds: int = 300
+
+    page_size_default: int = 50
+    page_size_max: int = 500
+
+    scheduler_enabled: bool = True
+    scheduler_tick_seconds: int = 30
+    overdue_conditions_interval_seconds: int = 60 * 60
+    status_expiry_interval_seconds: int = 60 * 60
+    email_outbox_interval_seconds: int = 30
+    expiry_notification_interval_seconds: int = 60 * 60
+    storage_gc_interval_seconds: int = 24 * 60 * 60
+    storage_gc_grace_seconds: int = 60 * 60
+    storage_gc_batch_size: int = 500
+    report_retention_days: int = 30
 
     frontend_base_url: AnyUrl | None = None
+    template_auto_reload: bool = False
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
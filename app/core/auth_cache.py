@@ -0,0 +1,84 @@
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.models.user import User
+
+
+class UserSnapshot(NamedTuple):
+    id: int
+    email: str
+    full_name: str
+    is_active: bool
+    is_superuser: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(user.id, user.email, user.full_name, user.is_active, user.is_superuser, user.created_at)
+
+    def to_user(self) -> User:
+        # Instância nova por requisição, destacada mas com identidade: ``db.add`` a reanexa sem INSERT.
+        user = User(**self._asdict())
+        make_transient_to_detached(user)
+        return user
+
+
+class AuthCache:
+    """Tokens JWT já validados e fotos dos usuários autenticados, para evitar uma consulta por requisição.
+
+    O cache é por processo: ``user_crud.update`` invalida a entrada local, e os demais workers
+    enxergam a mudança em até ``AUTH_CACHE_TTL_SECONDS``.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.tokens: TTLCache[int] = TTLCache(ttl_seconds, max_entries)
+        self.users: TTLCache[UserSnapshot] = TTLCache(ttl_seconds, max_entries)
+
+    def token_user_id(self, token: str) -> int | None:
+        return self.tokens.get(token)
+
+    def remember_token(self, token: str, user_id: int, expires_at: float | None) -> None:
+        ttl = self.tokens.ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl > 0:
+            self.tokens.set(token, user_id, ttl)
+
+    def cached_user(self, user_id: int) -> User | None:
+        snapshot = self.users.get(user_id)
+        return snapshot.to_user() if snapshot is not None else None
+
+    def get_user(self, user_id: int, load: Callable[[], User | None]) -> User | None:
+        cached = self.cached_user(user_id)
+        if cached is not None:
+            return cached
+        return self.load_user(user_id, load)
+
+    def load_user(self, user_id: int, load: Callable[[], User | None]) -> User | None:
+        """Carrega o usuário sem consultar o cache de novo; para quem já registrou a falta."""
+        generation = self.users.generation
+        user = load()
+        if user is not None and generation == self.users.generation:
+            self.users.set(user_id, UserSnapshot.from_user(user))
+        return user
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.users.invalidate(user_id)
+
+    def clear(self) -> None:
+        self.tokens.invalidate()
+        self.users.invalidate()
+
+
+def build_auth_cache() -> AuthCache:
+    settings = get_settings()
+    return AuthCache(settings.auth_cache_ttl_seconds, settings.auth_cache_max_entries)
+
+
+auth_cache = build_auth_cache()
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[ValueType]):
+    def __init__(self, ttl_seconds: float, max_entries: int = 128) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generation = 0
+        self._entries: OrderedDict[Hashable, tuple[float, ValueType]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> ValueType | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: ValueType, ttl_seconds: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], ValueType]) -> ValueType:
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation
+        value = factory()
+        if generation == self.generation:
+            self.set(key, value)
+        return value
+
+    @property
+    def generation(self) -> int:
+        """Muda a cada invalidação; permite descartar um valor carregado antes dela."""
+        with self._lock:
+            return self._generation
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
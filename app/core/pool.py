@@ -0,0 +1,105 @@
+import bisect
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class CheckoutHistogram:
+    """Histograma cumulativo (semântica ``le`` do Prometheus) do tempo de espera por conexão."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = CHECKOUT_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self._counts = [0] * (len(buckets_ms) + 1)
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets_ms, wait_ms)] += 1
+            self._sum_ms += wait_ms
+            self._max_ms = max(self._max_ms, wait_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            sum_ms, max_ms = self._sum_ms, self._max_ms
+        buckets: dict[str, int] = {}
+        running = 0
+        for bound, count in zip((*map(str, self.buckets_ms), "+Inf"), counts):
+            running += count
+            buckets[bound] = running
+        return {"count": running, "sum_ms": round(sum_ms, 3), "max_ms": round(max_ms, 3), "buckets_ms": buckets}
+
+
+class _TimedCheckoutMixin:
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = CheckoutHistogram()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_wait.observe((time.perf_counter() - started) * 1000)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def install_idle_pre_ping(engine: Engine, idle_seconds: float) -> None:
+    """Testa a conexão no checkout apenas se ela ficou ociosa por mais de ``idle_seconds``.
+
+    Evita a ida extra ao banco do ``pool_pre_ping`` em conexões recém-devolvidas ao pool.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(_dbapi_connection, connection_record) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, _connection_proxy) -> None:
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as exc:
+            # O pool descarta a conexão e tenta outra ao receber DisconnectionError.
+            raise DisconnectionError("Conexão ociosa indisponível") from exc
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+
+def pool_status(pool: Pool, max_overflow: int) -> dict[str, Any]:
+    """Ocupação do pool; ``max_overflow`` é o valor configurado, que o ``QueuePool`` não expõe publicamente."""
+    status: dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=max_overflow,
+        )
+    checkout_wait = getattr(pool, "checkout_wait", None)
+    if checkout_wait is not None:
+        status["checkout_wait"] = checkout_wait.snapshot()
+    return status
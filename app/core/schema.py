@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def _alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    return config
+
+
+def head_revision() -> str | None:
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+def current_revision(engine: Engine) -> str | None:
+    """Revisão aplicada no banco; ``None`` só quando as migrações nunca rodaram."""
+    with engine.connect() as connection:
+        if not inspect(connection).has_table("alembic_version"):
+            return None
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def check_schema_version(engine: Engine) -> None:
+    expected = head_revision()
+    current = current_revision(engine)
+    if current != expected:
+        raise SchemaVersionError(
+            f"Esquema do banco na revisão {current or 'inexistente'}, esperada {expected}. "
+            "Execute 'python scripts/bootstrap.py init-db' (alembic upgrade head)."
+        )
+
+
+def upgrade_schema(revision: str = "head") -> None:
+    command.upgrade(_alembic_config(), revision)
@@ -1,4 +1,10 @@
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
 from jose import jwt
@@ -6,16 +12,82 @@ from passlib.context import CryptContext
 
 from app.config import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 settings = get_settings()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+@lru_cache(maxsize=4)
+def password_context(rounds: int) -> CryptContext:
+    # min = max = default: hashes com outro custo, para mais ou para menos, pedem rehash no login.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return password_context(rounds).hash(password)
+
+
+def verify_and_update_password(password: str, hashed_password: str, rounds: int) -> tuple[bool, str | None]:
+    return password_context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """Executa o bcrypt em um pool de ``PASSWORD_HASH_WORKERS`` processos, fora das threads das requisições.
+
+    O pool limita quantos hashes rodam ao mesmo tempo; rotas assíncronas aguardam o resultado sem
+    ocupar o threadpool. Com ``PASSWORD_HASH_WORKERS=0`` o cálculo é feito na própria thread.
+    """
+
+    def __init__(self) -> None:
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def hash(self, password: str) -> str:
+        return self._submit(hash_password, password).result()
+
+    def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return self._submit(verify_and_update_password, password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await asyncio.wrap_future(self._submit(verify_and_update_password, password, hashed_password))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        current = get_settings()
+        args = (*args, current.bcrypt_rounds)
+        if current.password_hash_workers <= 0:
+            future: Future = Future()
+            try:
+                future.set_result(func(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        with self._lock:
+            if self._executor is None:
+                # spawn: o processo filho não herda threads nem conexões abertas do servidor.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=current.password_hash_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor.submit(func, *args)
+
+
+password_hasher = PasswordHasher()
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
 def create_access_token(subject: str | Any, expires_delta: timedelta | None = None) -> str:
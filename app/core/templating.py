@@ -0,0 +1,37 @@
+from datetime import date
+from pathlib import Path
+
+import jinja2
+
+from app.config import get_settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates"
+MONTHS_EN = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def date_br(value: date | None) -> str:
+    # Mais barato que chamar ``strftime`` dentro do template, o que pesa em resumos com centenas de linhas.
+    return f"{value.day:02d}/{value.month:02d}/{value.year}" if value else ""
+
+
+def date_en(value: date | None) -> str:
+    return f"{MONTHS_EN[value.month - 1]} {value.day}, {value.year}" if value else ""
+
+
+def build_environment() -> jinja2.Environment:
+    """Ambiente Jinja único para as páginas e os e-mails: cada template é compilado uma vez por processo.
+
+    Com ``TEMPLATE_AUTO_RELOAD=false`` os templates em cache não são conferidos no disco a cada uso.
+    """
+    environment = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        auto_reload=get_settings().template_auto_reload,
+        cache_size=400,
+    )
+    environment.filters["date_br"] = date_br
+    environment.filters["date_en"] = date_en
+    return environment
+
+
+template_environment = build_environment()
@@ -1,22 +1,48 @@
-from datetime import date
+from datetime import date, datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Query, Session, selectinload
 
-from app.models.avcb import Avcb, AvcbCondition, AvcbConditionStatus
+from app.crud.pagination import paginate
+from app.crud.stored_file import stored_file_crud
+from app.models.avcb import Avcb, AvcbCondition, AvcbConditionStatus, AvcbStatus
 from app.schemas.avcb import (
     AvcbConditionCreate,
     AvcbConditionUpdate,
     AvcbCreate,
     AvcbUpdate,
 )
+from app.utils.file_storage import StoredUpload
 
 
 class CRUDAvcb:
     def get(self, db: Session, avcb_id: int) -> Avcb | None:
-        return db.query(Avcb).filter(Avcb.id == avcb_id).first()
+        return self._query(db).filter(Avcb.id == avcb_id).first()
 
     def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> list[Avcb]:
-        return db.query(Avcb).offset(skip).limit(limit).all()
+        return self._query(db).offset(skip).limit(limit).all()
+
+    def get_page(
+        self,
+        db: Session,
+        cursor: str | None,
+        limit: int,
+        status: AvcbStatus | None = None,
+        expiring_before: date | None = None,
+    ) -> tuple[list[Avcb], str | None]:
+        query = self._filter(self._query(db), status, expiring_before)
+        return paginate(query, (Avcb.expiry_date, Avcb.id), cursor, limit)
+
+    def get_documents(
+        self,
+        db: Session,
+        status: AvcbStatus | None = None,
+        expiring_before: date | None = None,
+    ) -> list[tuple[str, str]]:
+        """Pares (nome no arquivo ZIP, caminho do PDF) dos registros filtrados que possuem documento."""
+        query = self._filter(db.query(Avcb.id, Avcb.property_name, Avcb.pdf_path), status, expiring_before)
+        rows = query.filter(Avcb.pdf_path.isnot(None)).order_by(Avcb.expiry_date, Avcb.id)
+        return [(f"{row_id}_{name}.pdf", path) for row_id, name, path in rows]
 
     def create(self, db: Session, obj_in: AvcbCreate) -> Avcb:
         avcb = Avcb(
@@ -54,31 +80,52 @@ class CRUDAvcb:
         obj = self.get(db, avcb_id)
         if obj is None:
             raise ValueError("AVCB not found")
+        stored_file_crud.release(db, obj.pdf_path)
         db.delete(obj)
         db.commit()
         return obj
 
-    def set_pdf_path(self, db: Session, avcb_obj: Avcb, path: str) -> Avcb:
-        avcb_obj.pdf_path = path
+    def set_pdf_path(self, db: Session, avcb_obj: Avcb, stored: StoredUpload) -> Avcb:
+        stored_file_crud.acquire(db, stored)
+        stored_file_crud.release(db, avcb_obj.pdf_path)
+        avcb_obj.pdf_path = stored.path
         db.add(avcb_obj)
         db.commit()
         db.refresh(avcb_obj)
         return avcb_obj
 
-    def mark_overdue_conditions(self, db: Session, current_date: date) -> None:
-        overdue_conditions = (
-            db.query(AvcbCondition)
-            .filter(
-                AvcbCondition.due_date.isnot(None),
+    def mark_overdue_conditions(self, db: Session, current_date: date) -> int:
+        result = db.execute(
+            update(AvcbCondition)
+            .where(
                 AvcbCondition.due_date < current_date,
-                AvcbCondition.status != AvcbConditionStatus.COMPLETED,
+                AvcbCondition.status.notin_([AvcbConditionStatus.COMPLETED, AvcbConditionStatus.OVERDUE]),
             )
-            .all()
+            .values(status=AvcbConditionStatus.OVERDUE, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def expire_outdated(self, db: Session, current_date: date) -> int:
+        result = db.execute(
+            update(Avcb)
+            .where(Avcb.expiry_date < current_date, Avcb.status == AvcbStatus.VALID)
+            .values(status=AvcbStatus.EXPIRED, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
         )
-        for condition in overdue_conditions:
-            condition.status = AvcbConditionStatus.OVERDUE
-        if overdue_conditions:
-            db.commit()
+        db.commit()
+        return result.rowcount
+
+    def _filter(self, query: Query, status: AvcbStatus | None, expiring_before: date | None) -> Query:
+        if status is not None:
+            query = query.filter(Avcb.status == status)
+        if expiring_before is not None:
+            query = query.filter(Avcb.expiry_date <= expiring_before)
+        return query
+
+    def _query(self, db: Session) -> Query:
+        return db.query(Avcb).options(selectinload(Avcb.conditions))
 
     def _build_condition(
         self, condition_schema: AvcbConditionCreate | AvcbConditionUpdate
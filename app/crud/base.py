@@ -1,8 +1,12 @@
 from collections.abc import Sequence
-from typing import Any, Generic, TypeVar
+from datetime import date
+from enum import Enum
+from typing import Any, Generic, NamedTuple, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.crud.pagination import paginate
 
 
 ModelType = TypeVar("ModelType")
@@ -10,9 +14,17 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+class ExpiryFilters(NamedTuple):
+    """Filtros de status e vencimento comuns às listagens, exportações e ZIPs de documentos."""
+
+    status: Enum | None = None
+    expiring_before: date | None = None
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: type[ModelType]):
+    def __init__(self, model: type[ModelType], sort_columns: Sequence[InstrumentedAttribute] | None = None):
         self.model = model
+        self.sort_columns = tuple(sort_columns or (model.id,))
 
     def get(self, db: Session, id: Any) -> ModelType | None:
         return db.get(self.model, id)
@@ -20,6 +32,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> Sequence[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_page(self, db: Session, cursor: str | None, limit: int) -> tuple[list[ModelType], str | None]:
+        return paginate(db.query(self.model), self.sort_columns, cursor, limit)
+
     def create(self, db: Session, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = obj_in.dict(exclude_unset=True)
         db_obj = self.model(**obj_in_data)
@@ -1,22 +1,61 @@
-from datetime import date
+from datetime import date, datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Query, Session, selectinload
 
-from app.models.license import ConditionStatus, License, LicenseCondition
+from app.crud.pagination import paginate
+from app.crud.stored_file import stored_file_crud
+from app.models.license import ConditionStatus, License, LicenseCondition, LicenseStatus
 from app.schemas.license import (
     LicenseConditionCreate,
     LicenseConditionUpdate,
     LicenseCreate,
     LicenseUpdate,
 )
+from app.utils.file_storage import StoredUpload
 
 
 class CRUDLicense:
     def get(self, db: Session, license_id: int) -> License | None:
-        return db.query(License).filter(License.id == license_id).first()
+        return self._query(db).filter(License.id == license_id).first()
 
     def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> list[License]:
-        return db.query(License).offset(skip).limit(limit).all()
+        return self._query(db).offset(skip).limit(limit).all()
+
+    def get_page(
+        self,
+        db: Session,
+        cursor: str | None,
+        limit: int,
+        status: LicenseStatus | None = None,
+        expiring_before: date | None = None,
+    ) -> tuple[list[License], str | None]:
+        query = self._filter(self._query(db), status, expiring_before)
+        return paginate(query, (License.expiry_date, License.id), cursor, limit)
+
+    def get_documents(
+        self,
+        db: Session,
+        status: LicenseStatus | None = None,
+        expiring_before: date | None = None,
+    ) -> list[tuple[str, str]]:
+        """Pares (nome no arquivo ZIP, caminho do PDF) dos registros filtrados que possuem documento."""
+        query = self._filter(db.query(License.id, License.name, License.pdf_path), status, expiring_before)
+        rows = query.filter(License.pdf_path.isnot(None)).order_by(License.expiry_date, License.id)
+        return [(f"{row_id}_{name}.pdf", path) for row_id, name, path in rows]
+
+    def get_notification_targets(
+        self,
+        db: Session,
+        license_ids: list[int] | None = None,
+        status: LicenseStatus | None = None,
+        expiring_before: date | None = None,
+    ) -> list[tuple[int, str, date]]:
+        """(id, nome, vencimento) das licenças selecionadas, em uma única consulta sem carregar condicionantes."""
+        query = self._filter(db.query(License.id, License.name, License.expiry_date), status, expiring_before)
+        if license_ids:
+            query = query.filter(License.id.in_(license_ids))
+        return [tuple(row) for row in query.order_by(License.expiry_date, License.id)]
 
     def create(self, db: Session, obj_in: LicenseCreate) -> License:
         license_obj = License(
@@ -53,31 +92,52 @@ class CRUDLicense:
         obj = self.get(db, license_id)
         if obj is None:
             raise ValueError("License not found")
+        stored_file_crud.release(db, obj.pdf_path)
         db.delete(obj)
         db.commit()
         return obj
 
-    def set_pdf_path(self, db: Session, license_obj: License, path: str) -> License:
-        license_obj.pdf_path = path
+    def set_pdf_path(self, db: Session, license_obj: License, stored: StoredUpload) -> License:
+        stored_file_crud.acquire(db, stored)
+        stored_file_crud.release(db, license_obj.pdf_path)
+        license_obj.pdf_path = stored.path
         db.add(license_obj)
         db.commit()
         db.refresh(license_obj)
         return license_obj
 
-    def mark_overdue_conditions(self, db: Session, current_date: date) -> None:
-        overdue_conditions = (
-            db.query(LicenseCondition)
-            .filter(
-                LicenseCondition.due_date.isnot(None),
+    def mark_overdue_conditions(self, db: Session, current_date: date) -> int:
+        result = db.execute(
+            update(LicenseCondition)
+            .where(
                 LicenseCondition.due_date < current_date,
-                LicenseCondition.status != ConditionStatus.COMPLETED,
+                LicenseCondition.status.notin_([ConditionStatus.COMPLETED, ConditionStatus.OVERDUE]),
             )
-            .all()
+            .values(status=ConditionStatus.OVERDUE, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
         )
-        for condition in overdue_conditions:
-            condition.status = ConditionStatus.OVERDUE
-        if overdue_conditions:
-            db.commit()
+        db.commit()
+        return result.rowcount
+
+    def expire_outdated(self, db: Session, current_date: date) -> int:
+        result = db.execute(
+            update(License)
+            .where(License.expiry_date < current_date, License.status == LicenseStatus.ACTIVE)
+            .values(status=LicenseStatus.EXPIRED, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def _filter(self, query: Query, status: LicenseStatus | None, expiring_before: date | None) -> Query:
+        if status is not None:
+            query = query.filter(License.status == status)
+        if expiring_before is not None:
+            query = query.filter(License.expiry_date <= expiring_before)
+        return query
+
+    def _query(self, db: Session) -> Query:
+        return db.query(License).options(selectinload(License.conditions))
 
     def _build_condition(self, condition_schema: LicenseConditionCreate | LicenseConditionUpdate) -> LicenseCondition:
         data = condition_schema.dict(exclude_unset=True)
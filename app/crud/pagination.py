@@ -0,0 +1,70 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursorError("Cursor inválido")
+    try:
+        return [_coerce(column, value) for column, value in zip(columns, payload)]
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+
+
+def _coerce(column: InstrumentedAttribute, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if not isinstance(value, python_type):
+        raise TypeError(f"Valor inesperado para {column.key}")
+    return value
+
+
+def _after(columns: Sequence[InstrumentedAttribute], values: Sequence[Any], descending: bool):
+    column, value = columns[0], values[0]
+    beyond = column < value if descending else column > value
+    if len(columns) == 1:
+        return beyond
+    return or_(beyond, and_(column == value, _after(columns[1:], values[1:], descending)))
+
+
+def paginate(
+    query: Query,
+    columns: Sequence[InstrumentedAttribute],
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+) -> tuple[list[Any], str | None]:
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns), descending))
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in columns])
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.crud.stored_file import stored_file_crud
 from app.models.residue import Recipient, StorageCode, Transporter, WasteCode
 from app.schemas.residue import (
     RecipientCreate,
@@ -12,6 +13,7 @@ from app.schemas.residue import (
     WasteCodeCreate,
     WasteCodeUpdate,
 )
+from app.utils.file_storage import StoredUpload
 
 
 class CRUDWasteCode(CRUDBase[WasteCode, WasteCodeCreate, WasteCodeUpdate]):
@@ -23,24 +25,40 @@ class CRUDStorageCode(CRUDBase[StorageCode, StorageCodeCreate, StorageCodeUpdate
 
 
 class CRUDTransporter(CRUDBase[Transporter, TransporterCreate, TransporterUpdate]):
-    def set_pdf_path(self, db: Session, db_obj: Transporter, path: str) -> Transporter:
-        db_obj.license_pdf_path = path
+    def set_pdf_path(self, db: Session, db_obj: Transporter, stored: StoredUpload) -> Transporter:
+        stored_file_crud.acquire(db, stored)
+        stored_file_crud.release(db, db_obj.license_pdf_path)
+        db_obj.license_pdf_path = stored.path
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def remove(self, db: Session, id: int) -> Transporter:
+        obj = self.get(db, id)
+        if obj is not None:
+            stored_file_crud.release(db, obj.license_pdf_path)
+        return super().remove(db, id)
+
 
 class CRUDRecipient(CRUDBase[Recipient, RecipientCreate, RecipientUpdate]):
-    def set_pdf_path(self, db: Session, db_obj: Recipient, path: str) -> Recipient:
-        db_obj.license_pdf_path = path
+    def set_pdf_path(self, db: Session, db_obj: Recipient, stored: StoredUpload) -> Recipient:
+        stored_file_crud.acquire(db, stored)
+        stored_file_crud.release(db, db_obj.license_pdf_path)
+        db_obj.license_pdf_path = stored.path
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def remove(self, db: Session, id: int) -> Recipient:
+        obj = self.get(db, id)
+        if obj is not None:
+            stored_file_crud.release(db, obj.license_pdf_path)
+        return super().remove(db, id)
+
 
-waste_code_crud = CRUDWasteCode(WasteCode)
-storage_code_crud = CRUDStorageCode(StorageCode)
-transporter_crud = CRUDTransporter(Transporter)
-recipient_crud = CRUDRecipient(Recipient)
+waste_code_crud = CRUDWasteCode(WasteCode, sort_columns=(WasteCode.code, WasteCode.id))
+storage_code_crud = CRUDStorageCode(StorageCode, sort_columns=(StorageCode.code, StorageCode.id))
+transporter_crud = CRUDTransporter(Transporter, sort_columns=(Transporter.name, Transporter.id))
+recipient_crud = CRUDRecipient(Recipient, sort_columns=(Recipient.name, Recipient.id))
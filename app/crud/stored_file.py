@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.stored_file import StoredFile
+from app.utils.file_storage import StoredUpload
+
+
+class CRUDStoredFile:
+    """Contagem de referências dos PDFs; não faz commit, participa da transação de quem chama."""
+
+    def get(self, db: Session, sha256: str) -> StoredFile | None:
+        return db.get(StoredFile, sha256)
+
+    def acquire(self, db: Session, stored: StoredUpload) -> None:
+        if self._adjust(db, StoredFile.sha256 == stored.sha256, 1):
+            return
+        try:
+            with db.begin_nested():
+                db.add(StoredFile(sha256=stored.sha256, path=stored.path, size=stored.size, ref_count=1))
+        except IntegrityError:
+            # Outro upload do mesmo conteúdo criou a linha primeiro.
+            self._adjust(db, StoredFile.sha256 == stored.sha256, 1)
+
+    def release(self, db: Session, path: str | None) -> None:
+        if path:
+            self._adjust(db, StoredFile.path == path, -1)
+
+    def _adjust(self, db: Session, criterion, delta: int) -> bool:
+        statement = update(StoredFile).where(criterion)
+        if delta < 0:
+            statement = statement.where(StoredFile.ref_count > 0)
+        result = db.execute(
+            statement.values(ref_count=StoredFile.ref_count + delta, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+
+stored_file_crud = CRUDStoredFile()
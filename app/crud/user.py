@@ -2,7 +2,9 @@ from datetime import datetime
 
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import auth_cache
 from app.core.security import get_password_hash
+from app.crud.pagination import paginate
 from app.models.user import PasswordResetToken, User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -14,11 +16,15 @@ class CRUDUser:
     def get_by_email(self, db: Session, email: str) -> User | None:
         return db.query(User).filter(User.email == email).first()
 
-    def create(self, db: Session, obj_in: UserCreate) -> User:
+    def get_page(self, db: Session, cursor: str | None, limit: int) -> tuple[list[User], str | None]:
+        return paginate(db.query(User), (User.created_at, User.id), cursor, limit, descending=True)
+
+    def create(self, db: Session, obj_in: UserCreate, hashed_password: str | None = None) -> User:
+        """``hashed_password`` permite que rotas assíncronas calculem o hash antes, fora do event loop."""
         db_user = User(
             email=obj_in.email,
             full_name=obj_in.full_name,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=hashed_password or get_password_hash(obj_in.password),
             is_active=obj_in.is_active,
             is_superuser=obj_in.is_superuser,
         )
@@ -35,9 +41,17 @@ class CRUDUser:
             setattr(db_user, field, value)
         db.add(db_user)
         db.commit()
+        auth_cache.invalidate_user(db_user.id)
         db.refresh(db_user)
         return db_user
 
+    def set_password_hash(self, db: Session, db_user: User, hashed_password: str) -> User:
+        db_user.hashed_password = hashed_password
+        db.add(db_user)
+        db.commit()
+        auth_cache.invalidate_user(db_user.id)
+        return db_user
+
     def create_reset_token(self, db: Session, user: User, token: str, expires_at: datetime) -> PasswordResetToken:
         reset_token = PasswordResetToken(user_id=user.id, token=token, expires_at=expires_at)
         db.add(reset_token)
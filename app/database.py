@@ -1,12 +1,23 @@
+from typing import Any
+
 from sqlalchemy import create_engine
-from sqlalchemy.engine import URL
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.config import get_settings
+from app.core.pool import TimedAsyncQueuePool, TimedQueuePool, install_idle_pre_ping
 
 settings = get_settings()
 
-database_url = URL.create(
+ASYNC_DRIVERS = {
+    "mysql+mysqlconnector": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+database_url = make_url(settings.database_url) if settings.database_url else URL.create(
     "mysql+mysqlconnector",
     username=settings.db_user,
     password=settings.db_password,
@@ -15,8 +26,31 @@ database_url = URL.create(
     database=settings.db_name,
     query={"charset": "utf8mb4", "use_unicode": "1"},
 )
+async_database_url = database_url.set(drivername=ASYNC_DRIVERS.get(database_url.drivername, database_url.drivername))
+
+
+def _engine_options(url: URL, pool_class: type) -> dict[str, Any]:
+    options: dict[str, Any] = {"pool_pre_ping": settings.db_pre_ping == "always"}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=pool_class,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_timeout=settings.db_pool_timeout_seconds,
+    )
+    return options
 
-engine = create_engine(database_url, pool_pre_ping=True)
+
+engine = create_engine(database_url, **_engine_options(database_url, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(async_database_url, **_engine_options(async_database_url, TimedAsyncQueuePool))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+if settings.db_pre_ping == "idle":
+    install_idle_pre_ping(engine, settings.db_pre_ping_idle_seconds)
+    install_idle_pre_ping(async_engine.sync_engine, settings.db_pre_ping_idle_seconds)
+
 Base = declarative_base()
@@ -9,6 +9,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app import deps
+from app.core.templating import template_environment
 from app.crud.avcb import avcb_crud
 from app.crud.license import license_crud
 from app.crud.residue import recipient_crud, transporter_crud, waste_code_crud
@@ -23,9 +24,10 @@ from app.schemas.residue import (
     WasteCodeCreate,
     WasteCodeUpdate,
 )
+from app.services.metrics import dashboard_metrics_service
 
 router = APIRouter(tags=["frontend"])
-templates = Jinja2Templates(directory="app/templates")
+templates = Jinja2Templates(env=template_environment)
 
 
 def _clean_text(value: str | None) -> str | None:
@@ -98,34 +100,27 @@ def _format_validation_errors(exc: ValidationError) -> str:
 
 
 @router.get("/ui/dashboard", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(deps.get_db)) -> HTMLResponse:
-    today = date.today()
-    licenses_total = db.query(License).count()
-    licenses_expiring = db.query(License).filter(License.expiry_date <= today).count()
-    avcb_total = db.query(Avcb).count()
-    avcb_expiring = db.query(Avcb).filter(Avcb.expiry_date <= today).count()
-    waste_codes_total = db.query(WasteCode).count()
-    transporters_total = db.query(Transporter).count()
-    recipients_total = db.query(Recipient).count()
+def dashboard(request: Request, db: Session = Depends(deps.get_db)) -> HTMLResponse:
+    counts = dashboard_metrics_service.get_metrics(db)
     return templates.TemplateResponse(
         "dashboard.html",
         {
             "request": request,
             "metrics": {
-                "licenses_total": licenses_total,
-                "licenses_expiring": licenses_expiring,
-                "avcb_total": avcb_total,
-                "avcb_expiring": avcb_expiring,
-                "waste_codes_total": waste_codes_total,
-                "transporters_total": transporters_total,
-                "recipients_total": recipients_total,
+                "licenses_total": counts["licenses"]["total"],
+                "licenses_expiring": counts["licenses"]["expiring_today"],
+                "avcb_total": counts["avcbs"]["total"],
+                "avcb_expiring": counts["avcbs"]["expiring_today"],
+                "waste_codes_total": counts["waste_codes"]["total"],
+                "transporters_total": counts["transporters"]["total"],
+                "recipients_total": counts["recipients"]["total"],
             },
         },
     )
 
 
 @router.get("/ui/licenses", response_class=HTMLResponse)
-async def list_licenses(request: Request, db: Session = Depends(deps.get_db)) -> HTMLResponse:
+def list_licenses(request: Request, db: Session = Depends(deps.get_db)) -> HTMLResponse:
     today = date.today()
     query = db.query(License).order_by(License.expiry_date.asc())
     status_param = _clean_text(request.query_params.get("status"))
@@ -169,11 +164,12 @@ async def list_licenses(request: Request, db: Session = Depends(deps.get_db)) ->
     message = request.query_params.get("message")
     error = request.query_params.get("error")
 
+    counts = dashboard_metrics_service.get_metrics(db)["licenses"]
     metrics = {
-        "total": db.query(License).count(),
-        "active": db.query(License).filter(License.status == LicenseStatus.ACTIVE).count(),
-        "expired": db.query(License).filter(License.status == LicenseStatus.EXPIRED).count(),
-        "due_30": db.query(License).filter(License.expiry_date <= today + timedelta(days=30)).count(),
+        "total": counts["total"],
+        "active": counts["active"],
+        "expired": counts["expired"],
+        "due_30": counts["expiring_30"],
     }
 
     return templates.TemplateResponse(
@@ -197,7 +193,7 @@ async def list_licenses(request: Request, db: Session = Depends(deps.get_db)) ->
 
 
 @router.get("/ui/avcbs", response_class=HTMLResponse)
-async def list_avcbs(request: Request, db: Session = Depends(deps.get_db)) -> HTMLResponse:
+def list_avcbs(request: Request, db: Session = Depends(deps.get_db)) -> HTMLResponse:
     today = date.today()
     query = db.query(Avcb).order_by(Avcb.expiry_date.asc())
     status_param = _clean_text(request.query_params.get("status"))
@@ -241,11 +237,12 @@ async def list_avcbs(request: Request, db: Session = Depends(deps.get_db)) -> HT
     message = request.query_params.get("message")
     error = request.query_params.get("error")
 
+    counts = dashboard_metrics_service.get_metrics(db)["avcbs"]
     metrics = {
-        "total": db.query(Avcb).count(),
-        "valid": db.query(Avcb).filter(Avcb.status == AvcbStatus.VALID).count(),
-        "expired": db.query(Avcb).filter(Avcb.status == AvcbStatus.EXPIRED).count(),
-        "due_30": db.query(Avcb).filter(Avcb.expiry_date <= today + timedelta(days=30)).count(),
+        "total": counts["total"],
+        "valid": counts["active"],
+        "expired": counts["expired"],
+        "due_30": counts["expiring_30"],
     }
 
     return templates.TemplateResponse(
@@ -269,7 +266,7 @@ async def list_avcbs(request: Request, db: Session = Depends(deps.get_db)) -> HT
 
 
 @router.post("/ui/licenses", response_class=HTMLResponse)
-async def create_or_update_license(
+def create_or_update_license(
     request: Request,
     license_id: str | None = Form(None),
     name: str = Form(...),
@@ -355,7 +352,7 @@ async def create_or_update_license(
 
 
 @router.post("/ui/licenses/{license_id}/delete", response_class=HTMLResponse)
-async def delete_license_form(
+def delete_license_form(
     request: Request,
     license_id: int,
     db: Session = Depends(deps.get_db),
@@ -368,7 +365,7 @@ async def delete_license_form(
 
 
 @router.post("/ui/avcbs", response_class=HTMLResponse)
-async def create_or_update_avcb(
+def create_or_update_avcb(
     request: Request,
     avcb_id: str | None = Form(None),
     property_name: str = Form(...),
@@ -458,7 +455,7 @@ async def create_or_update_avcb(
 
 
 @router.post("/ui/avcbs/{avcb_id}/delete", response_class=HTMLResponse)
-async def delete_avcb_form(
+def delete_avcb_form(
     request: Request,
     avcb_id: int,
     db: Session = Depends(deps.get_db),
@@ -471,7 +468,7 @@ async def delete_avcb_form(
 
 
 @router.get("/ui/residues", response_class=HTMLResponse)
-async def list_residues(request: Request, db: Session = Depends(deps.get_db)) -> HTMLResponse:
+def list_residues(request: Request, db: Session = Depends(deps.get_db)) -> HTMLResponse:
     waste_codes = db.query(WasteCode).order_by(WasteCode.code.asc()).all()
     transporters = db.query(Transporter).order_by(Transporter.name.asc()).all()
     recipients = db.query(Recipient).order_by(Recipient.name.asc()).all()
@@ -516,7 +513,7 @@ async def list_residues(request: Request, db: Session = Depends(deps.get_db)) ->
 
 
 @router.post("/ui/residues/waste-codes", response_class=HTMLResponse)
-async def create_waste_code_form(
+def create_waste_code_form(
     request: Request,
     code_id: str | None = Form(None),
     code: str = Form(...),
@@ -584,7 +581,7 @@ async def create_waste_code_form(
 
 
 @router.post("/ui/residues/transporters", response_class=HTMLResponse)
-async def create_transporter_form(
+def create_transporter_form(
     request: Request,
     transporter_id: str | None = Form(None),
     name: str = Form(...),
@@ -673,7 +670,7 @@ async def create_transporter_form(
 
 
 @router.post("/ui/residues/recipients", response_class=HTMLResponse)
-async def create_recipient_form(
+def create_recipient_form(
     request: Request,
     recipient_id: str | None = Form(None),
     name: str = Form(...),
@@ -764,7 +761,7 @@ async def create_recipient_form(
 
 
 @router.post("/ui/residues/waste-codes/{code_id}/delete", response_class=HTMLResponse)
-async def delete_waste_code_form(request: Request, code_id: int, db: Session = Depends(deps.get_db)) -> RedirectResponse:
+def delete_waste_code_form(request: Request, code_id: int, db: Session = Depends(deps.get_db)) -> RedirectResponse:
     try:
         waste_code_crud.remove(db, code_id)
     except ValueError:
@@ -773,7 +770,7 @@ async def delete_waste_code_form(request: Request, code_id: int, db: Session = D
 
 
 @router.post("/ui/residues/transporters/{transporter_id}/delete", response_class=HTMLResponse)
-async def delete_transporter_form(
+def delete_transporter_form(
     request: Request,
     transporter_id: int,
     db: Session = Depends(deps.get_db),
@@ -786,7 +783,7 @@ async def delete_transporter_form(
 
 
 @router.post("/ui/residues/recipients/{recipient_id}/delete", response_class=HTMLResponse)
-async def delete_recipient_form(
+def delete_recipient_form(
     request: Request,
     recipient_id: int,
     db: Session = Depends(deps.get_db),
@@ -10,16 +10,30 @@ from fastapi.openapi.docs import get_swagger_ui_html, get_swagger_ui_oauth2_redi
 from app.api import api_router
 from app.frontend import router as frontend_router
 from app.config import get_settings
-from app.database import Base, engine
+from app.core.pool import pool_status
+from app.core.schema import check_schema_version
+from app.core.security import password_hasher
+from app.database import async_engine, engine
+from app.services.email import email_service
+from app.services.reports import report_job_service
+from app.services.scheduler import scheduler
+from app.services.search import document_search_service
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     try:
-        Base.metadata.create_all(bind=engine)
+        check_schema_version(engine)
     except OperationalError as exc:
         raise RuntimeError("Falha ao conectar ao banco de dados") from exc
+    if settings.scheduler_enabled:
+        scheduler.start()
     yield
+    scheduler.stop()
+    email_service.shutdown()
+    document_search_service.shutdown()
+    report_job_service.shutdown()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -48,6 +62,14 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/health/db")
+async def database_pool_health() -> dict[str, dict]:
+    return {
+        "sync": pool_status(engine.pool, settings.db_max_overflow),
+        "async": pool_status(async_engine.sync_engine.pool, settings.db_max_overflow),
+    }
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index() -> HTMLResponse:
     html_content = (
@@ -1,6 +1,10 @@
 from app.models.avcb import Avcb, AvcbCondition, AvcbConditionStatus, AvcbStatus
+from app.models.document_text import DocumentText
+from app.models.email_message import EmailMessage, EmailStatus
 from app.models.license import ConditionStatus, License, LicenseCondition, LicenseStatus
+from app.models.notification_ledger import NotificationLedger
 from app.models.residue import Recipient, StorageCode, Transporter, WasteCode
+from app.models.stored_file import StoredFile
 from app.models.user import PasswordResetToken, User
 
 __all__ = [
@@ -18,4 +22,9 @@ __all__ = [
 	"StorageCode",
 	"Transporter",
 	"Recipient",
+	"StoredFile",
+	"DocumentText",
+	"EmailMessage",
+	"EmailStatus",
+	"NotificationLedger",
 ]
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Date, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -16,6 +16,10 @@ class AvcbStatus(str, PyEnum):
 
 class Avcb(Base):
     __tablename__ = "avcbs"
+    __table_args__ = (
+        Index("ix_avcbs_expiry_date", "expiry_date"),
+        Index("ix_avcbs_status_expiry_date", "status", "expiry_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     property_name = Column(String(255), nullable=False)
@@ -45,6 +49,7 @@ class AvcbConditionStatus(str, PyEnum):
 
 class AvcbCondition(Base):
     __tablename__ = "avcb_conditions"
+    __table_args__ = (Index("ix_avcb_conditions_due_date_status", "due_date", "status"),)
 
     id = Column(Integer, primary_key=True, index=True)
     avcb_id = Column(Integer, ForeignKey("avcbs.id", ondelete="CASCADE"), nullable=False)
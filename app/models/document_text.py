@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import DDL, Column, DateTime, Integer, String, Text, event
+from sqlalchemy.dialects import mysql
+
+from app.database import Base
+
+# Índices de texto completo criados fora do metadata: FTS5 no SQLite (tabela externa mantida por
+# gatilhos) e FULLTEXT no MySQL. A migração 0004 executa as mesmas instruções.
+SEARCH_INDEX_OBJECTS = {"document_texts_fts", "ix_document_texts_content"}
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE document_texts_fts USING fts5("
+    "content, content='document_texts', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER document_texts_ai AFTER INSERT ON document_texts BEGIN "
+    "INSERT INTO document_texts_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER document_texts_ad AFTER DELETE ON document_texts BEGIN "
+    "INSERT INTO document_texts_fts(document_texts_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER document_texts_au AFTER UPDATE ON document_texts BEGIN "
+    "INSERT INTO document_texts_fts(document_texts_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    "INSERT INTO document_texts_fts(rowid, content) VALUES (new.id, new.content); END",
+)
+MYSQL_SEARCH_DDL = ("ALTER TABLE document_texts ADD FULLTEXT INDEX ix_document_texts_content (content)",)
+
+
+class DocumentText(Base):
+    """Texto extraído de um PDF do armazenamento por conteúdo, indexado para busca."""
+
+    __tablename__ = "document_texts"
+
+    id = Column(Integer, primary_key=True)
+    sha256 = Column(String(64), unique=True, nullable=False)
+    path = Column(String(512), unique=True, nullable=False)
+    content = Column(Text().with_variant(mysql.LONGTEXT(), "mysql"), nullable=False)
+    page_count = Column(Integer, nullable=False)
+    extracted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(DocumentText.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in MYSQL_SEARCH_DDL:
+    event.listen(DocumentText.__table__, "after_create", DDL(statement).execute_if(dialect="mysql"))
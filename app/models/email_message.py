@@ -0,0 +1,33 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy.dialects import mysql
+
+from app.database import Base
+
+
+class EmailStatus(str, PyEnum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailMessage(Base):
+    """Mensagem na fila de saída; o job ``email-outbox`` entrega as pendentes com ``next_attempt_at`` vencido."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),)
+
+    id = Column(Integer, primary_key=True)
+    recipients = Column(JSON, nullable=False)
+    subject = Column(String(255), nullable=False)
+    html_content = Column(Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=False)
+    status = Column(Enum(EmailStatus), default=EmailStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(String(500), nullable=True)
+    provider_message_id = Column(String(255), nullable=True)
+    claim_token = Column(String(32), nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
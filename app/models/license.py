@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Date, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -16,6 +16,10 @@ class LicenseStatus(str, PyEnum):
 
 class License(Base):
     __tablename__ = "licenses"
+    __table_args__ = (
+        Index("ix_licenses_expiry_date", "expiry_date"),
+        Index("ix_licenses_status_expiry_date", "status", "expiry_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -44,6 +48,7 @@ class ConditionStatus(str, PyEnum):
 
 class LicenseCondition(Base):
     __tablename__ = "license_conditions"
+    __table_args__ = (Index("ix_license_conditions_due_date_status", "due_date", "status"),)
 
     id = Column(Integer, primary_key=True, index=True)
     license_id = Column(Integer, ForeignKey("licenses.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Index, Integer, String, UniqueConstraint
+
+from app.database import Base
+
+
+class NotificationLedger(Base):
+    """Alertas de vencimento já enfileirados: um por registro, data de vencimento e antecedência."""
+
+    __tablename__ = "notification_ledger"
+    __table_args__ = (
+        UniqueConstraint("entity", "entity_id", "due_date", "lead_days", name="uq_notification_ledger_alert"),
+        Index("ix_notification_ledger_due_date", "due_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    due_date = Column(Date, nullable=False)
+    lead_days = Column(Integer, nullable=False)
+    sent_at = Column(DateTime, default=datetime.utcnow, nullable=False)
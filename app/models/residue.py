@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, Index, Integer, String, Text
 
 from app.database import Base
 
@@ -13,6 +13,7 @@ class WasteCode(Base):
     description = Column(Text, nullable=True)
     classification = Column(String(100), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
 class StorageCode(Base):
@@ -22,10 +23,15 @@ class StorageCode(Base):
     code = Column(String(50), unique=True, nullable=False)
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
 class Transporter(Base):
     __tablename__ = "transporters"
+    __table_args__ = (
+        Index("ix_transporters_name", "name"),
+        Index("ix_transporters_license_expiry_date", "license_expiry_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -36,10 +42,15 @@ class Transporter(Base):
     contact_email = Column(String(255), nullable=True)
     contact_phone = Column(String(50), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
 class Recipient(Base):
     __tablename__ = "recipients"
+    __table_args__ = (
+        Index("ix_recipients_name", "name"),
+        Index("ix_recipients_license_expiry_date", "license_expiry_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -51,3 +62,4 @@ class Recipient(Base):
     contact_email = Column(String(255), nullable=True)
     contact_phone = Column(String(50), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+
+from app.database import Base
+
+
+class StoredFile(Base):
+    """Arquivo do armazenamento endereçado por conteúdo; ``ref_count`` conta os registros que o usam."""
+
+    __tablename__ = "stored_files"
+    __table_args__ = (Index("ix_stored_files_ref_count", "ref_count"),)
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(512), unique=True, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -17,6 +17,8 @@ from app.schemas.license import (
 	LicenseRead,
 	LicenseUpdate,
 )
+from app.schemas.pagination import Page
+from app.schemas.report import ReportJobRead
 from app.schemas.residue import (
 	RecipientBase,
 	RecipientCreate,
@@ -35,6 +37,7 @@ from app.schemas.residue import (
 	WasteCodeRead,
 	WasteCodeUpdate,
 )
+from app.schemas.search import DocumentRecordRef, DocumentSearchHit, DocumentSearchResults
 from app.schemas.user import UserBase, UserCreate, UserRead, UserUpdate
 
 __all__ = [
@@ -77,4 +80,9 @@ __all__ = [
 	"RecipientCreate",
 	"RecipientUpdate",
 	"RecipientRead",
+	"Page",
+	"ReportJobRead",
+	"DocumentRecordRef",
+	"DocumentSearchHit",
+	"DocumentSearchResults",
 ]
@@ -1,6 +1,7 @@
 from datetime import date, datetime
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
 
 from app.models.license import ConditionStatus, LicenseStatus
 
@@ -73,3 +74,30 @@ class LicenseRead(LicenseBase):
 class LicenseNotificationRequest(BaseModel):
     emails: list[EmailStr]
     days_left: int
+
+
+class LicenseBulkNotificationRequest(BaseModel):
+    """Licenças por ``license_ids`` e/ou pelos filtros da listagem; ao menos um critério é obrigatório."""
+
+    emails: list[EmailStr] = Field(min_length=1)
+    license_ids: list[int] | None = Field(default=None, max_length=1000)
+    status: LicenseStatus | None = None
+    days_until_expiry: int | None = None
+
+    @model_validator(mode="after")
+    def require_selection(self) -> "LicenseBulkNotificationRequest":
+        if not self.license_ids and self.status is None and self.days_until_expiry is None:
+            raise ValueError("Informe license_ids ou ao menos um filtro")
+        return self
+
+
+class LicenseNotificationResult(BaseModel):
+    license_id: int
+    status: Literal["queued", "skipped", "not_found"]
+    days_left: int | None = None
+    message_id: int | None = None
+
+
+class LicenseBulkNotificationResponse(BaseModel):
+    queued: int
+    items: list[LicenseNotificationResult]
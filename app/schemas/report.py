@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ReportJobRead(BaseModel):
+    id: str
+    report: str
+    status: Literal["pending", "done", "failed"]
+    filters: dict[str, str | None]
+    created_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = None
+    download_url: str | None = None
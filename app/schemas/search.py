@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class DocumentRecordRef(BaseModel):
+    entity: str
+    id: int
+    name: str
+    url: str
+
+
+class DocumentSearchHit(BaseModel):
+    sha256: str
+    snippet: str
+    score: float
+    records: list[DocumentRecordRef]
+
+
+class DocumentSearchResults(BaseModel):
+    query: str
+    items: list[DocumentSearchHit]
@@ -0,0 +1,209 @@
+import io
+import os
+import re
+import time
+import zipfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from urllib.parse import quote
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.config import get_settings
+from app.utils.file_storage import sha256_from_path
+
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_CACHE = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE = "private, no-cache"
+MISSING_MANIFEST = "arquivos_ausentes.txt"
+UNSAFE_ARCNAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+class DocumentNotFoundError(ValueError):
+    pass
+
+
+class RangeNotSatisfiableError(ValueError):
+    pass
+
+
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Interpreta um único intervalo ``bytes=início-fim`` e devolve os limites inclusivos.
+
+    Cabeçalhos malformados ou com vários intervalos retornam ``None`` e o arquivo inteiro é enviado.
+    """
+    unit, _, spec = header.partition("=")
+    start_text, separator, end_text = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or "," in spec or not separator:
+        return None
+    try:
+        if not start_text:
+            suffix_length = int(end_text)
+            if suffix_length <= 0 or size == 0:
+                raise RangeNotSatisfiableError
+            return max(size - suffix_length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise RangeNotSatisfiableError
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+def _read_chunks(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _content_disposition(filename: str, disposition: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+def serve_document(
+    request: Request,
+    path: str | None,
+    filename: str,
+    *,
+    immutable: bool = False,
+    disposition: str = "inline",
+) -> Response:
+    """Responde com o PDF em ``path`` tratando Range, If-Range, If-None-Match e cache HTTP.
+
+    Arquivos do armazenamento por conteúdo recebem ETag forte (o próprio sha256); arquivos antigos,
+    um ETag fraco de mtime e tamanho. ``immutable`` só deve ser usado em URLs que incluem o hash.
+    """
+    if not path:
+        raise DocumentNotFoundError("Documento não encontrado")
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError as exc:
+        raise DocumentNotFoundError("Documento não encontrado") from exc
+
+    sha256 = sha256_from_path(path)
+    etag = f'"{sha256}"' if sha256 else f'W/"{int(stat_result.st_mtime)}-{stat_result.st_size}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE if immutable and sha256 else REVALIDATE_CACHE,
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = _content_disposition(filename, disposition)
+    settings = get_settings()
+    if settings.document_accel_redirect_prefix:
+        relative = Path(os.path.relpath(path, settings.file_storage_dir))
+        if not relative.parts or relative.parts[0] != "..":
+            # O nginx entrega o arquivo (inclusive Range) a partir do local interno configurado.
+            prefix = settings.document_accel_redirect_prefix.rstrip("/")
+            headers["X-Accel-Redirect"] = f"{prefix}/{quote(relative.as_posix())}"
+            return Response(media_type="application/pdf", headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or (sha256 and if_range == etag)):
+        size = stat_result.st_size
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except RangeNotSatisfiableError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            headers.update({"Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(length)})
+            return StreamingResponse(
+                _read_chunks(path, start, length), status_code=206, media_type="application/pdf", headers=headers
+            )
+
+    return FileResponse(path, media_type="application/pdf", headers=headers, stat_result=stat_result)
+
+
+class _ZipSink(io.RawIOBase):
+    """Destino não pesquisável do ``ZipFile``: acumula os bytes escritos até o próximo ``drain``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_member(
+    archive: zipfile.ZipFile, sink: _ZipSink, info: zipfile.ZipInfo, chunks: Iterable[bytes], force_zip64: bool
+) -> Iterator[bytes]:
+    info.compress_type = zipfile.ZIP_DEFLATED
+    with archive.open(info, "w", force_zip64=force_zip64) as target:
+        for chunk in chunks:
+            target.write(chunk)
+            if data := sink.drain():
+                yield data
+    if data := sink.drain():
+        yield data
+
+
+def stream_zip(documents: Iterable[tuple[str, str]]) -> Iterator[bytes]:
+    """Gera um ZIP dos ``(nome, caminho)`` informados em blocos, sem arquivo temporário.
+
+    Como o destino não aceita ``seek``, o ``zipfile`` grava tamanhos e CRC em descritores após
+    cada arquivo; a memória usada não depende do número nem do tamanho dos documentos.
+    Arquivos ausentes no disco são listados em ``arquivos_ausentes.txt``.
+    """
+    sink = _ZipSink()
+    missing: list[str] = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for arcname, path in documents:
+            try:
+                source = open(path, "rb")
+            except FileNotFoundError:
+                missing.append(arcname)
+                continue
+            with source:
+                modified = time.localtime(os.fstat(source.fileno()).st_mtime)[:6]
+                info = zipfile.ZipInfo(UNSAFE_ARCNAME_CHARS.sub("_", arcname), modified)
+                yield from _zip_member(archive, sink, info, iter(lambda: source.read(CHUNK_SIZE), b""), True)
+        if missing:
+            archive.writestr(MISSING_MANIFEST, "\n".join(missing) + "\n")
+    yield sink.drain()
+
+
+def stream_zip_members(members: Iterable[tuple[str, Iterable[bytes]]]) -> Iterator[bytes]:
+    """Gera um ZIP cujos membros são produzidos sob demanda, como ``(nome, blocos de bytes)``.
+
+    Sem ZIP64: formatos como o XLSX são lidos por programas que o rejeitam, e cada membro
+    precisa ficar abaixo de 4 GB.
+    """
+    sink = _ZipSink()
+    modified = time.localtime()[:6]
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for name, chunks in members:
+            yield from _zip_member(archive, sink, zipfile.ZipInfo(name, modified), chunks, False)
+    yield sink.drain()
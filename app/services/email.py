@@ -1,54 +1,213 @@
 from __future__ import annotations
 
-from typing import Iterable
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterable, NamedTuple
+from uuid import uuid4
 
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import get_settings
+from app.database import SessionLocal
+from app.models.email_message import EmailMessage, EmailStatus
+from app.services.email_templates import email_templates
+
+SEND_PATH = "/v3/mail/send"
+
+
+class DeliveryResult(NamedTuple):
+    sent: bool
+    retry: bool
+    message_id: str | None = None
+    error: str | None = None
+    retry_after: int | None = None
 
 
 class EmailService:
-    def __init__(self) -> None:
+    """Enfileira mensagens na tabela ``email_outbox``; o job ``email-outbox`` faz a entrega.
+
+    A entrega usa um único cliente HTTP com keep-alive, compartilhado por ``EMAIL_SEND_CONCURRENCY``
+    threads. Falhas de rede, ``429`` e ``5xx`` são repetidas com espera exponencial; os demais erros
+    marcam a mensagem como ``failed``. Cada lote é reservado antes do envio, então execuções
+    simultâneas do job (agendador e ``POST /jobs/email-outbox/run``) não entregam a mesma mensagem.
+    """
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal) -> None:
         settings = get_settings()
         self.api_key = settings.sendgrid_api_key
         self.sender = settings.sendgrid_sender_email
-        self.enabled = bool(self.api_key and self.sender)
+        self.api_base_url = settings.sendgrid_api_base_url
+        self.session_factory = session_factory
+        self._client: httpx.Client | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key and self.sender)
+
+    def send_email(
+        self, to_emails: Iterable[str], subject: str, html_content: str, db: Session | None = None
+    ) -> int | None:
+        """Enfileira a mensagem; com ``db`` ela entra na transação de quem chamou, sem commit."""
+        recipients = list(to_emails)
+        if not self.enabled or not recipients:
+            return None
+        message = EmailMessage(recipients=recipients, subject=subject, html_content=html_content)
+        if db is not None:
+            db.add(message)
+            db.flush()
+            return message.id
+        with self.session_factory() as session:
+            session.add(message)
+            session.commit()
+            return message.id
 
-    def send_email(self, to_emails: Iterable[str], subject: str, html_content: str) -> None:
+    def deliver_pending(self, db: Session, now: datetime | None = None) -> dict[str, int]:
+        stats = dict.fromkeys(("sent", "retried", "failed"), 0)
         if not self.enabled:
-            return
-        message = Mail(from_email=self.sender, to_emails=list(to_emails), subject=subject, html_content=html_content)
-        client = SendGridAPIClient(self.api_key)
-        try:
-            client.send(message)
-        except Exception:
-            # FIXME: substituir por logging estruturado
-            return
+            return stats
+        settings = get_settings()
+        now = now or datetime.utcnow()
+        candidates = (
+            select(EmailMessage.id)
+            .where(EmailMessage.status == EmailStatus.PENDING, EmailMessage.next_attempt_at <= now)
+            .order_by(EmailMessage.next_attempt_at, EmailMessage.id)
+            .limit(settings.email_batch_size)
+        )
+        lease = now + timedelta(seconds=settings.email_claim_lease_seconds)
+        # Cada candidata é reservada (por esta ou outra execução) ou processada, saindo da consulta: o laço termina.
+        while ids := db.scalars(candidates).all():
+            batch = self._claim(db, ids, now, lease)
+            payloads = [self._payload(message) for message in batch]
+            for message, result in zip(batch, self._pool().map(self._post, payloads)):
+                self._record(message, result, now, stats)
+            db.commit()
+        return stats
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            if self._client is not None:
+                self._client.close()
+                self._client = None
 
-    def send_license_expiry_notification(self, emails: Iterable[str], license_name: str, days_left: int) -> None:
-        subject = f"Licença {license_name} vence em {days_left} dia(s)"
-        html_content = (
-            f"<p>Olá,</p><p>A licença <strong>{license_name}</strong> expira em {days_left} dia(s)."  # noqa: S608
-            " Favor verificar as condicionantes pendentes.</p>"
+    def _claim(self, db: Session, ids: list[int], now: datetime, lease: datetime) -> list[EmailMessage]:
+        """Reserva as mensagens ainda livres com um UPDATE condicional e devolve só as reservadas aqui.
+
+        A reserva adia ``next_attempt_at`` até ``lease``: se o processo cair durante o envio, a mensagem
+        volta a ficar disponível quando a reserva vence.
+        """
+        token = uuid4().hex
+        db.execute(
+            update(EmailMessage)
+            .where(
+                EmailMessage.id.in_(ids),
+                EmailMessage.status == EmailStatus.PENDING,
+                EmailMessage.next_attempt_at <= now,
+            )
+            .values(claim_token=token, next_attempt_at=lease)
+            .execution_options(synchronize_session=False)
         )
-        self.send_email(emails, subject, html_content)
+        db.commit()
+        return db.scalars(
+            select(EmailMessage).where(EmailMessage.claim_token == token).order_by(EmailMessage.id)
+        ).all()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                workers = get_settings().email_send_concurrency
+                limits = httpx.Limits(max_connections=workers, max_keepalive_connections=workers)
+                self._client = httpx.Client(
+                    base_url=self.api_base_url,
+                    headers={"Authorization": f"Bearer {self.api_key}"},
+                    limits=limits,
+                    timeout=10.0,
+                )
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email-outbox")
+            return self._executor
+
+    def _payload(self, message: EmailMessage) -> dict:
+        return {
+            "personalizations": [{"to": [{"email": email} for email in message.recipients]}],
+            "from": {"email": self.sender},
+            "subject": message.subject,
+            "content": [{"type": "text/html", "value": message.html_content}],
+        }
 
-    def send_condition_overdue_notification(self, emails: Iterable[str], condition_title: str, entity: str) -> None:
-        subject = f"Condicionante '{condition_title}' atrasada"
-        html_content = (
-            f"<p>Olá,</p><p>A condicionante <strong>{condition_title}</strong> do {entity} está atrasada."  # noqa: S608
-            " Atualize o status o quanto antes.</p>"
+    def _post(self, payload: dict) -> DeliveryResult:
+        try:
+            response = self._client.post(SEND_PATH, json=payload)
+        except httpx.HTTPError as exc:
+            return DeliveryResult(sent=False, retry=True, error=f"{type(exc).__name__}: {exc}")
+        if response.is_success:
+            return DeliveryResult(sent=True, retry=False, message_id=response.headers.get("X-Message-Id"))
+        retry_after = response.headers.get("Retry-After", "")
+        return DeliveryResult(
+            sent=False,
+            retry=response.status_code == 429 or response.status_code >= 500,
+            error=f"HTTP {response.status_code}: {response.text[:400]}",
+            retry_after=int(retry_after) if retry_after.isdigit() else None,
         )
-        self.send_email(emails, subject, html_content)
 
-    def send_password_reset(self, email: str, reset_url: str) -> None:
-        subject = "Redefinição de senha"
-        html_content = (
-            "<p>Você solicitou a redefinição de senha.</p>"
-            f"<p>Clique no link para definir uma nova senha: <a href='{reset_url}'>{reset_url}</a></p>"
+    def _record(self, message: EmailMessage, result: DeliveryResult, now: datetime, stats: dict[str, int]) -> None:
+        settings = get_settings()
+        message.attempts += 1
+        message.claim_token = None
+        if result.sent:
+            message.status = EmailStatus.SENT
+            message.sent_at = now
+            message.provider_message_id = result.message_id
+            message.last_error = None
+            stats["sent"] += 1
+            return
+        message.last_error = result.error[:500]
+        if not result.retry or message.attempts >= settings.email_max_attempts:
+            message.status = EmailStatus.FAILED
+            stats["failed"] += 1
+            return
+        delay = min(settings.email_retry_base_seconds * 2 ** (message.attempts - 1), settings.email_retry_max_seconds)
+        message.next_attempt_at = now + timedelta(seconds=max(delay, result.retry_after or 0, 1))
+        stats["retried"] += 1
+
+    def send_template(
+        self,
+        to_emails: Iterable[str],
+        template: str,
+        locale: str | None = None,
+        db: Session | None = None,
+        **context,
+    ) -> int | None:
+        if not self.enabled:
+            return None
+        subject, html_content = email_templates.render(template, locale, **context)
+        return self.send_email(to_emails, subject, html_content, db=db)
+
+    def send_license_expiry_notification(
+        self,
+        emails: Iterable[str],
+        license_name: str,
+        days_left: int,
+        db: Session | None = None,
+        locale: str | None = None,
+    ) -> int | None:
+        return self.send_template(
+            emails, "license_expiry", locale, db=db, license_name=license_name, days_left=days_left
         )
-        self.send_email([email], subject, html_content)
+
+    def send_condition_overdue_notification(
+        self, emails: Iterable[str], condition_title: str, entity: str, locale: str | None = None
+    ) -> None:
+        self.send_template(emails, "condition_overdue", locale, condition_title=condition_title, entity=entity)
+
+    def send_password_reset(self, email: str, reset_url: str, locale: str | None = None) -> None:
+        self.send_template([email], "password_reset", locale, reset_url=reset_url)
 
 
 email_service = EmailService()
@@ -0,0 +1,46 @@
+import threading
+from typing import Any, NamedTuple
+
+import jinja2
+
+from app.config import get_settings
+from app.core.templating import template_environment
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    html: str
+
+
+class EmailTemplates:
+    """Renderiza ``app/templates/email/<locale>/<nome>.html`` pelo ambiente Jinja compartilhado.
+
+    Cada template define ``subject`` com ``{% set %}``. Sem variante para o locale pedido, tenta o
+    idioma (``en_US`` -> ``en``) e depois ``EMAIL_DEFAULT_LOCALE``; a escolha fica memorizada, para
+    que o fallback não consulte o disco a cada mensagem.
+    """
+
+    def __init__(self, environment: jinja2.Environment = template_environment) -> None:
+        self.environment = environment
+        self._resolved: dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def render(self, name: str, locale: str | None = None, **context: Any) -> RenderedEmail:
+        module = self.environment.get_template(self.resolve(name, locale)).make_module(context)
+        return RenderedEmail(str(module.subject).strip(), str(module))
+
+    def resolve(self, name: str, locale: str | None = None) -> str:
+        default_locale = get_settings().email_default_locale
+        key = (name, (locale or default_locale).replace("-", "_"))
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            candidates = dict.fromkeys(
+                f"email/{variant}/{name}.html" for variant in (key[1], key[1].split("_")[0], default_locale)
+            )
+            resolved = self.environment.select_template(list(candidates)).name
+            with self._lock:
+                self._resolved[key] = resolved
+        return resolved
+
+
+email_templates = EmailTemplates()
@@ -0,0 +1,364 @@
+import csv
+import io
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, NamedTuple
+from xml.sax.saxutils import escape
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import ColumnElement, Select
+
+from app.crud.base import ExpiryFilters
+from app.database import SessionLocal
+from app.models import (
+    Avcb,
+    AvcbCondition,
+    AvcbStatus,
+    License,
+    LicenseCondition,
+    LicenseStatus,
+    Recipient,
+    StorageCode,
+    Transporter,
+    WasteCode,
+)
+from app.services.documents import stream_zip_members
+
+XLSX_MAX_ROWS = 1_048_576
+EXCEL_EPOCH = date(1899, 12, 30)
+ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+# Texto iniciado por um destes caracteres vira fórmula ao abrir o CSV no Excel.
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportColumn(NamedTuple):
+    header: str
+    column: ColumnElement
+
+
+class ExportDefinition(NamedTuple):
+    filename: str
+    columns: tuple[ExportColumn, ...]
+    order_by: tuple[ColumnElement, ...]
+    # Filtros equivalentes aos da listagem; condicionantes herdam os do documento pai.
+    status_enum: type[Enum] | None = None
+    status_column: ColumnElement | None = None
+    date_column: ColumnElement | None = None
+    join: type | None = None
+
+
+def _condition_columns(model: type, parent_label: str, parent_name: ColumnElement) -> tuple[ExportColumn, ...]:
+    return (
+        ExportColumn("ID", model.id),
+        ExportColumn(parent_label, parent_name),
+        ExportColumn("Título", model.title),
+        ExportColumn("Descrição", model.description),
+        ExportColumn("Responsável", model.responsible),
+        ExportColumn("Prazo", model.due_date),
+        ExportColumn("Status", model.status),
+        ExportColumn("Observações de conclusão", model.completion_notes),
+        ExportColumn("Concluída em", model.completed_at),
+    )
+
+
+def _licensed_party_columns(model: type, *extra: ExportColumn) -> tuple[ExportColumn, ...]:
+    return (
+        ExportColumn("ID", model.id),
+        ExportColumn("Nome", model.name),
+        *extra,
+        ExportColumn("Número da licença", model.license_number),
+        ExportColumn("Emissão da licença", model.license_issue_date),
+        ExportColumn("Validade da licença", model.license_expiry_date),
+        ExportColumn("E-mail", model.contact_email),
+        ExportColumn("Telefone", model.contact_phone),
+    )
+
+
+EXPORTS: dict[str, ExportDefinition] = {
+    "licenses": ExportDefinition(
+        "licencas",
+        (
+            ExportColumn("ID", License.id),
+            ExportColumn("Nome", License.name),
+            ExportColumn("Órgão emissor", License.issuing_agency),
+            ExportColumn("Emissão", License.issue_date),
+            ExportColumn("Validade", License.expiry_date),
+            ExportColumn("Status", License.status),
+            ExportColumn("Observações", License.notes),
+        ),
+        (License.expiry_date, License.id),
+        LicenseStatus,
+        License.status,
+        License.expiry_date,
+    ),
+    "avcb": ExportDefinition(
+        "avcbs",
+        (
+            ExportColumn("ID", Avcb.id),
+            ExportColumn("Imóvel", Avcb.property_name),
+            ExportColumn("Endereço", Avcb.property_address),
+            ExportColumn("Responsável técnico", Avcb.technical_responsible),
+            ExportColumn("Emissão", Avcb.issue_date),
+            ExportColumn("Validade", Avcb.expiry_date),
+            ExportColumn("Status", Avcb.status),
+            ExportColumn("Observações", Avcb.notes),
+        ),
+        (Avcb.expiry_date, Avcb.id),
+        AvcbStatus,
+        Avcb.status,
+        Avcb.expiry_date,
+    ),
+    "license_conditions": ExportDefinition(
+        "condicionantes_licencas",
+        _condition_columns(LicenseCondition, "Licença", License.name),
+        (License.expiry_date, License.id, LicenseCondition.id),
+        LicenseStatus,
+        License.status,
+        License.expiry_date,
+        License,
+    ),
+    "avcb_conditions": ExportDefinition(
+        "condicionantes_avcbs",
+        _condition_columns(AvcbCondition, "AVCB", Avcb.property_name),
+        (Avcb.expiry_date, Avcb.id, AvcbCondition.id),
+        AvcbStatus,
+        Avcb.status,
+        Avcb.expiry_date,
+        Avcb,
+    ),
+    "waste_codes": ExportDefinition(
+        "codigos_residuos",
+        (
+            ExportColumn("ID", WasteCode.id),
+            ExportColumn("Código", WasteCode.code),
+            ExportColumn("Descrição", WasteCode.description),
+            ExportColumn("Classificação", WasteCode.classification),
+        ),
+        (WasteCode.id,),
+    ),
+    "storage_codes": ExportDefinition(
+        "codigos_armazenamento",
+        (
+            ExportColumn("ID", StorageCode.id),
+            ExportColumn("Código", StorageCode.code),
+            ExportColumn("Descrição", StorageCode.description),
+        ),
+        (StorageCode.id,),
+    ),
+    "transporters": ExportDefinition("transportadores", _licensed_party_columns(Transporter), (Transporter.id,)),
+    "recipients": ExportDefinition(
+        "destinatarios",
+        _licensed_party_columns(Recipient, ExportColumn("Tipo de instalação", Recipient.facility_type)),
+        (Recipient.id,),
+    ),
+}
+
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _csv_value(value: Any) -> Any:
+    value = _plain(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return "" if value is None else value
+
+
+def _xlsx_column(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(65 + remainder) + name
+    return name
+
+
+def _xlsx_text(reference: str, value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        value = value.value
+    text = escape(ILLEGAL_XML_CHARS.sub("", str(value)))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_number(reference: str, value: Any) -> str:
+    return "" if value is None else f'<c r="{reference}"><v>{value}</v></c>'
+
+
+def _xlsx_date(reference: str, value: date | None) -> str:
+    return "" if value is None else f'<c r="{reference}" s="1"><v>{(value - EXCEL_EPOCH).days}</v></c>'
+
+
+def _xlsx_datetime(reference: str, value: datetime | None) -> str:
+    if value is None:
+        return ""
+    serial = (value - datetime.combine(EXCEL_EPOCH, datetime.min.time())).total_seconds() / 86400
+    return f'<c r="{reference}" s="2"><v>{serial:.6f}</v></c>'
+
+
+def _xlsx_writer(column: ColumnElement) -> Callable[[str, Any], str]:
+    """Escolhe o formato da célula pelo tipo da coluna, uma vez por exportação e não por valor."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return _xlsx_text
+    if issubclass(python_type, datetime):
+        return _xlsx_datetime
+    if issubclass(python_type, date):
+        return _xlsx_date
+    if issubclass(python_type, (int, float)) and not issubclass(python_type, (bool, Enum)):
+        return _xlsx_number
+    return _xlsx_text
+
+
+XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Dados" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        "</Relationships>"
+    ),
+    # Estilo 1: data (formato 14); estilo 2: data e hora (formato 22); estilo 3: cabeçalho em negrito.
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+        "</styleSheet>"
+    ),
+}
+
+
+class ExportService:
+    """Exporta tabelas em CSV ou XLSX à medida que as linhas chegam do banco.
+
+    A consulta usa ``select`` do Core com ``yield_per`` (cursor no servidor), sem montar objetos
+    ORM; o gerador abre a própria sessão porque a da requisição é fechada antes do streaming.
+    """
+
+    batch_size = 2000
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal) -> None:
+        self.session_factory = session_factory
+
+    def statement(self, entity: str, filters: ExpiryFilters) -> Select:
+        definition = EXPORTS[entity]
+        statement = select(*(column.column for column in definition.columns))
+        if definition.join is not None:
+            statement = statement.join(definition.join)
+        if filters.status is not None and definition.status_column is not None:
+            statement = statement.where(definition.status_column == filters.status)
+        if filters.expiring_before is not None and definition.date_column is not None:
+            statement = statement.where(definition.date_column <= filters.expiring_before)
+        return statement.order_by(*definition.order_by)
+
+    def headers(self, entity: str) -> list[str]:
+        return [column.header for column in EXPORTS[entity].columns]
+
+    def iter_batches(self, entity: str, filters: ExpiryFilters) -> Iterator[Sequence[tuple]]:
+        statement = self.statement(entity, filters).execution_options(yield_per=self.batch_size)
+        with self.session_factory() as db:
+            yield from db.execute(statement).partitions()
+
+    def stream_csv(self, entity: str, filters: ExpiryFilters) -> Iterator[bytes]:
+        """CSV com BOM e ``;``, o formato que o Excel em português abre sem assistente de importação."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=";", lineterminator="\r\n")
+        writer.writerow(self.headers(entity))
+        # Cabeçalho enviado antes da consulta: o primeiro byte não espera o banco.
+        yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+        for batch in self.iter_batches(entity, filters):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_value(value) for value in row] for row in batch)
+            yield buffer.getvalue().encode("utf-8")
+
+    def stream_xlsx(self, entity: str, filters: ExpiryFilters) -> Iterator[bytes]:
+        members: list[tuple[str, Iterable[bytes]]] = [
+            (name, [content.encode("utf-8")]) for name, content in XLSX_STATIC_PARTS.items()
+        ]
+        members.append(("xl/worksheets/sheet1.xml", self._sheet_xml(entity, filters)))
+        return stream_zip_members(members)
+
+    def _sheet_xml(self, entity: str, filters: ExpiryFilters) -> Iterator[bytes]:
+        headers = self.headers(entity)
+        references = [_xlsx_column(index) for index in range(len(headers))]
+        writers = [_xlsx_writer(column.column) for column in EXPORTS[entity].columns]
+        header_cells = "".join(
+            f'<c r="{reference}1" s="3" t="inlineStr"><is><t>{escape(header)}</t></is></c>'
+            for reference, header in zip(references, headers)
+        )
+        yield (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" state="frozen"/>'
+            "</sheetView></sheetViews>"
+            f'<sheetData><row r="1">{header_cells}</row>'
+        ).encode("utf-8")
+        row_number = 1
+        for batch in self.iter_batches(entity, filters):
+            parts: list[str] = []
+            for row in batch:
+                if row_number >= XLSX_MAX_ROWS:
+                    break
+                row_number += 1
+                cells = "".join(
+                    write(f"{reference}{row_number}", value)
+                    for write, reference, value in zip(writers, references, row)
+                )
+                parts.append(f'<row r="{row_number}">{cells}</row>')
+            yield "".join(parts).encode("utf-8")
+            if row_number >= XLSX_MAX_ROWS:
+                break
+        yield b"</sheetData></worksheet>"
+
+
+export_service = ExportService()
@@ -0,0 +1,77 @@
+import time
+from collections.abc import Callable
+from datetime import date
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.crud.avcb import avcb_crud
+from app.crud.license import license_crud
+from app.database import SessionLocal
+from app.services.email import email_service
+from app.services.metrics import dashboard_metrics_service
+from app.services.notifications import expiry_notification_service
+from app.services.storage_gc import storage_garbage_collector
+
+JobResult = dict[str, int | float]
+Job = Callable[[Session], JobResult]
+
+
+def mark_overdue_conditions(db: Session) -> JobResult:
+    today = date.today()
+    return {
+        "license_conditions": license_crud.mark_overdue_conditions(db, today),
+        "avcb_conditions": avcb_crud.mark_overdue_conditions(db, today),
+    }
+
+
+def expire_statuses(db: Session) -> JobResult:
+    today = date.today()
+    result = {
+        "licenses": license_crud.expire_outdated(db, today),
+        "avcbs": avcb_crud.expire_outdated(db, today),
+    }
+    if any(result.values()):
+        dashboard_metrics_service.invalidate()
+    return result
+
+
+def notify_expiries(db: Session) -> JobResult:
+    return expiry_notification_service.notify(db)
+
+
+def deliver_emails(db: Session) -> JobResult:
+    return email_service.deliver_pending(db)
+
+
+def collect_storage_garbage(db: Session) -> JobResult:
+    return storage_garbage_collector.collect(db)
+
+
+JOBS: dict[str, Job] = {
+    "overdue-conditions": mark_overdue_conditions,
+    "expire-statuses": expire_statuses,
+    "expiry-notifications": notify_expiries,
+    "email-outbox": deliver_emails,
+    "storage-gc": collect_storage_garbage,
+}
+
+
+def execute_job(name: str, db: Session) -> JobResult:
+    job = JOBS.get(name)
+    if job is None:
+        raise ValueError(f"Job desconhecido: {name}")
+    started = time.perf_counter()
+    try:
+        result = job(db)
+    except Exception:
+        db.rollback()
+        raise
+    return {**result, "duration_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+def run_job(name: str, session_factory: sessionmaker = SessionLocal) -> JobResult:
+    db = session_factory()
+    try:
+        return execute_job(name, db)
+    finally:
+        db.close()
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+
+from sqlalchemy import case, event, func, literal, select, union_all
+from sqlalchemy.orm import Session, object_session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.models.avcb import Avcb, AvcbStatus
+from app.models.license import License, LicenseStatus
+from app.models.residue import Recipient, Transporter, WasteCode
+
+EntityCounts = dict[str, int]
+
+COUNTER_FIELDS = ("total", "expiring_today", "expiring_30", "active", "expired")
+
+
+def _count_if(condition) -> object:
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+class DashboardMetricsService:
+    upcoming_days = 30
+
+    def __init__(self) -> None:
+        self.cache: TTLCache[dict[str, EntityCounts]] = TTLCache(get_settings().metrics_cache_ttl_seconds)
+
+    def get_metrics(self, db: Session) -> dict[str, EntityCounts]:
+        today = date.today()
+        if db.info.get("metrics_changed") or db.new or db.dirty or db.deleted:
+            # Escritas ainda não confirmadas nesta sessão: calcula sem ler nem preencher o cache compartilhado.
+            return self.compute(db, today)
+        return self.cache.get_or_set(today, lambda: self.compute(db, today))
+
+    def invalidate(self) -> None:
+        self.cache.invalidate()
+
+    def compute(self, db: Session, today: date | None = None) -> dict[str, EntityCounts]:
+        today = today or date.today()
+        upcoming_threshold = today + timedelta(days=self.upcoming_days)
+        zero = literal(0)
+        statement = union_all(
+            select(
+                literal("licenses").label("entity"),
+                func.count(License.id).label("total"),
+                _count_if(License.expiry_date <= today).label("expiring_today"),
+                _count_if(License.expiry_date <= upcoming_threshold).label("expiring_30"),
+                _count_if(License.status == LicenseStatus.ACTIVE).label("active"),
+                _count_if(License.status == LicenseStatus.EXPIRED).label("expired"),
+            ),
+            select(
+                literal("avcbs"),
+                func.count(Avcb.id),
+                _count_if(Avcb.expiry_date <= today),
+                _count_if(Avcb.expiry_date <= upcoming_threshold),
+                _count_if(Avcb.status == AvcbStatus.VALID),
+                _count_if(Avcb.status == AvcbStatus.EXPIRED),
+            ),
+            select(literal("waste_codes"), func.count(WasteCode.id), zero, zero, zero, zero),
+            select(
+                literal("transporters"),
+                func.count(Transporter.id),
+                _count_if(Transporter.license_expiry_date <= today),
+                _count_if(Transporter.license_expiry_date <= upcoming_threshold),
+                zero,
+                zero,
+            ),
+            select(
+                literal("recipients"),
+                func.count(Recipient.id),
+                _count_if(Recipient.license_expiry_date <= today),
+                _count_if(Recipient.license_expiry_date <= upcoming_threshold),
+                zero,
+                zero,
+            ),
+        )
+        metrics: dict[str, EntityCounts] = {}
+        for row in db.execute(statement):
+            entity, *values = row
+            metrics[entity] = {field: int(value or 0) for field, value in zip(COUNTER_FIELDS, values)}
+        return metrics
+
+
+dashboard_metrics_service = DashboardMetricsService()
+
+
+def _flag_metrics_change(_mapper, _connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info["metrics_changed"] = True
+
+
+for _model in (License, Avcb, WasteCode, Transporter, Recipient):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _flag_metrics_change)
+
+
+# Só o commit invalida: um rollback não descarta o cache, e get_metrics ignora o cache
+# na sessão que ainda tem escritas pendentes.
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop("metrics_changed", False):
+        dashboard_metrics_service.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_metrics_flag(session: Session) -> None:
+    session.info.pop("metrics_changed", None)
@@ -0,0 +1,164 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, NamedTuple
+
+from sqlalchemy import insert, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.avcb import Avcb, AvcbCondition, AvcbConditionStatus
+from app.models.license import ConditionStatus, License, LicenseCondition
+from app.models.notification_ledger import NotificationLedger
+from app.models.residue import Recipient, Transporter
+from app.models.user import User
+from app.services.email import email_service
+
+
+class ExpirySource(NamedTuple):
+    entity: str
+    date_column: Any
+    label_column: Any
+    parent_column: Any = None
+    contact_column: Any = None
+    join: Any = None
+    where: tuple = ()
+
+
+class ExpiryAlert(NamedTuple):
+    entity: str
+    entity_id: int
+    label: str
+    due_date: date
+    days_left: int
+    lead_days: int
+
+
+EXPIRY_SOURCES: tuple[ExpirySource, ...] = (
+    ExpirySource("licenses", License.expiry_date, License.name),
+    ExpirySource("avcb", Avcb.expiry_date, Avcb.property_name),
+    ExpirySource(
+        "transporters",
+        Transporter.license_expiry_date,
+        Transporter.name,
+        contact_column=Transporter.contact_email,
+    ),
+    ExpirySource(
+        "recipients",
+        Recipient.license_expiry_date,
+        Recipient.name,
+        contact_column=Recipient.contact_email,
+    ),
+    ExpirySource(
+        "license_conditions",
+        LicenseCondition.due_date,
+        LicenseCondition.title,
+        parent_column=License.name,
+        contact_column=LicenseCondition.responsible,
+        join=LicenseCondition.license,
+        where=(LicenseCondition.status != ConditionStatus.COMPLETED,),
+    ),
+    ExpirySource(
+        "avcb_conditions",
+        AvcbCondition.due_date,
+        AvcbCondition.title,
+        parent_column=Avcb.property_name,
+        contact_column=AvcbCondition.responsible,
+        join=AvcbCondition.avcb,
+        where=(AvcbCondition.status != AvcbConditionStatus.COMPLETED,),
+    ),
+)
+
+
+def lead_for(days_left: int, lead_days: list[int]) -> int | None:
+    """Menor antecedência já alcançada; um registro criado perto do vencimento pula os avisos anteriores."""
+    return next((lead for lead in sorted(lead_days) if days_left <= lead), None)
+
+
+class ExpiryNotificationService:
+    """Envia, por destinatário, um resumo dos vencimentos que cruzaram uma antecedência configurada.
+
+    Todas as fontes são lidas em uma única consulta por faixa de datas indexada. O registro em
+    ``notification_ledger`` e os e-mails enfileirados são gravados na mesma transação, então cada
+    alerta sai uma única vez; uma nova data de vencimento gera novos alertas.
+    """
+
+    def statement(self, start: date, end: date):
+        selects = []
+        for source in EXPIRY_SOURCES:
+            model = source.date_column.class_
+            statement = select(
+                literal(source.entity).label("entity"),
+                model.id.label("id"),
+                source.label_column.label("label"),
+                (source.parent_column if source.parent_column is not None else null()).label("parent"),
+                (source.contact_column if source.contact_column is not None else null()).label("contact"),
+                source.date_column.label("due_date"),
+            ).where(source.date_column.between(start, end), *source.where)
+            if source.join is not None:
+                statement = statement.join(source.join)
+            selects.append(statement)
+        return union_all(*selects)
+
+    def pending_alerts(self, db: Session, today: date) -> list[tuple[ExpiryAlert, str | None]]:
+        lead_days = get_settings().expiry_notification_lead_days
+        horizon = today + timedelta(days=max(lead_days))
+        sent = set(
+            db.execute(
+                select(
+                    NotificationLedger.entity,
+                    NotificationLedger.entity_id,
+                    NotificationLedger.due_date,
+                    NotificationLedger.lead_days,
+                ).where(NotificationLedger.due_date.between(today, horizon))
+            ).tuples()
+        )
+        alerts = []
+        for row in db.execute(self.statement(today, horizon)).mappings():
+            days_left = (row["due_date"] - today).days
+            lead = lead_for(days_left, lead_days)
+            if lead is None or (row["entity"], row["id"], row["due_date"], lead) in sent:
+                continue
+            label = f"{row['label']} ({row['parent']})" if row["parent"] else row["label"]
+            alert = ExpiryAlert(row["entity"], row["id"], label, row["due_date"], days_left, lead)
+            contact = row["contact"].strip() if row["contact"] and "@" in row["contact"] else None
+            alerts.append((alert, contact))
+        return alerts
+
+    def team_emails(self, db: Session) -> list[str]:
+        configured = get_settings().expiry_notification_emails
+        if configured:
+            return list(configured)
+        return list(db.scalars(select(User.email).where(User.is_superuser.is_(True), User.is_active.is_(True))))
+
+    def notify(self, db: Session, today: date | None = None) -> dict[str, int]:
+        if not email_service.enabled:
+            return {"alerts": 0, "digests": 0}
+        today = today or date.today()
+        alerts = self.pending_alerts(db, today)
+        if not alerts:
+            return {"alerts": 0, "digests": 0}
+        team = self.team_emails(db)
+        digests: dict[str, list[ExpiryAlert]] = defaultdict(list)
+        for alert, contact in alerts:
+            for email in {email.lower() for email in (*team, contact) if email}:
+                digests[email].append(alert)
+        for email, items in digests.items():
+            items.sort(key=lambda alert: (alert.due_date, alert.entity, alert.label))
+            email_service.send_template([email], "expiry_digest", db=db, alerts=items)
+        db.execute(
+            insert(NotificationLedger),
+            [
+                {
+                    "entity": alert.entity,
+                    "entity_id": alert.entity_id,
+                    "due_date": alert.due_date,
+                    "lead_days": alert.lead_days,
+                }
+                for alert, _contact in alerts
+            ],
+        )
+        db.commit()
+        return {"alerts": len(alerts), "digests": len(digests)}
+
+
+expiry_notification_service = ExpiryNotificationService()
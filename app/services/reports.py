@@ -1,40 +1,482 @@
-from datetime import date
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Any, NamedTuple
 
 from fpdf import FPDF
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import ColumnElement, Select
 
 from app.config import get_settings
+from app.database import database_url as default_database_url
+from app.models import (
+    Avcb,
+    AvcbCondition,
+    License,
+    LicenseCondition,
+    Recipient,
+    StorageCode,
+    Transporter,
+    WasteCode,
+)
+
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = "reports"
+ReportFilters = dict[str, str | None]
+
+
+def reports_dir() -> Path:
+    return Path(get_settings().file_storage_dir) / REPORTS_DIR
+
+
+class TableColumn(NamedTuple):
+    key: str
+    header: str
+    width: float
+    align: str = "L"
+
+
+class TableLayout(NamedTuple):
+    title: str
+    columns: tuple[TableColumn, ...]
+    group_by: str | None = None
+    group_label: str = ""
+    group_by_month: bool = False
+    orientation: str = "P"
+
+
+def format_cell(value: Any) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return value.strftime("%d/%m/%Y %H:%M")
+    if isinstance(value, date):
+        return value.strftime("%d/%m/%Y")
+    # As fontes embutidas do PDF só cobrem latin-1.
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+
+class _TablePDF(FPDF):
+    """Tabela desenhada com ``text`` e ``line``: ``cell`` é cerca de dez vezes mais caro por célula."""
+
+    row_height = 6
+    body_font_size = 8
+    bottom_margin = 12
+
+    def __init__(self, layout: TableLayout) -> None:
+        super().__init__(orientation=layout.orientation, format="A4")
+        self.layout = layout
+        self.generated_on = date.today().strftime("%d/%m/%Y")
+        self.set_margins(10, 10, 10)
+        self.set_auto_page_break(False)
+        self._segment_top: float | None = None
+        self.edges = [self.l_margin]
+        for column in layout.columns:
+            self.edges.append(self.edges[-1] + column.width)
+
+    def header(self) -> None:
+        self.set_font("Helvetica", "B", 12)
+        self.cell(0, 8, format_cell(self.layout.title), new_x="LMARGIN", new_y="NEXT")
+        self.set_font("Helvetica", "B", self.body_font_size)
+        self.set_fill_color(230, 230, 230)
+        for column in self.layout.columns:
+            self.cell(
+                column.width, self.row_height, format_cell(column.header), border=1, align=column.align, fill=True
+            )
+        self.ln(self.row_height)
+        self.set_font("Helvetica", "", self.body_font_size)
+
+    def footer(self) -> None:
+        self.set_y(-10)
+        self.set_font("Helvetica", "", 7)
+        self.cell(0, 5, f"Gerado em {self.generated_on} - página {self.page_no()}", align="R")
+        self.set_font("Helvetica", "", self.body_font_size)
+
+    def _text_width(self, text: str) -> float:
+        # Soma direta das larguras da fonte embutida; get_string_width passa pelo parser de estilos.
+        widths = self.current_font.cw
+        return sum(map(widths.__getitem__, text)) * self.font_size_pt * 0.001 / self.k
+
+    def _fit(self, text: str, available: float) -> tuple[str, float]:
+        width = self._text_width(text)
+        if width <= available:
+            return text, width
+        while text and width > available:
+            text = text[: max(int(len(text) * available / width) - 1, 0)]
+            width = self._text_width(text + "...")
+        return text + "...", width
+
+    def _reserve_row(self) -> float:
+        if self.get_y() + self.row_height > self.h - self.bottom_margin:
+            self.close_segment()
+            self.add_page()
+        top = self.get_y()
+        self.set_y(top + self.row_height)
+        return top
+
+    def close_segment(self) -> None:
+        """Desenha as divisórias verticais de uma vez para o trecho de linhas desde o último subtítulo."""
+        if self._segment_top is None:
+            return
+        for edge in self.edges:
+            self.line(edge, self._segment_top, edge, self.get_y())
+        self._segment_top = None
+
+    def _baseline(self, top: float) -> float:
+        return top + (self.row_height + self.font_size * 0.7) / 2
+
+    def write_row(self, values: list[str]) -> None:
+        top = self._reserve_row()
+        if self._segment_top is None:
+            self._segment_top = top
+        baseline = self._baseline(top)
+        for column, value, left, right in zip(self.layout.columns, values, self.edges, self.edges[1:]):
+            text, width = self._fit(value, column.width - 2 * self.c_margin)
+            if column.align == "C":
+                x = left + (column.width - width) / 2
+            elif column.align == "R":
+                x = right - self.c_margin - width
+            else:
+                x = left + self.c_margin
+            self.text(x, baseline, text)
+        self.line(self.edges[0], top + self.row_height, self.edges[-1], top + self.row_height)
+
+    def write_group(self, label: str) -> None:
+        self.close_segment()
+        top = self._reserve_row()
+        bottom = top + self.row_height
+        self.set_font("Helvetica", "B", self.body_font_size)
+        text, _width = self._fit(label, self.edges[-1] - self.edges[0] - 2 * self.c_margin)
+        self.text(self.edges[0] + self.c_margin, self._baseline(top), text)
+        self.set_font("Helvetica", "", self.body_font_size)
+        self.line(self.edges[0], top, self.edges[0], bottom)
+        self.line(self.edges[-1], top, self.edges[-1], bottom)
+        self.line(self.edges[0], bottom, self.edges[-1], bottom)
 
 
 class PDFReportService:
-    def __init__(self) -> None:
-        self.base_dir = Path(get_settings().file_storage_dir) / "reports"
-        self.base_dir.mkdir(parents=True, exist_ok=True)
+    def render_table(self, layout: TableLayout, rows: Iterable[Mapping[str, Any]], output_path: Path) -> Path:
+        """Desenha ``rows`` em tabela, repetindo título e cabeçalho das colunas a cada página.
 
-    def generate_license_expiry_report(self, entries: Iterable[dict]) -> Path:
-        pdf = FPDF()
+        ``rows`` é consumido uma única vez, na ordem recebida; com ``group_by`` a consulta deve vir
+        ordenada pela coluna de agrupamento, e cada mudança de valor abre um subtítulo.
+        """
+        pdf = _TablePDF(layout)
         pdf.add_page()
-        pdf.set_font("Arial", size=14)
-        pdf.cell(200, 10, txt="Relatório de Licenças", ln=True, align="C")
-        pdf.ln(10)
-        pdf.set_font("Arial", size=11)
-        for entry in entries:
-            pdf.multi_cell(
-                0,
-                8,
-                txt=(
-                    f"Licença: {entry['name']}\n"
-                    f"Órgão emissor: {entry['issuing_agency']}\n"
-                    f"Validade: {entry['expiry_date']}\n"
-                    f"Status: {entry['status']}\n"
-                ),
-                border=1,
-            )
-            pdf.ln(2)
-        output_path = self.base_dir / f"licenses_{date.today().isoformat()}.pdf"
+        keys = [column.key for column in layout.columns]
+        current_group: object = None
+        count = 0
+        for row in rows:
+            if layout.group_by is not None:
+                group = row[layout.group_by]
+                if layout.group_by_month and isinstance(group, date):
+                    group = group.strftime("%m/%Y")
+                if count == 0 or group != current_group:
+                    current_group = group
+                    label = format_cell(group) if group is not None else "sem informação"
+                    pdf.write_group(format_cell(f"{layout.group_label}: {label}"))
+            pdf.write_row([format_cell(row[key]) for key in keys])
+            count += 1
+        if count == 0:
+            pdf.write_group("Nenhum registro encontrado.")
+        pdf.close_segment()
         pdf.output(str(output_path))
         return output_path
 
 
 pdf_report_service = PDFReportService()
+
+
+class ReportDefinition(NamedTuple):
+    layout: TableLayout
+    # Colunas rotuladas com as chaves do layout, já ordenadas pelo agrupamento.
+    statement: Callable[[], Select]
+    date_column: ColumnElement | None
+    # Tabelas cuja alteração invalida o relatório em cache.
+    models: tuple[type, ...]
+
+
+def _licensed_party_report(model: type, title: str) -> ReportDefinition:
+    return ReportDefinition(
+        TableLayout(
+            title,
+            (
+                TableColumn("name", "Nome", 100),
+                TableColumn("license_number", "Licença", 45),
+                TableColumn("license_expiry_date", "Validade", 25, "C"),
+                TableColumn("contact_email", "E-mail", 72),
+                TableColumn("contact_phone", "Telefone", 35),
+            ),
+            group_by="license_expiry_date",
+            group_label="Vencimento",
+            group_by_month=True,
+            orientation="L",
+        ),
+        lambda: select(
+            model.name, model.license_number, model.license_expiry_date, model.contact_email, model.contact_phone
+        ).order_by(model.license_expiry_date.is_(None), model.license_expiry_date, model.id),
+        model.license_expiry_date,
+        (model,),
+    )
+
+
+def _condition_report(model: type, parent: type, parent_name: ColumnElement, title: str) -> ReportDefinition:
+    return ReportDefinition(
+        TableLayout(
+            title,
+            (
+                TableColumn("parent", "Documento", 75),
+                TableColumn("title", "Condicionante", 102),
+                TableColumn("responsible", "Responsável", 50),
+                TableColumn("due_date", "Prazo", 25, "C"),
+                TableColumn("status", "Status", 25, "C"),
+            ),
+            group_by="due_date",
+            group_label="Prazo",
+            group_by_month=True,
+            orientation="L",
+        ),
+        lambda: select(
+            parent_name.label("parent"), model.title, model.responsible, model.due_date, model.status
+        )
+        .join(parent)
+        .order_by(model.due_date.is_(None), model.due_date, model.id),
+        model.due_date,
+        (model, parent),
+    )
+
+
+def _code_report(model: type, title: str, *extra: TableColumn) -> ReportDefinition:
+    description_width = 160 - sum(column.width for column in extra)
+    columns = (TableColumn("code", "Código", 30), TableColumn("description", "Descrição", description_width), *extra)
+    return ReportDefinition(
+        TableLayout(title, columns),
+        lambda: select(*(getattr(model, column.key) for column in columns)).order_by(model.code),
+        None,
+        (model,),
+    )
+
+
+REPORTS: dict[str, ReportDefinition] = {
+    "licenses": ReportDefinition(
+        TableLayout(
+            "Relatório de Licenças",
+            (
+                TableColumn("name", "Licença", 115),
+                TableColumn("expiry_date", "Validade", 25, "C"),
+                TableColumn("issue_date", "Emissão", 25, "C"),
+                TableColumn("status", "Status", 25, "C"),
+            ),
+            group_by="issuing_agency",
+            group_label="Órgão emissor",
+        ),
+        lambda: select(
+            License.name, License.issuing_agency, License.expiry_date, License.issue_date, License.status
+        ).order_by(License.issuing_agency, License.expiry_date, License.id),
+        License.expiry_date,
+        (License,),
+    ),
+    "avcb": ReportDefinition(
+        TableLayout(
+            "Relatório de AVCBs",
+            (
+                TableColumn("property_name", "Imóvel", 85),
+                TableColumn("technical_responsible", "Responsável técnico", 55),
+                TableColumn("expiry_date", "Validade", 25, "C"),
+                TableColumn("status", "Status", 25, "C"),
+            ),
+            group_by="expiry_date",
+            group_label="Vencimento",
+            group_by_month=True,
+        ),
+        lambda: select(Avcb.property_name, Avcb.technical_responsible, Avcb.expiry_date, Avcb.status).order_by(
+            Avcb.expiry_date, Avcb.id
+        ),
+        Avcb.expiry_date,
+        (Avcb,),
+    ),
+    "license_conditions": _condition_report(
+        LicenseCondition, License, License.name, "Condicionantes de Licenças"
+    ),
+    "avcb_conditions": _condition_report(AvcbCondition, Avcb, Avcb.property_name, "Condicionantes de AVCBs"),
+    "transporters": _licensed_party_report(Transporter, "Transportadores de Resíduos"),
+    "recipients": _licensed_party_report(Recipient, "Destinatários de Resíduos"),
+    "waste_codes": _code_report(WasteCode, "Códigos de Resíduos", TableColumn("classification", "Classe", 30)),
+    "storage_codes": _code_report(StorageCode, "Códigos de Armazenamento"),
+}
+
+
+def _filtered(definition: ReportDefinition, filters: ReportFilters) -> Select:
+    statement = definition.statement()
+    if filters.get("expiring_before") and definition.date_column is not None:
+        statement = statement.where(definition.date_column <= date.fromisoformat(filters["expiring_before"]))
+    return statement
+
+
+def report_version(db: Session, report: str, filters: ReportFilters) -> tuple[int, list]:
+    """Devolve (registros que entram no relatório, carimbo que muda a cada alteração dos dados)."""
+    definition = REPORTS[report]
+    matched = db.scalar(select(func.count()).select_from(_filtered(definition, filters).order_by(None).subquery()))
+    stamp = []
+    for model in definition.models:
+        total, last_update = db.execute(select(func.count(model.id), func.max(model.updated_at))).one()
+        stamp.append([total, last_update.isoformat() if last_update else None])
+    return matched, stamp
+
+
+def report_rows(db: Session, report: str, filters: ReportFilters) -> Iterable[Mapping[str, Any]]:
+    # yield_per usa cursor no servidor (stream_results): as linhas chegam em lotes, sem carregar tudo.
+    result = db.execute(_filtered(REPORTS[report], filters).execution_options(yield_per=2000))
+    return result.mappings()
+
+
+class EmptyReportError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=4)
+def _worker_sessionmaker(url: str) -> sessionmaker:
+    return sessionmaker(bind=create_engine(url, poolclass=NullPool), autoflush=False)
+
+
+def render_report(url: str, report: str, filters: ReportFilters, output_path: str) -> str:
+    """Executado no processo filho: consulta o banco por conta própria e grava o PDF atomicamente."""
+    target = Path(output_path)
+    temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with _worker_sessionmaker(url)() as db:
+            pdf_report_service.render_table(REPORTS[report].layout, report_rows(db, report, filters), temporary)
+        os.replace(temporary, target)
+    finally:
+        temporary.unlink(missing_ok=True)
+    return str(target)
+
+
+class ReportJobService:
+    """Gera relatórios em um pool de processos, com cache por filtros e versão dos dados.
+
+    O id do job é derivado dessa chave: pedidos idênticos, simultâneos ou não, compartilham
+    uma única renderização enquanto os dados não mudarem.
+    """
+
+    max_jobs = 256
+
+    def __init__(self, url: URL | str = default_database_url) -> None:
+        self.database_url = url
+        self._executor: ProcessPoolExecutor | None = None
+        self._jobs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def submit(self, db: Session, report: str, filters: ReportFilters) -> dict[str, Any]:
+        if report not in REPORTS:
+            raise ValueError(f"Relatório desconhecido: {report}")
+        matched, stamp = report_version(db, report, filters)
+        if not matched:
+            raise EmptyReportError("Nenhum registro encontrado para o relatório")
+        payload = json.dumps({"report": report, "filters": filters, "version": stamp}, sort_keys=True)
+        job_id = hashlib.sha256(payload.encode()).hexdigest()[:32]
+        output_path = reports_dir() / f"{report}_{job_id}.pdf"
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and (job["status"] == "pending" or self._is_ready(job)):
+                return dict(job)
+            job = {
+                "id": job_id,
+                "report": report,
+                "filters": filters,
+                "status": "pending",
+                "path": str(output_path),
+                "created_at": time.time(),
+                "finished_at": None,
+                "error": None,
+            }
+            self._remember(job)
+            if output_path.exists():
+                # Renderizado antes (inclusive por outro processo ou antes de um restart).
+                job.update(status="done", finished_at=job["created_at"])
+            else:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                future = self._pool().submit(render_report, self._url_string(), report, filters, str(output_path))
+                future.add_done_callback(lambda done: self._finish(job_id, done))
+            return dict(job)
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def wait(self, job_id: str, timeout: float | None = None) -> dict[str, Any] | None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (job := self.get(job_id)) is not None and job["status"] == "pending":
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        return job
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: o processo filho não herda threads nem conexões abertas do servidor.
+            self._executor = ProcessPoolExecutor(
+                max_workers=get_settings().report_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _url_string(self) -> str:
+        if isinstance(self.database_url, URL):
+            return self.database_url.render_as_string(hide_password=False)
+        return self.database_url
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        error = None if future.cancelled() else future.exception()
+        if future.cancelled() or error is not None:
+            logger.error("Falha ao gerar o relatório %s", job_id, exc_info=error)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["finished_at"] = time.time()
+            if future.cancelled():
+                job.update(status="failed", error="Geração cancelada")
+            elif error is not None:
+                job.update(status="failed", error=str(error) or type(error).__name__)
+            else:
+                job["status"] = "done"
+
+    def _is_ready(self, job: dict[str, Any]) -> bool:
+        return job["status"] == "done" and os.path.exists(job["path"])
+
+    def _remember(self, job: dict[str, Any]) -> None:
+        self._jobs[job["id"]] = job
+        self._jobs.move_to_end(job["id"])
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id]["status"] != "pending":
+                del self._jobs[job_id]
+
+
+report_job_service = ReportJobService()
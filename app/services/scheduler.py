@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.config import get_settings
+from app.database import engine as default_engine
+from app.services.jobs import run_job
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock:
+    """Garante que apenas um processo (entre workers e hosts) execute os jobs agendados."""
+
+    lock_name = "controle_licencas_scheduler"
+
+    def __init__(self, engine: Engine, lock_dir: Path) -> None:
+        self.engine = engine
+        self.lock_path = lock_dir / ".scheduler.lock"
+        self._connection: Connection | None = None
+        self._lock_file = None
+
+    def acquire(self) -> bool:
+        if self.engine.dialect.name == "mysql":
+            return self._acquire_mysql()
+        return self._acquire_file()
+
+    def release(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.lock_name})
+                self._connection.close()
+            except Exception:
+                logger.warning("Falha ao liberar o lock do agendador", exc_info=True)
+            self._connection = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _acquire_mysql(self) -> bool:
+        try:
+            if self._connection is None:
+                self._connection = self.engine.connect()
+                acquired = self._connection.execute(
+                    text("SELECT GET_LOCK(:name, 0)"), {"name": self.lock_name}
+                ).scalar()
+            else:
+                acquired = self._connection.execute(
+                    text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": self.lock_name}
+                ).scalar()
+            self._connection.commit()
+        except Exception:
+            logger.warning("Falha ao verificar o lock do agendador", exc_info=True)
+            self.release()
+            return False
+        if not acquired:
+            self.release()
+        return bool(acquired)
+
+    def _acquire_file(self) -> bool:
+        if fcntl is None:
+            return True
+        if self._lock_file is not None:
+            return True
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = self.lock_path.open("a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+
+class JobScheduler:
+    def __init__(self, intervals: dict[str, int], leader_lock: LeaderLock, tick_seconds: int) -> None:
+        self.intervals = intervals
+        self.leader_lock = leader_lock
+        self.tick_seconds = tick_seconds
+        self.last_results: dict[str, dict] = {}
+        self._next_run = {name: 0.0 for name in intervals}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.tick_seconds)
+            self._thread = None
+        self.leader_lock.release()
+
+    def run_pending(self) -> None:
+        if not self.leader_lock.acquire():
+            return
+        now = time.monotonic()
+        for name, interval in self.intervals.items():
+            if self._next_run[name] > now:
+                continue
+            self._next_run[name] = now + interval
+            try:
+                self.last_results[name] = run_job(name)
+            except Exception:
+                logger.exception("Job agendado %s falhou", name)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(self.tick_seconds)
+
+
+def build_scheduler() -> JobScheduler:
+    settings = get_settings()
+    intervals = {
+        "overdue-conditions": settings.overdue_conditions_interval_seconds,
+        "expire-statuses": settings.status_expiry_interval_seconds,
+        "expiry-notifications": settings.expiry_notification_interval_seconds,
+        "email-outbox": settings.email_outbox_interval_seconds,
+        "storage-gc": settings.storage_gc_interval_seconds,
+    }
+    return JobScheduler(
+        intervals,
+        LeaderLock(default_engine, Path(settings.file_storage_dir)),
+        settings.scheduler_tick_seconds,
+    )
+
+
+scheduler = build_scheduler()
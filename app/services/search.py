@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
+from sqlalchemy import select, text, union, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import CompoundSelect
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Avcb, DocumentText, License, Recipient, Transporter
+from app.services.storage_gc import pdf_path_columns
+from app.utils.file_storage import StoredUpload, sha256_from_path
+
+logger = logging.getLogger(__name__)
+
+SEARCHABLE_ENTITIES = {
+    "licenses": (License.id, License.name, License.pdf_path),
+    "avcb": (Avcb.id, Avcb.property_name, Avcb.pdf_path),
+    "transporters": (Transporter.id, Transporter.name, Transporter.license_pdf_path),
+    "recipients": (Recipient.id, Recipient.name, Recipient.license_pdf_path),
+}
+SNIPPET_RADIUS = 80
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def extract_pdf_text(path: str) -> tuple[str, int]:
+    reader = PdfReader(path)
+    pages = [page.extract_text() or "" for page in reader.pages]
+    return "\n".join(pages).replace("\x00", ""), len(pages)
+
+
+def _query_terms(query: str) -> list[str]:
+    return TOKEN_PATTERN.findall(query)[:16]
+
+
+def _referenced_paths() -> CompoundSelect:
+    """Caminhos ainda ligados a algum registro pesquisável; documentos soltos não entram nos resultados."""
+    return union_all(*(select(path).where(path.isnot(None)) for _id, _name, path in SEARCHABLE_ENTITIES.values()))
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def _snippet(content: str, terms: list[str]) -> str:
+    lowered = content.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    start = min((position for position in positions if position >= 0), default=0)
+    begin = max(start - SNIPPET_RADIUS, 0)
+    excerpt = " ".join(content[begin : start + SNIPPET_RADIUS].split())
+    return f"{'…' if begin else ''}{excerpt}{'…' if start + SNIPPET_RADIUS < len(content) else ''}"
+
+
+class DocumentSearchService:
+    """Extrai o texto dos PDFs enviados em segundo plano e consulta o índice de texto completo."""
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal) -> None:
+        self.session_factory = session_factory
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+
+    def submit(self, stored: StoredUpload) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=get_settings().text_extraction_workers, thread_name_prefix="pdf-text"
+                )
+        return self._executor.submit(self._index_in_background, stored)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _index_in_background(self, stored: StoredUpload) -> bool:
+        with self.session_factory() as db:
+            try:
+                return self.index_document(db, stored)
+            except Exception:
+                logger.exception("Falha ao indexar o texto de %s", stored.path)
+                return False
+
+    def index_document(self, db: Session, stored: StoredUpload) -> bool:
+        """Indexa o PDF uma única vez por conteúdo; retorna False se já estava indexado ou é ilegível."""
+        if db.scalar(select(DocumentText.id).where(DocumentText.sha256 == stored.sha256)) is not None:
+            return False
+        try:
+            content, page_count = extract_pdf_text(stored.path)
+        except (PyPdfError, OSError, ValueError):
+            logger.warning("Não foi possível extrair texto de %s", stored.path, exc_info=True)
+            return False
+        db.add(DocumentText(sha256=stored.sha256, path=stored.path, content=content, page_count=page_count))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        return True
+
+    def reindex(self, db: Session) -> dict[str, int]:
+        """Indexa os PDFs já referenciados em colunas ``*pdf_path`` que ainda não têm texto extraído."""
+        stats = dict.fromkeys(("referenced", "indexed", "already_indexed", "missing", "unreadable"), 0)
+        indexed_paths = set(db.scalars(select(DocumentText.path)))
+        statement = union(*(select(column).where(column.isnot(None)) for column in pdf_path_columns()))
+        for path in db.scalars(statement).all():
+            stats["referenced"] += 1
+            if path in indexed_paths:
+                stats["already_indexed"] += 1
+                continue
+            if not os.path.isfile(path):
+                stats["missing"] += 1
+                continue
+            # Arquivos anteriores ao armazenamento por conteúdo não trazem o hash no caminho.
+            sha256 = sha256_from_path(path) or _file_sha256(path)
+            if self.index_document(db, StoredUpload(path, sha256, os.path.getsize(path))):
+                stats["indexed"] += 1
+                indexed_paths.add(path)
+            elif db.scalar(select(DocumentText.id).where(DocumentText.sha256 == sha256)) is not None:
+                stats["already_indexed"] += 1
+            else:
+                stats["unreadable"] += 1
+        return stats
+
+    def search(self, db: Session, query: str, limit: int) -> list[dict]:
+        terms = _query_terms(query)
+        if not terms:
+            return []
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            rows = self._search_sqlite(db, terms, limit)
+        elif dialect == "mysql":
+            rows = self._search_mysql(db, terms, limit)
+        else:
+            rows = self._search_like(db, terms, limit)
+        records = self._records_by_path(db, [row["path"] for row in rows])
+        return [{**row, "records": records.get(row["path"], [])} for row in rows]
+
+    def _referenced_sql(self, db: Session) -> str:
+        # A subconsulta não tem parâmetros: compilada no dialeto, entra direto no SQL textual da busca.
+        return str(_referenced_paths().compile(dialect=db.get_bind().dialect))
+
+    def _search_sqlite(self, db: Session, terms: list[str], limit: int) -> list[dict]:
+        match = " ".join(f'"{term}"*' for term in terms)
+        result = db.execute(
+            text(
+                "SELECT d.sha256, d.path, snippet(document_texts_fts, 0, '[', ']', '…', 16) AS snippet, "
+                "bm25(document_texts_fts) AS rank "
+                "FROM document_texts_fts JOIN document_texts d ON d.id = document_texts_fts.rowid "
+                f"WHERE document_texts_fts MATCH :match AND d.path IN ({self._referenced_sql(db)}) "
+                "ORDER BY rank LIMIT :limit"
+            ),
+            {"match": match, "limit": limit},
+        )
+        return [
+            {"sha256": sha256, "path": path, "snippet": snippet, "score": round(-rank, 4)}
+            for sha256, path, snippet, rank in result
+        ]
+
+    def _search_mysql(self, db: Session, terms: list[str], limit: int) -> list[dict]:
+        boolean_query = " ".join(f"+{term}*" for term in terms)
+        result = db.execute(
+            text(
+                "SELECT sha256, path, content, MATCH(content) AGAINST (:query IN BOOLEAN MODE) AS score "
+                "FROM document_texts WHERE MATCH(content) AGAINST (:query IN BOOLEAN MODE) "
+                f"AND path IN ({self._referenced_sql(db)}) ORDER BY score DESC LIMIT :limit"
+            ),
+            {"query": boolean_query, "limit": limit},
+        )
+        return [
+            {"sha256": sha256, "path": path, "snippet": _snippet(content, terms), "score": round(float(score), 4)}
+            for sha256, path, content, score in result
+        ]
+
+    def _search_like(self, db: Session, terms: list[str], limit: int) -> list[dict]:
+        statement = select(DocumentText.sha256, DocumentText.path, DocumentText.content).where(
+            DocumentText.path.in_(_referenced_paths())
+        )
+        for term in terms:
+            statement = statement.where(DocumentText.content.ilike(f"%{term}%"))
+        return [
+            {"sha256": sha256, "path": path, "snippet": _snippet(content, terms), "score": 0.0}
+            for sha256, path, content in db.execute(statement.limit(limit))
+        ]
+
+    def _records_by_path(self, db: Session, paths: list[str]) -> dict[str, list[dict]]:
+        records: dict[str, list[dict]] = {}
+        if not paths:
+            return records
+        for entity, (id_column, name_column, path_column) in SEARCHABLE_ENTITIES.items():
+            for record_id, name, path in db.execute(
+                select(id_column, name_column, path_column).where(path_column.in_(paths))
+            ):
+                records.setdefault(path, []).append({"entity": entity, "id": record_id, "name": name})
+        return records
+
+
+document_search_service = DocumentSearchService()
@@ -0,0 +1,133 @@
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import Base
+from app.models.document_text import DocumentText
+from app.models.stored_file import StoredFile
+from app.services.reports import REPORTS_DIR
+
+
+def pdf_path_columns() -> list:
+    """Todas as colunas ``*pdf_path`` do modelo, para que novas entidades entrem no GC sem ajustes."""
+    return [
+        column
+        for table in Base.metadata.sorted_tables
+        for column in table.columns
+        if column.name.endswith("pdf_path")
+    ]
+
+
+def _normalize(path: str) -> str:
+    return os.path.abspath(path)
+
+
+def _walk_files(root: Path) -> Iterator[os.DirEntry]:
+    """Percorre a árvore com ``os.scandir`` sem montar a lista completa de arquivos em memória."""
+    pending = [root]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False) and not entry.name.startswith("."):
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+class StorageGarbageCollector:
+    """Remove arquivos de ``file_storage_dir`` sem referência no banco e relatórios antigos.
+
+    Arquivos modificados há menos de ``storage_gc_grace_seconds`` são mantidos, protegendo
+    uploads cujo registro ainda não foi gravado (um upload repetido também renova o mtime).
+    """
+
+    def collect(self, db: Session, dry_run: bool = False) -> dict[str, int]:
+        settings = get_settings()
+        root = Path(settings.file_storage_dir)
+        now = time.time()
+        orphan_cutoff = now - settings.storage_gc_grace_seconds
+        report_cutoff = now - settings.report_retention_days * 86400
+        reports_root = _normalize(str(root / REPORTS_DIR)) + os.sep
+        referenced = self._referenced_paths(db)
+
+        stats = dict.fromkeys(
+            ("scanned", "referenced", "recent", "orphaned", "deleted", "freed_bytes", "stale_rows"), 0
+        )
+        batch: list[tuple[str, int]] = []
+        for entry in _walk_files(root):
+            stats["scanned"] += 1
+            path = _normalize(entry.path)
+            if path in referenced:
+                stats["referenced"] += 1
+                continue
+            info = entry.stat(follow_symlinks=False)
+            cutoff = report_cutoff if path.startswith(reports_root) else orphan_cutoff
+            if info.st_mtime >= cutoff:
+                stats["recent"] += 1
+                continue
+            stats["orphaned"] += 1
+            if dry_run:
+                stats["freed_bytes"] += info.st_size
+                continue
+            batch.append((entry.path, info.st_size))
+            if len(batch) >= settings.storage_gc_batch_size:
+                self._delete_batch(db, batch, orphan_cutoff, stats)
+                batch = []
+        if batch:
+            self._delete_batch(db, batch, orphan_cutoff, stats)
+        return stats
+
+    def _referenced_paths(self, db: Session) -> set[str]:
+        referenced: set[str] = set()
+        statements = [select(column).where(column.isnot(None)) for column in pdf_path_columns()]
+        statements.append(select(StoredFile.path).where(StoredFile.ref_count > 0))
+        for statement in statements:
+            for path in db.execute(statement.execution_options(yield_per=5000)).scalars():
+                referenced.add(_normalize(path))
+        return referenced
+
+    def _delete_batch(self, db: Session, batch: list[tuple[str, int]], cutoff: float, stats: dict[str, int]) -> None:
+        paths = [path for path, _size in batch]
+        # Objetos que voltaram a ser referenciados durante a varredura ficam.
+        revived = set(
+            db.execute(select(StoredFile.path).where(StoredFile.path.in_(paths), StoredFile.ref_count > 0)).scalars()
+        )
+        result = db.execute(
+            delete(StoredFile)
+            .where(StoredFile.path.in_(paths), StoredFile.ref_count == 0)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        stats["stale_rows"] += result.rowcount
+        deleted: list[str] = []
+        for path, size in batch:
+            if path in revived:
+                continue
+            try:
+                if os.stat(path).st_mtime >= cutoff:
+                    continue
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            deleted.append(path)
+            stats["deleted"] += 1
+            stats["freed_bytes"] += size
+        if deleted:
+            # O texto indexado de um PDF removido não deve mais aparecer na busca.
+            db.execute(
+                delete(DocumentText)
+                .where(DocumentText.path.in_(deleted))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+
+storage_garbage_collector = StorageGarbageCollector()
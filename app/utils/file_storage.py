@@ -1,21 +1,86 @@
+import hashlib
+import os
+import tempfile
 from pathlib import Path
-from typing import Literal
-from uuid import uuid4
+from typing import BinaryIO, NamedTuple
 
 from fastapi import UploadFile
 
 from app.config import get_settings
 
-StorageCategory = Literal["licenses", "transporters", "recipients", "avcb"]
+OBJECTS_DIR = "objects"
 
 
-def save_upload(file: UploadFile, category: StorageCategory) -> str:
+class UploadTooLargeError(ValueError):
+    pass
+
+
+class StoredUpload(NamedTuple):
+    path: str
+    sha256: str
+    size: int
+
+
+def _too_large(max_bytes: int) -> UploadTooLargeError:
+    return UploadTooLargeError(f"Arquivo excede o limite de {max_bytes // (1024 * 1024)} MB")
+
+
+def objects_root() -> Path:
+    return Path(get_settings().file_storage_dir) / OBJECTS_DIR
+
+
+def object_path(sha256: str) -> Path:
+    """Caminho do objeto em dois níveis de diretório (256 × 256), mantendo cada pasta pequena."""
+    return objects_root() / sha256[:2] / sha256[2:4] / f"{sha256}.pdf"
+
+
+def sha256_from_path(path: str) -> str | None:
+    """Extrai o hash de um caminho do armazenamento por conteúdo; ``None`` para arquivos antigos."""
+    candidate = Path(path)
+    sha256 = candidate.stem
+    if len(sha256) != 64 or candidate.parent.parts[-2:] != (sha256[:2], sha256[2:4]):
+        return None
+    return sha256 if all(char in "0123456789abcdef" for char in sha256) else None
+
+
+def copy_in_chunks(source: BinaryIO, target: BinaryIO, max_bytes: int, chunk_bytes: int) -> tuple[str, int]:
+    """Copia ``source`` para ``target`` em blocos, calculando o sha256 e abortando acima de ``max_bytes``."""
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := source.read(chunk_bytes):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        digest.update(chunk)
+        target.write(chunk)
+    return digest.hexdigest(), size
+
+
+def save_upload(file: UploadFile) -> StoredUpload:
+    """Grava o PDF no armazenamento endereçado por conteúdo; arquivos idênticos são guardados uma vez."""
     settings = get_settings()
-    storage_dir = Path(settings.file_storage_dir) / category
-    storage_dir.mkdir(parents=True, exist_ok=True)
-    file_extension = Path(file.filename or "").suffix or ".pdf"
-    filename = f"{uuid4().hex}{file_extension}"
-    destination = storage_dir / filename
-    with destination.open("wb") as buffer:
-        buffer.write(file.file.read())
-    return str(destination)
+    if file.size is not None and file.size > settings.upload_max_bytes:
+        raise _too_large(settings.upload_max_bytes)
+    temp_dir = objects_root() / ".tmp"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    # Arquivo temporário no mesmo volume: o os.replace final é atômico.
+    fd, temp_name = tempfile.mkstemp(dir=temp_dir, prefix="upload-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            sha256, size = copy_in_chunks(
+                file.file, buffer, settings.upload_max_bytes, settings.upload_chunk_bytes
+            )
+            buffer.flush()
+            os.fsync(buffer.fileno())
+        destination = object_path(sha256)
+        if destination.exists():
+            os.unlink(temp_name)
+            # Renova o mtime para o coletor de órfãos não remover o objeto que voltou a ser usado.
+            os.utime(destination)
+        else:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_name, destination)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return StoredUpload(str(destination), sha256, size)
@@ -0,0 +1,51 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+import app.models  # noqa: F401  (registra todos os modelos no metadata)
+from app.database import Base, engine
+from app.models.document_text import SEARCH_INDEX_OBJECTS
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(object_, name, type_, reflected, compare_to) -> bool:
+    # Índices de busca são criados por DDL específico do banco e não existem no metadata.
+    if reflected and compare_to is None and name is not None:
+        return not any(name == prefix or name.startswith(f"{prefix}_") for prefix in SEARCH_INDEX_OBJECTS)
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,143 @@
+"""Esquema inicial, equivalente ao que Base.metadata.create_all criava no boot.
+
+Bancos já existentes (criados pelo create_all) mantêm suas tabelas: apenas as
+ausentes são criadas, então basta executar ``alembic upgrade head`` neles.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001_initial_schema"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+LICENSE_STATUS = sa.Enum("ACTIVE", "EXPIRED", "SUSPENDED", "PENDING", name="licensestatus")
+AVCB_STATUS = sa.Enum("VALID", "EXPIRED", "PENDING", "SUSPENDED", name="avcbstatus")
+CONDITION_STATUS = sa.Enum("OPEN", "IN_PROGRESS", "COMPLETED", "OVERDUE", name="conditionstatus")
+AVCB_CONDITION_STATUS = sa.Enum("OPEN", "IN_PROGRESS", "COMPLETED", "OVERDUE", name="avcbconditionstatus")
+
+
+def _timestamps(with_updated_at: bool = True) -> list[sa.Column]:
+    columns = [sa.Column("created_at", sa.DateTime(), nullable=False)]
+    if with_updated_at:
+        columns.append(sa.Column("updated_at", sa.DateTime(), nullable=False))
+    return columns
+
+
+def _condition_columns(parent_table: str, parent_column: str, status_type: sa.Enum) -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            parent_column,
+            sa.Integer(),
+            sa.ForeignKey(f"{parent_table}.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("responsible", sa.String(255), nullable=True),
+        sa.Column("due_date", sa.Date(), nullable=True),
+        sa.Column("status", status_type, nullable=False),
+        sa.Column("completion_notes", sa.Text(), nullable=True),
+        sa.Column("completed_at", sa.Date(), nullable=True),
+        *_timestamps(),
+    ]
+
+
+def _licensed_party_columns(*extra: sa.Column) -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        *extra,
+        sa.Column("license_number", sa.String(255), nullable=False),
+        sa.Column("license_issue_date", sa.Date(), nullable=True),
+        sa.Column("license_expiry_date", sa.Date(), nullable=True),
+        sa.Column("license_pdf_path", sa.String(512), nullable=True),
+        sa.Column("contact_email", sa.String(255), nullable=True),
+        sa.Column("contact_phone", sa.String(50), nullable=True),
+        *_timestamps(with_updated_at=False),
+    ]
+
+
+TABLES: dict[str, list[sa.Column]] = {
+    "users": [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_superuser", sa.Boolean(), nullable=True),
+        *_timestamps(with_updated_at=False),
+    ],
+    "password_reset_tokens": [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("token", sa.String(255), nullable=False, unique=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("used", sa.Boolean(), nullable=False),
+        *_timestamps(with_updated_at=False),
+    ],
+    "licenses": [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("issuing_agency", sa.String(255), nullable=False),
+        sa.Column("issue_date", sa.Date(), nullable=True),
+        sa.Column("expiry_date", sa.Date(), nullable=False),
+        sa.Column("status", LICENSE_STATUS, nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("pdf_path", sa.String(512), nullable=True),
+        *_timestamps(),
+    ],
+    "license_conditions": _condition_columns("licenses", "license_id", CONDITION_STATUS),
+    "avcbs": [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("property_name", sa.String(255), nullable=False),
+        sa.Column("property_address", sa.Text(), nullable=True),
+        sa.Column("technical_responsible", sa.String(255), nullable=True),
+        sa.Column("issue_date", sa.Date(), nullable=True),
+        sa.Column("expiry_date", sa.Date(), nullable=False),
+        sa.Column("status", AVCB_STATUS, nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("pdf_path", sa.String(512), nullable=True),
+        *_timestamps(),
+    ],
+    "avcb_conditions": _condition_columns("avcbs", "avcb_id", AVCB_CONDITION_STATUS),
+    "waste_codes": [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("code", sa.String(50), nullable=False, unique=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("classification", sa.String(100), nullable=True),
+        *_timestamps(with_updated_at=False),
+    ],
+    "storage_codes": [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("code", sa.String(50), nullable=False, unique=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        *_timestamps(with_updated_at=False),
+    ],
+    "transporters": _licensed_party_columns(),
+    "recipients": _licensed_party_columns(sa.Column("facility_type", sa.String(255), nullable=True)),
+}
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table_name, columns in TABLES.items():
+        if table_name in existing:
+            continue
+        op.create_table(table_name, *columns)
+        op.create_index(f"ix_{table_name}_id", table_name, ["id"])
+        if table_name == "users":
+            op.create_index("ix_users_email", table_name, ["email"], unique=True)
+
+
+def downgrade() -> None:
+    for table_name in reversed(TABLES):
+        op.drop_table(table_name)
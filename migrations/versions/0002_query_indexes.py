@@ -0,0 +1,40 @@
+"""Índices para os filtros de vencimento, status e paginação.
+
+Revision ID: 0002_query_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0002_query_indexes"
+down_revision: str | None = "0001_initial_schema"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEXES: list[tuple[str, str, list[str]]] = [
+    ("ix_licenses_expiry_date", "licenses", ["expiry_date"]),
+    ("ix_licenses_status_expiry_date", "licenses", ["status", "expiry_date"]),
+    ("ix_license_conditions_due_date_status", "license_conditions", ["due_date", "status"]),
+    ("ix_avcbs_expiry_date", "avcbs", ["expiry_date"]),
+    ("ix_avcbs_status_expiry_date", "avcbs", ["status", "expiry_date"]),
+    ("ix_avcb_conditions_due_date_status", "avcb_conditions", ["due_date", "status"]),
+    ("ix_users_created_at", "users", ["created_at"]),
+    ("ix_password_reset_tokens_expires_at", "password_reset_tokens", ["expires_at"]),
+    ("ix_transporters_name", "transporters", ["name"]),
+    ("ix_transporters_license_expiry_date", "transporters", ["license_expiry_date"]),
+    ("ix_recipients_name", "recipients", ["name"]),
+    ("ix_recipients_license_expiry_date", "recipients", ["license_expiry_date"]),
+]
+
+
+def upgrade() -> None:
+    for name, table_name, columns in INDEXES:
+        op.create_index(name, table_name, columns)
+
+
+def downgrade() -> None:
+    for name, table_name, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table_name)
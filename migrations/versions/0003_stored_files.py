@@ -0,0 +1,33 @@
+"""Tabela de referências do armazenamento de PDFs endereçado por conteúdo.
+
+Revision ID: 0003_stored_files
+Revises: 0002_query_indexes
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003_stored_files"
+down_revision: str | None = "0002_query_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stored_files",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("path", sa.String(512), nullable=False, unique=True),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_stored_files_ref_count", "stored_files", ["ref_count"])
+
+
+def downgrade() -> None:
+    op.drop_table("stored_files")
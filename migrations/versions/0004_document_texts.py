@@ -0,0 +1,53 @@
+"""Texto extraído dos PDFs e índice de busca (FTS5 no SQLite, FULLTEXT no MySQL).
+
+Revision ID: 0004_document_texts
+Revises: 0003_stored_files
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+revision: str = "0004_document_texts"
+down_revision: str | None = "0003_stored_files"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE document_texts_fts USING fts5("
+    "content, content='document_texts', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER document_texts_ai AFTER INSERT ON document_texts BEGIN "
+    "INSERT INTO document_texts_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER document_texts_ad AFTER DELETE ON document_texts BEGIN "
+    "INSERT INTO document_texts_fts(document_texts_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER document_texts_au AFTER UPDATE ON document_texts BEGIN "
+    "INSERT INTO document_texts_fts(document_texts_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    "INSERT INTO document_texts_fts(rowid, content) VALUES (new.id, new.content); END",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_texts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sha256", sa.String(64), nullable=False, unique=True),
+        sa.Column("path", sa.String(512), nullable=False, unique=True),
+        sa.Column("content", sa.Text().with_variant(mysql.LONGTEXT(), "mysql"), nullable=False),
+        sa.Column("page_count", sa.Integer(), nullable=False),
+        sa.Column("extracted_at", sa.DateTime(), nullable=False),
+    )
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+    elif dialect == "mysql":
+        op.execute("ALTER TABLE document_texts ADD FULLTEXT INDEX ix_document_texts_content (content)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS document_texts_fts")
+    op.drop_table("document_texts")
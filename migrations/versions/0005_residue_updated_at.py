@@ -0,0 +1,32 @@
+"""Coluna updated_at nos cadastros de resíduos, usada na versão dos relatórios em cache.
+
+Revision ID: 0005_residue_updated_at
+Revises: 0004_document_texts
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005_residue_updated_at"
+down_revision: str | None = "0004_document_texts"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("waste_codes", "storage_codes", "transporters", "recipients")
+
+
+def upgrade() -> None:
+    for table_name in TABLES:
+        op.add_column(table_name, sa.Column("updated_at", sa.DateTime(), nullable=True))
+        op.execute(sa.text(f"UPDATE {table_name} SET updated_at = created_at"))
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    for table_name in reversed(TABLES):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("updated_at")
@@ -0,0 +1,39 @@
+"""Fila de saída de e-mails entregue pelo job email-outbox.
+
+Revision ID: 0006_email_outbox
+Revises: 0005_residue_updated_at
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+revision: str = "0006_email_outbox"
+down_revision: str | None = "0005_residue_updated_at"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("recipients", sa.JSON(), nullable=False),
+        sa.Column("subject", sa.String(255), nullable=False),
+        sa.Column("html_content", sa.Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=False),
+        sa.Column("status", sa.Enum("PENDING", "SENT", "FAILED", name="emailstatus"), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.String(500), nullable=True),
+        sa.Column("provider_message_id", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_email_outbox_status_next_attempt_at", "email_outbox", ["status", "next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("email_outbox")
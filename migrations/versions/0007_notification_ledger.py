@@ -0,0 +1,34 @@
+"""Registro dos alertas de vencimento enviados, para não repetir avisos.
+
+Revision ID: 0007_notification_ledger
+Revises: 0006_email_outbox
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007_notification_ledger"
+down_revision: str | None = "0006_email_outbox"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_ledger",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entity", sa.String(50), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=False),
+        sa.Column("lead_days", sa.Integer(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("entity", "entity_id", "due_date", "lead_days", name="uq_notification_ledger_alert"),
+    )
+    op.create_index("ix_notification_ledger_due_date", "notification_ledger", ["due_date"])
+
+
+def downgrade() -> None:
+    op.drop_table("notification_ledger")
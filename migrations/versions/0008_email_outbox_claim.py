@@ -0,0 +1,26 @@
+"""Reserva de mensagens da fila de e-mail antes do envio.
+
+Revision ID: 0008_email_outbox_claim
+Revises: 0007_notification_ledger
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008_email_outbox_claim"
+down_revision: str | None = "0007_notification_ledger"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("email_outbox", sa.Column("claim_token", sa.String(32), nullable=True))
+    op.create_index("ix_email_outbox_claim_token", "email_outbox", ["claim_token"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_outbox_claim_token", table_name="email_outbox")
+    op.drop_column("email_outbox", "claim_token")
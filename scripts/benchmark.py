@@ -0,0 +1,836 @@
+"""Benchmarks de desempenho executados contra um banco SQLite local semeado.
+
+Uso básico:
+    python scripts/benchmark.py dashboard --rows 5000 --latency-ms 25
+    python scripts/benchmark.py load --concurrency 200 --latency-ms 25
+    python scripts/benchmark.py load --base-url http://localhost:8000 --token <jwt> --path /licenses/
+    python scripts/benchmark.py upload --size-mb 500
+    python scripts/benchmark.py report --rows 50000
+    python scripts/benchmark.py export --rows 1000000
+    python scripts/benchmark.py email --messages 2000 --latency-ms 50
+    python scripts/benchmark.py email-templates --items 500
+    python scripts/benchmark.py me --requests 500 --latency-ms 25
+    python scripts/benchmark.py login --concurrency 50
+
+A opção ``--latency-ms`` soma um atraso artificial a cada ida ao banco, simulando
+o custo de rede do MySQL remoto usado em produção.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI, UploadFile
+from fpdf import FPDF
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.util import await_only
+
+# Garante importação dos módulos da pasta raiz mesmo executando via python scripts/benchmark.py
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app import deps as app_deps
+from app.api.deps import get_current_active_user_async
+from app.crud.base import ExpiryFilters
+from app.crud.license import license_crud
+from app.database import Base
+from app.models import (
+    Avcb,
+    AvcbStatus,
+    License,
+    LicenseCondition,
+    LicenseStatus,
+    Recipient,
+    Transporter,
+    User,
+    WasteCode,
+)
+from app.config import get_settings
+from app.core.auth_cache import auth_cache
+from app.core.security import create_access_token, hash_password, password_hasher
+from app.core.templating import build_environment
+from app.schemas.auth import LoginRequest, Token
+from app.schemas.license import LicenseRead
+from app.services.email import SEND_PATH, EmailService
+from app.services.email_templates import EmailTemplates
+from app.services.exports import ExportService
+from app.services.metrics import dashboard_metrics_service
+from app.services.notifications import ExpiryAlert
+from app.services.reports import render_report
+from app.utils.file_storage import save_upload
+from tests.fake_sendgrid import FakeSendGrid
+
+
+class RoundTripCounter:
+    """Conta as idas ao banco e aplica a latência simulada em cada uma.
+
+    Com ``asynchronous=True`` a espera é feita com ``asyncio.sleep`` dentro do greenlet
+    do engine assíncrono, sem bloquear o event loop.
+    """
+
+    def __init__(self, engine: Engine, latency_ms: float = 0.0, asynchronous: bool = False) -> None:
+        self.count = 0
+        self.latency = latency_ms / 1000
+        self.asynchronous = asynchronous
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+
+    def _before_execute(self, *_args) -> None:
+        self.count += 1
+        if not self.latency:
+            return
+        if self.asynchronous:
+            await_only(asyncio.sleep(self.latency))
+        else:
+            time.sleep(self.latency)
+
+    def reset(self) -> None:
+        self.count = 0
+
+
+@contextmanager
+def seeded_database(rows: int, **engine_kwargs) -> Iterator[tuple[Engine, sessionmaker]]:
+    """Cria um SQLite temporário com ``rows`` licenças/AVCBs e cadastros auxiliares."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'benchmark.db'}", **engine_kwargs)
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        _seed(factory, rows)
+        try:
+            yield engine, factory
+        finally:
+            engine.dispose()
+
+
+def _seed(factory: sessionmaker, rows: int) -> None:
+    rng = random.Random(42)
+    today = date.today()
+    license_statuses = list(LicenseStatus)
+    avcb_statuses = list(AvcbStatus)
+    with factory() as session:
+        session.add_all(
+            License(
+                name=f"Licença {index}",
+                issuing_agency=rng.choice(["CETESB", "IBAMA", "SEMAD"]),
+                expiry_date=today + timedelta(days=rng.randint(-365, 730)),
+                status=rng.choice(license_statuses),
+                conditions=[
+                    LicenseCondition(
+                        title=f"Condicionante {index}-{item}",
+                        due_date=today + timedelta(days=rng.randint(-90, 365)),
+                    )
+                    for item in range(rng.randint(0, 3))
+                ],
+            )
+            for index in range(rows)
+        )
+        session.add_all(
+            Avcb(
+                property_name=f"Imóvel {index}",
+                expiry_date=today + timedelta(days=rng.randint(-365, 730)),
+                status=rng.choice(avcb_statuses),
+            )
+            for index in range(rows)
+        )
+        session.add_all(WasteCode(code=f"R{index:06d}") for index in range(max(rows // 10, 1)))
+        session.add_all(
+            Transporter(
+                name=f"Transportadora {index}",
+                license_number=f"T-{index}",
+                license_expiry_date=today + timedelta(days=rng.randint(-90, 365)),
+            )
+            for index in range(max(rows // 10, 1))
+        )
+        session.add_all(
+            Recipient(
+                name=f"Destinatário {index}",
+                license_number=f"D-{index}",
+                license_expiry_date=today + timedelta(days=rng.randint(-90, 365)),
+            )
+            for index in range(max(rows // 10, 1))
+        )
+        session.commit()
+
+
+def _measure(
+    label: str,
+    factory: sessionmaker,
+    counter: RoundTripCounter,
+    func_: Callable[[Session], object],
+    repeat: int,
+) -> None:
+    timings: list[float] = []
+    round_trips = 0
+    for _ in range(repeat):
+        with factory() as session:
+            counter.reset()
+            started = time.perf_counter()
+            func_(session)
+            timings.append((time.perf_counter() - started) * 1000)
+            round_trips = counter.count
+    print(
+        f"{label:<28} idas ao banco={round_trips:<3} "
+        f"mediana={statistics.median(timings):8.2f} ms  p95={_percentile(timings, 95):8.2f} ms"
+    )
+
+
+def _percentile(values: list[float], percentile: int) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _legacy_dashboard(db: Session) -> dict[str, int]:
+    today = date.today()
+    upcoming_threshold = today + timedelta(days=30)
+    return {
+        "licenses_total": db.query(func.count(License.id)).scalar() or 0,
+        "licenses_expiring_30": (
+            db.query(func.count(License.id)).filter(License.expiry_date <= upcoming_threshold).scalar() or 0
+        ),
+        "avcb_total": db.query(func.count(Avcb.id)).scalar() or 0,
+        "avcb_expiring_30": (
+            db.query(func.count(Avcb.id)).filter(Avcb.expiry_date <= upcoming_threshold).scalar() or 0
+        ),
+        "waste_codes_total": db.query(func.count(WasteCode.id)).scalar() or 0,
+        "transporters_total": db.query(func.count(Transporter.id)).scalar() or 0,
+        "recipients_total": db.query(func.count(Recipient.id)).scalar() or 0,
+    }
+
+
+def bench_dashboard(rows: int, repeat: int, latency_ms: float) -> None:
+    """Compara os contadores legados (uma consulta por métrica) com a agregação única e o cache."""
+    with seeded_database(rows) as (engine, factory):
+        counter = RoundTripCounter(engine, latency_ms)
+        print(f"Base semeada com {rows} licenças/AVCBs, latência simulada de {latency_ms} ms.")
+        _measure("legado (7 consultas)", factory, counter, _legacy_dashboard, repeat)
+        _measure("agregação única", factory, counter, dashboard_metrics_service.compute, repeat)
+        dashboard_metrics_service.invalidate()
+        _measure("agregação em cache", factory, counter, dashboard_metrics_service.get_metrics, repeat)
+        print(f"Cache: {dashboard_metrics_service.cache.stats()}")
+
+
+# Página curta: o custo de serialização fica pequeno diante da latência do banco.
+LOAD_PATH = "/licenses/?limit=5"
+
+
+async def _benchmark_user() -> User:
+    return User(id=1, email="benchmark@example.com", full_name="Benchmark", is_active=True, is_superuser=True)
+
+
+def _sync_licenses_app(factory: sessionmaker) -> FastAPI:
+    """Réplica da listagem de licenças com handler síncrono (limitada ao threadpool do Starlette)."""
+    sync_app = FastAPI()
+
+    def get_db() -> Iterator[Session]:
+        with factory() as db:
+            yield db
+
+    @sync_app.get("/licenses/")
+    def list_licenses(limit: int = 50, db: Session = Depends(get_db)) -> list[LicenseRead]:
+        items, _ = license_crud.get_page(db, None, limit)
+        return [LicenseRead.model_validate(item) for item in items]
+
+    return sync_app
+
+
+async def _fire(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> tuple[float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with semaphore:
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - started), errors
+
+
+def _report(label: str, requests_per_second: float, errors: int) -> None:
+    print(f"{label:<28} {requests_per_second:9.1f} req/s  erros={errors}")
+
+
+async def _load_in_process(rows: int, total: int, concurrency: int, latency_ms: float) -> None:
+    from app.main import app
+
+    pool = {"pool_size": concurrency, "max_overflow": 0}
+    with seeded_database(rows, poolclass=QueuePool, **pool) as (engine, factory):
+        RoundTripCounter(engine, latency_ms)
+        async_engine = create_async_engine(
+            engine.url.set(drivername="sqlite+aiosqlite"), poolclass=AsyncAdaptedQueuePool, **pool
+        )
+        RoundTripCounter(async_engine.sync_engine, latency_ms, asynchronous=True)
+        async_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+        async def get_async_db() -> AsyncIterator[AsyncSession]:
+            async with async_factory() as db:
+                yield db
+
+        app.dependency_overrides[app_deps.get_async_db] = get_async_db
+        app.dependency_overrides[get_current_active_user_async] = _benchmark_user
+        print(f"Base semeada com {rows} licenças, {concurrency} clientes, latência simulada de {latency_ms} ms.")
+        try:
+            scenarios = [("síncrono (threadpool)", _sync_licenses_app(factory)), ("assíncrono (AsyncSession)", app)]
+            for label, target in scenarios:
+                transport = httpx.ASGITransport(app=target)
+                async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                    await client.get(LOAD_PATH)
+                    _report(label, *await _fire(client, LOAD_PATH, total, concurrency))
+        finally:
+            app.dependency_overrides.clear()
+            await async_engine.dispose()
+
+
+async def _load_remote(base_url: str, paths: list[str], token: str | None, total: int, concurrency: int) -> None:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        print(f"{base_url} com {concurrency} clientes concorrentes.")
+        for path in paths:
+            _report(path, *await _fire(client, path, total, concurrency))
+
+
+def bench_load(
+    rows: int,
+    total: int,
+    concurrency: int,
+    latency_ms: float,
+    base_url: str | None,
+    paths: list[str],
+    token: str | None,
+) -> None:
+    """Requisições por segundo com ``concurrency`` clientes simultâneos.
+
+    Sem ``--base-url`` compara, em processo, a listagem de licenças com handler síncrono
+    e a rota assíncrona real; com ``--base-url`` mede as rotas de um servidor em execução.
+    """
+    if base_url:
+        asyncio.run(_load_remote(base_url, paths, token, total, concurrency))
+    else:
+        asyncio.run(_load_in_process(rows, total, concurrency, latency_ms))
+
+
+def _legacy_save_upload(file: UploadFile, destination: Path) -> None:
+    with destination.open("wb") as buffer:
+        buffer.write(file.file.read())
+
+
+def bench_upload(size_mb: int) -> None:
+    """Pico de memória Python (tracemalloc) ao gravar um PDF de ``size_mb`` MB."""
+    settings = get_settings()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = Path(tmp_dir) / "scan.pdf"
+        block = random.Random(42).randbytes(1024 * 1024)
+        with source.open("wb") as handle:
+            for _ in range(size_mb):
+                handle.write(block)
+        settings.file_storage_dir = str(Path(tmp_dir) / "storage")
+        settings.upload_max_bytes = max(settings.upload_max_bytes, (size_mb + 1) * 1024 * 1024)
+        print(f"Upload de {size_mb} MB, blocos de {settings.upload_chunk_bytes // 1024} KB.")
+
+        scenarios: list[tuple[str, Callable[[UploadFile], object]]] = [
+            ("legado (read() inteiro)", lambda upload: _legacy_save_upload(upload, Path(tmp_dir) / "legacy.pdf")),
+            ("streaming em blocos", lambda upload: save_upload(upload)),
+        ]
+        for label, store in scenarios:
+            with source.open("rb") as handle:
+                upload = UploadFile(handle, filename="scan.pdf", size=source.stat().st_size)
+                tracemalloc.start()
+                started = time.perf_counter()
+                store(upload)
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            print(f"{label:<28} pico={peak / (1024 * 1024):8.1f} MB  tempo={elapsed:6.2f} s")
+
+
+def _legacy_license_report(url: str, output_path: str) -> None:
+    with sessionmaker(bind=create_engine(url))() as db:
+        licenses = db.query(License).order_by(License.expiry_date.asc()).all()
+        entries = [
+            {
+                "name": license.name,
+                "issuing_agency": license.issuing_agency,
+                "expiry_date": license.expiry_date.isoformat(),
+                "status": license.status.value,
+            }
+            for license in licenses
+        ]
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=11)
+    for entry in entries:
+        pdf.multi_cell(
+            0,
+            8,
+            text=(
+                f"Licença: {entry['name']}\nÓrgão emissor: {entry['issuing_agency']}\n"
+                f"Validade: {entry['expiry_date']}\nStatus: {entry['status']}\n"
+            ),
+            border=1,
+        )
+        pdf.ln(2)
+    pdf.output(output_path)
+
+
+def _table_license_report(url: str, output_path: str) -> None:
+    render_report(url, "licenses", {"expiring_before": None}, output_path)
+
+
+def _peak_rss_mb() -> float | None:
+    # VmHWM zera no exec do processo filho; ru_maxrss herdaria o pico do processo pai.
+    status = Path("/proc/self/status")
+    if not status.exists():
+        return None
+    for line in status.read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    return None
+
+
+def _measure_report(
+    renderer: Callable[[str, str], None], url: str, output_path: str
+) -> tuple[float, float | None, float | None]:
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    renderer(url, output_path)
+    return time.perf_counter() - started, baseline, _peak_rss_mb()
+
+
+def bench_report(rows: int, skip_legacy: bool) -> None:
+    """Tempo e pico de RSS ao gerar o relatório de licenças, cada cenário em um processo novo."""
+    scenarios: list[tuple[str, Callable[[str, str], None]]] = [("tabela + yield_per", _table_license_report)]
+    if not skip_legacy:
+        scenarios.insert(0, ("legado (multi_cell + .all())", _legacy_license_report))
+    with seeded_database(rows) as (engine, _factory), tempfile.TemporaryDirectory() as tmp_dir:
+        url = engine.url.render_as_string(hide_password=False)
+        print(f"Relatório com {rows} licenças.")
+        for index, (label, renderer) in enumerate(scenarios):
+            output_path = str(Path(tmp_dir) / f"report_{index}.pdf")
+            # Processo novo por cenário: o pico de RSS de um não contamina o outro.
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                elapsed, baseline, peak = pool.submit(_measure_report, renderer, url, output_path).result()
+            size_mb = Path(output_path).stat().st_size / (1024 * 1024)
+            memory = "RSS n/d (só no Linux)"
+            if peak is not None:
+                memory = f"pico RSS={peak:7.1f} MB (após imports {baseline:6.1f} MB)"
+            print(f"{label:<30} tempo={elapsed:7.2f} s  {memory}  arquivo={size_mb:6.1f} MB")
+
+
+def _bulk_licenses(engine: Engine, rows: int, batch_size: int = 20000) -> None:
+    today = date.today()
+    statuses = list(LicenseStatus)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        for start in range(0, rows, batch_size):
+            connection.execute(
+                License.__table__.insert(),
+                [
+                    {
+                        "name": f"Licença {index}",
+                        "issuing_agency": ("CETESB", "IBAMA", "SEMAD")[index % 3],
+                        "expiry_date": today + timedelta(days=index % 1000),
+                        "status": statuses[index % len(statuses)],
+                        "notes": "Observação de teste",
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for index in range(start, min(start + batch_size, rows))
+                ],
+            )
+
+
+def _legacy_csv_export(factory: sessionmaker) -> Iterator[bytes]:
+    import csv
+    import io
+
+    with factory() as db:
+        licenses = db.query(License).order_by(License.expiry_date, License.id).all()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for license in licenses:
+        writer.writerow([license.id, license.name, license.issuing_agency, license.expiry_date, license.status.value])
+    yield buffer.getvalue().encode("utf-8")
+
+
+def bench_export(rows: int) -> None:
+    """Tempo até o primeiro byte, tempo total e pico de memória Python (tracemalloc) das exportações."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'export.db'}")
+        Base.metadata.create_all(bind=engine)
+        _bulk_licenses(engine, rows)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        service = ExportService(factory)
+        print(f"Exportação de {rows} licenças.")
+        scenarios: list[tuple[str, Callable[[], Iterator[bytes]]]] = [
+            ("legado (.all() + CSV em memória)", lambda: _legacy_csv_export(factory)),
+            ("CSV em streaming", lambda: service.stream_csv("licenses", ExpiryFilters())),
+            ("XLSX em streaming", lambda: service.stream_xlsx("licenses", ExpiryFilters())),
+        ]
+        for label, stream in scenarios:
+            tracemalloc.start()
+            started = time.perf_counter()
+            first_byte = None
+            total_bytes = 0
+            for chunk in stream():
+                if first_byte is None and chunk:
+                    first_byte = time.perf_counter() - started
+                total_bytes += len(chunk)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{label:<34} primeiro byte={first_byte * 1000:9.1f} ms  total={elapsed:6.2f} s  "
+                f"pico={peak / (1024 * 1024):7.1f} MB  saída={total_bytes / (1024 * 1024):7.1f} MB"
+            )
+        engine.dispose()
+
+
+def _legacy_send(fake: FakeSendGrid, index: int) -> None:
+    # Como o EmailService antigo: um cliente novo por mensagem, dentro da requisição.
+    payload = {
+        "personalizations": [{"to": [{"email": f"destino{index}@example.com"}]}],
+        "from": {"email": "contato@example.com"},
+        "subject": f"Aviso {index}",
+        "content": [{"type": "text/html", "value": "<p>Olá</p>"}],
+    }
+    with httpx.Client(base_url=fake.url, headers={"Authorization": f"Bearer {fake.api_key}"}) as client:
+        client.post(SEND_PATH, json=payload)
+
+
+def bench_email(messages: int, latency_ms: float, concurrency: int) -> None:
+    """Latência no caminho da requisição e vazão de entrega contra o SendGrid falso local."""
+    get_settings().email_send_concurrency = concurrency
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeSendGrid(latency=latency_ms / 1000) as fake:
+        engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'email.db'}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        service = EmailService(factory)
+        service.api_key, service.sender, service.api_base_url = fake.api_key, "contato@example.com", fake.url
+        print(f"{messages} mensagens, latência da API {latency_ms:.0f} ms, {concurrency} envios simultâneos.")
+
+        started = time.perf_counter()
+        for index in range(messages):
+            _legacy_send(fake, index)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{'legado (cliente por envio)':<28} requisição={elapsed / messages * 1000:7.2f} ms  "
+            f"entrega={messages / elapsed:8.1f} msg/s  conexões={fake.connections}"
+        )
+
+        connections = fake.connections
+        started = time.perf_counter()
+        for index in range(messages):
+            service.send_email([f"destino{index}@example.com"], f"Aviso {index}", "<p>Olá</p>")
+        enqueued = time.perf_counter() - started
+        started = time.perf_counter()
+        with factory() as db:
+            stats = service.deliver_pending(db)
+        delivered = time.perf_counter() - started
+        service.shutdown()
+        print(
+            f"{'fila + job email-outbox':<28} requisição={enqueued / messages * 1000:7.2f} ms  "
+            f"entrega={stats['sent'] / delivered:8.1f} msg/s  conexões={fake.connections - connections}"
+        )
+        engine.dispose()
+
+
+def _legacy_digest(alerts: list[ExpiryAlert]) -> str:
+    # Como os helpers antigos: f-strings concatenadas, sem escape.
+    html_content = "<p>Olá,</p><p>Os itens abaixo vencem em breve:</p><table>"
+    for alert in alerts:
+        html_content += (
+            f"<tr><td>{alert.entity}</td><td>{alert.label}</td>"
+            f"<td>{alert.due_date:%d/%m/%Y}</td><td>{alert.days_left}</td></tr>"
+        )
+    return html_content + "</table>"
+
+
+def bench_email_templates(items: int, repeat: int) -> None:
+    """Tempo de renderização de um resumo de vencimentos: f-strings, Jinja recompilado e Jinja em cache."""
+    today = date.today()
+    entities = ("licenses", "avcb", "transporters", "recipients", "license_conditions", "avcb_conditions")
+    alerts = [
+        ExpiryAlert(entities[index % 6], index, f"Registro {index} & Cia", today + timedelta(days=index % 90), 30, 30)
+        for index in range(items)
+    ]
+    uncached = build_environment()
+    uncached.cache = None
+    cached = EmailTemplates()
+    scenarios: list[tuple[str, Callable[[], object]]] = [
+        ("f-strings (legado, sem escape)", lambda: _legacy_digest(alerts)),
+        ("Jinja compilado a cada envio", lambda: EmailTemplates(uncached).render("expiry_digest", alerts=alerts)),
+        ("Jinja com cache compartilhado", lambda: cached.render("expiry_digest", alerts=alerts)),
+    ]
+    print(f"Resumo com {items} itens, {repeat} renderizações por cenário.")
+    for label, render in scenarios:
+        render()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        print(
+            f"{label:<32} mediana={statistics.median(timings):7.3f} ms  "
+            f"p95={_percentile(timings, 95):7.3f} ms"
+        )
+
+
+async def _me_latencies(app: FastAPI, token: str, total: int) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    timings = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers=headers) as client:
+        for _ in range(total):
+            started = time.perf_counter()
+            response = await client.get("/users/me")
+            timings.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+    return timings
+
+
+def bench_me(total: int, latency_ms: float) -> None:
+    """Latência de ``GET /users/me`` com e sem o cache de tokens e usuários."""
+    from app.main import app
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'me.db'}")
+        Base.metadata.create_all(bind=engine)
+        counter = RoundTripCounter(engine, latency_ms)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        with factory() as session:
+            user = User(email="benchmark@example.com", full_name="Benchmark", hashed_password="x", is_active=True)
+            session.add(user)
+            session.commit()
+            token = create_access_token(user.id)
+
+        def get_db() -> Iterator[Session]:
+            with factory() as db:
+                yield db
+
+        app.dependency_overrides[app_deps.get_db] = get_db
+        ttl_seconds = auth_cache.users.ttl_seconds
+        print(f"{total} requisições sequenciais, latência simulada de {latency_ms} ms por consulta.")
+        try:
+            for label, ttl in (("sem cache", 0), ("cache de token e usuário", ttl_seconds)):
+                auth_cache.clear()
+                auth_cache.tokens.ttl_seconds = auth_cache.users.ttl_seconds = ttl
+                counter.reset()
+                timings = asyncio.run(_me_latencies(app, token, total))
+                print(
+                    f"{label:<26} idas ao banco/req={counter.count / total:4.2f}  "
+                    f"mediana={statistics.median(timings):7.2f} ms  p95={_percentile(timings, 95):7.2f} ms"
+                )
+        finally:
+            auth_cache.tokens.ttl_seconds = auth_cache.users.ttl_seconds = ttl_seconds
+            auth_cache.clear()
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+
+def _legacy_login_app(factory: sessionmaker) -> FastAPI:
+    """Login síncrono com bcrypt na thread da requisição, como antes, mais as rotas reais de usuários."""
+    from passlib.context import CryptContext
+
+    from app.api.users import router as users_router
+
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    legacy_app = FastAPI()
+    legacy_app.include_router(users_router)
+
+    def get_db() -> Iterator[Session]:
+        with factory() as db:
+            yield db
+
+    @legacy_app.post("/auth/login")
+    def login(login_in: LoginRequest, db: Session = Depends(get_db)) -> Token:
+        user = db.query(User).filter(User.email == login_in.email).first()
+        if user is None or not context.verify(login_in.password, user.hashed_password):
+            raise RuntimeError("Credenciais inválidas")
+        return Token(access_token=create_access_token(user.id))
+
+    return legacy_app
+
+
+async def _login_burst(target: FastAPI, token: str, concurrency: int) -> tuple[float, list[float], list[float]]:
+    transport = httpx.ASGITransport(app=target)
+    credentials = {"email": "benchmark@example.com", "password": "senha-benchmark"}
+    login_timings: list[float] = []
+    probe_timings: list[float] = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=600) as client:
+
+        async def login() -> None:
+            started = time.perf_counter()
+            response = await client.post("/auth/login", json=credentials)
+            response.raise_for_status()
+            login_timings.append((time.perf_counter() - started) * 1000)
+
+        async def probe(done: asyncio.Event) -> None:
+            # Rota síncrona barata (usuário em cache) disputando o threadpool com os logins.
+            while not done.is_set():
+                started = time.perf_counter()
+                response = await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+                response.raise_for_status()
+                probe_timings.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(done))
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+    return concurrency / elapsed, login_timings, probe_timings
+
+
+def bench_login(concurrency: int, rounds: int, workers: int) -> None:
+    """Logins simultâneos: bcrypt na thread da requisição contra o pool de processos."""
+    from app.main import app
+
+    settings = get_settings()
+    settings.bcrypt_rounds, settings.password_hash_workers = rounds, workers
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'login.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+        async_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+        with factory() as session:
+            user = User(
+                email="benchmark@example.com",
+                full_name="Benchmark",
+                hashed_password=hash_password("senha-benchmark", rounds),
+                is_active=True,
+            )
+            session.add(user)
+            session.commit()
+            token = create_access_token(user.id)
+
+        def get_db() -> Iterator[Session]:
+            with factory() as db:
+                yield db
+
+        async def get_async_db() -> AsyncIterator[AsyncSession]:
+            async with async_factory() as db:
+                yield db
+
+        app.dependency_overrides[app_deps.get_db] = get_db
+        app.dependency_overrides[app_deps.get_async_db] = get_async_db
+        legacy_app = _legacy_login_app(factory)
+        legacy_app.dependency_overrides[app_deps.get_db] = get_db
+        print(f"{concurrency} logins simultâneos, bcrypt com custo {rounds}, pool de {workers} processo(s).")
+        try:
+            for label, target in (("bcrypt na thread (legado)", legacy_app), ("pool de processos", app)):
+                auth_cache.clear()
+                # Sobe os processos do pool antes da medição, como após o primeiro login em produção.
+                password_hasher.verify_and_update("senha-benchmark", hash_password("senha-benchmark", rounds))
+                rate, logins, probes = asyncio.run(_login_burst(target, token, concurrency))
+                print(
+                    f"{label:<26} {rate:6.1f} logins/s  login p95={_percentile(logins, 95):8.0f} ms  "
+                    f"/users/me mediana={statistics.median(probes):7.1f} ms p95={_percentile(probes, 95):7.1f} ms"
+                )
+        finally:
+            password_hasher.shutdown()
+            app.dependency_overrides.clear()
+            auth_cache.clear()
+            asyncio.run(async_engine.dispose())
+            engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks de desempenho do sistema.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    dashboard_parser = subcommands.add_parser("dashboard", help="Contadores do dashboard.")
+    dashboard_parser.add_argument("--rows", type=int, default=5000, help="Licenças/AVCBs semeados.")
+    dashboard_parser.add_argument("--repeat", type=int, default=20, help="Repetições por cenário.")
+    dashboard_parser.add_argument("--latency-ms", type=float, default=25.0, help="Latência por consulta.")
+
+    load_parser = subcommands.add_parser("load", help="Requisições por segundo sob concorrência.")
+    load_parser.add_argument("--rows", type=int, default=500, help="Licenças semeadas (modo em processo).")
+    load_parser.add_argument("--requests", type=int, default=2000, help="Total de requisições por cenário.")
+    load_parser.add_argument("--concurrency", type=int, default=200, help="Clientes simultâneos.")
+    load_parser.add_argument("--latency-ms", type=float, default=25.0, help="Latência por consulta.")
+    load_parser.add_argument("--base-url", help="Servidor em execução; omita para medir em processo.")
+    load_parser.add_argument("--path", action="append", dest="paths", help="Rota medida (repetível).")
+    load_parser.add_argument("--token", help="JWT enviado como Bearer ao servidor remoto.")
+
+    upload_parser = subcommands.add_parser("upload", help="Memória ao gravar um upload grande.")
+    upload_parser.add_argument("--size-mb", type=int, default=500, help="Tamanho do arquivo enviado.")
+
+    report_parser = subcommands.add_parser("report", help="Tempo e memória do relatório em PDF.")
+    report_parser.add_argument("--rows", type=int, default=50000, help="Licenças semeadas.")
+    report_parser.add_argument("--skip-legacy", action="store_true", help="Mede só o motor de tabelas.")
+
+    export_parser = subcommands.add_parser("export", help="Primeiro byte e memória das exportações CSV/XLSX.")
+    export_parser.add_argument("--rows", type=int, default=1_000_000, help="Licenças inseridas.")
+
+    email_parser = subcommands.add_parser("email", help="Vazão da fila de e-mails contra um SendGrid falso.")
+    email_parser.add_argument("--messages", type=int, default=2000, help="Mensagens enviadas por cenário.")
+    email_parser.add_argument("--latency-ms", type=float, default=50.0, help="Tempo de resposta da API.")
+    email_parser.add_argument("--concurrency", type=int, default=8, help="EMAIL_SEND_CONCURRENCY.")
+
+    templates_parser = subcommands.add_parser("email-templates", help="Renderização do resumo de vencimentos.")
+    templates_parser.add_argument("--items", type=int, default=500, help="Itens no resumo.")
+    templates_parser.add_argument("--repeat", type=int, default=200, help="Renderizações por cenário.")
+
+    me_parser = subcommands.add_parser("me", help="Latência de /users/me com o cache de autenticação.")
+    me_parser.add_argument("--requests", type=int, default=500, help="Requisições por cenário.")
+    me_parser.add_argument("--latency-ms", type=float, default=25.0, help="Latência por consulta.")
+
+    login_parser = subcommands.add_parser("login", help="Vazão de logins simultâneos com bcrypt.")
+    login_parser.add_argument("--concurrency", type=int, default=50, help="Logins simultâneos.")
+    login_parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS.")
+    login_parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS.")
+
+    args = parser.parse_args()
+
+    if args.command == "dashboard":
+        bench_dashboard(args.rows, args.repeat, args.latency_ms)
+    elif args.command == "load":
+        paths = args.paths or ["/licenses/", "/avcb/", "/dashboard/"]
+        bench_load(args.rows, args.requests, args.concurrency, args.latency_ms, args.base_url, paths, args.token)
+    elif args.command == "upload":
+        bench_upload(args.size_mb)
+    elif args.command == "report":
+        bench_report(args.rows, args.skip_legacy)
+    elif args.command == "export":
+        bench_export(args.rows)
+    elif args.command == "email":
+        bench_email(args.messages, args.latency_ms, args.concurrency)
+    elif args.command == "email-templates":
+        bench_email_templates(args.items, args.repeat)
+    elif args.command == "me":
+        bench_me(args.requests, args.latency_ms)
+    elif args.command == "login":
+        bench_login(args.concurrency, args.rounds, args.workers)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@
 Uso básico:
     python scripts/bootstrap.py init-db
     python scripts/bootstrap.py create-superuser --email admin@example.com
+    python scripts/bootstrap.py run-job overdue-conditions
+    python scripts/bootstrap.py run-job expire-statuses
+    python scripts/bootstrap.py gc-storage --dry-run
+    python scripts/bootstrap.py reindex-documents
 """
 
 from __future__ import annotations
@@ -19,18 +23,22 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from app.core.schema import upgrade_schema
 from app.crud.user import user_crud
-from app.database import Base, SessionLocal, engine
+from app.database import SessionLocal
 from app.schemas.user import UserCreate
+from app.services.jobs import JOBS, run_job
+from app.services.search import document_search_service
+from app.services.storage_gc import storage_garbage_collector
 
 
 def init_db() -> None:
-    """Cria as tabelas no banco configurado."""
+    """Aplica as migrações pendentes (alembic upgrade head) no banco configurado."""
     try:
-        Base.metadata.create_all(bind=engine)
+        upgrade_schema()
     except OperationalError as exc:
         raise SystemExit(f"Falha ao conectar ao banco de dados: {exc}") from exc
-    print("Tabelas criadas/verificadas com sucesso.")
+    print("Migrações aplicadas com sucesso.")
 
 
 def create_superuser(email: str | None, full_name: str | None, password: str | None) -> None:
@@ -67,6 +75,42 @@ def create_superuser(email: str | None, full_name: str | None, password: str | N
         session.close()
 
 
+def run_maintenance_job(name: str) -> None:
+    """Executa imediatamente um job de manutenção agendado."""
+    try:
+        result = run_job(name)
+    except OperationalError as exc:
+        raise SystemExit(f"Falha ao conectar ao banco de dados: {exc}") from exc
+    summary = ", ".join(f"{key}={value}" for key, value in result.items())
+    print(f"Job {name} concluído: {summary}")
+
+
+def gc_storage(dry_run: bool) -> None:
+    """Remove PDFs sem referência e relatórios antigos; com ``--dry-run`` apenas lista os números."""
+    session = SessionLocal()
+    try:
+        stats = storage_garbage_collector.collect(session, dry_run=dry_run)
+    except OperationalError as exc:
+        raise SystemExit(f"Falha ao conectar ao banco de dados: {exc}") from exc
+    finally:
+        session.close()
+    summary = ", ".join(f"{key}={value}" for key, value in stats.items())
+    print(f"{'Simulação' if dry_run else 'Coleta'} concluída: {summary}")
+
+
+def reindex_documents() -> None:
+    """Extrai o texto dos PDFs já cadastrados que ainda não estão no índice de busca."""
+    session = SessionLocal()
+    try:
+        stats = document_search_service.reindex(session)
+    except OperationalError as exc:
+        raise SystemExit(f"Falha ao conectar ao banco de dados: {exc}") from exc
+    finally:
+        session.close()
+    summary = ", ".join(f"{key}={value}" for key, value in stats.items())
+    print(f"Reindexação concluída: {summary}")
+
+
 def _prompt_password() -> str:
     pwd = getpass("Senha: ")
     confirm = getpass("Confirme a senha: ")
@@ -81,19 +125,33 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Utilitários de manutenção do sistema.")
     subcommands = parser.add_subparsers(dest="command", required=True)
 
-    subcommands.add_parser("init-db", help="Cria as tabelas no banco configurado.")
+    subcommands.add_parser("init-db", help="Aplica as migrações do banco configurado.")
 
     superuser_parser = subcommands.add_parser("create-superuser", help="Cria um usuário administrador.")
     superuser_parser.add_argument("--email", help="E-mail do administrador.")
     superuser_parser.add_argument("--full-name", help="Nome completo do administrador.")
     superuser_parser.add_argument("--password", help="Senha (será solicitada se omitida).")
 
+    job_parser = subcommands.add_parser("run-job", help="Executa um job de manutenção agendado.")
+    job_parser.add_argument("name", choices=sorted(JOBS), help="Nome do job.")
+
+    gc_parser = subcommands.add_parser("gc-storage", help="Remove arquivos órfãos do armazenamento.")
+    gc_parser.add_argument("--dry-run", action="store_true", help="Apenas conta, sem remover arquivos.")
+
+    subcommands.add_parser("reindex-documents", help="Indexa o texto dos PDFs enviados antes da busca.")
+
     args = parser.parse_args()
 
     if args.command == "init-db":
         init_db()
     elif args.command == "create-superuser":
         create_superuser(args.email, args.full_name, args.password)
+    elif args.command == "run-job":
+        run_maintenance_job(args.name)
+    elif args.command == "gc-storage":
+        gc_storage(args.dry_run)
+    elif args.command == "reindex-documents":
+        reindex_documents()
     else:
         parser.print_help()
 
@@ -0,0 +1,110 @@
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import deps as app_deps
+from app.api.deps import get_current_active_user, get_current_active_user_async
+from app.core.auth_cache import auth_cache
+from app.core.security import password_hasher
+from app.database import Base
+from app.main import app
+from app.models.user import User
+from app.services.email import email_service
+from app.services.exports import export_service
+from app.services.reports import report_job_service
+from app.services.search import document_search_service
+
+
+class StatementCounter:
+    def __init__(self, engine: Engine) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *_args) -> None:
+        self.count += 1
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def db_engine(db_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_db_engine(db_engine: Engine, db_path: Path) -> AsyncEngine:
+    # Mesmo arquivo do engine síncrono: dados semeados pelos testes ficam visíveis à API.
+    return create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+
+
+@pytest.fixture
+def session_factory(db_engine: Engine) -> sessionmaker:
+    return sessionmaker(bind=db_engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db_session(session_factory: sessionmaker) -> Iterator[Session]:
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def api_client(
+    db_engine: Engine,
+    session_factory: sessionmaker,
+    async_db_engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[TestClient]:
+    async_session_factory = async_sessionmaker(bind=async_db_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db() -> Iterator[Session]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db() -> AsyncIterator[AsyncSession]:
+        async with async_session_factory() as db:
+            yield db
+
+    def override_current_user() -> User:
+        return User(
+            id=1,
+            email="admin@example.com",
+            full_name="Administrador",
+            is_active=True,
+            is_superuser=True,
+            created_at=datetime.utcnow(),
+        )
+
+    app.dependency_overrides[app_deps.get_db] = override_get_db
+    app.dependency_overrides[app_deps.get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_active_user] = override_current_user
+    app.dependency_overrides[get_current_active_user_async] = override_current_user
+    monkeypatch.setattr(document_search_service, "session_factory", session_factory)
+    monkeypatch.setattr(email_service, "session_factory", session_factory)
+    monkeypatch.setattr(export_service, "session_factory", session_factory)
+    monkeypatch.setattr(report_job_service, "database_url", db_engine.url)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    auth_cache.clear()
+    document_search_service.shutdown()
+    email_service.shutdown()
+    report_job_service.shutdown()
+    password_hasher.shutdown()
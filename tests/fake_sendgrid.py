@@ -0,0 +1,87 @@
+"""Servidor HTTP local que imita ``POST /v3/mail/send`` do SendGrid, para testes e benchmarks offline."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+
+class FakeSendGrid:
+    """Aceita mensagens com ``202`` e as guarda em ``messages``.
+
+    ``failures`` mapeia um destinatário para a fila de status a devolver antes de aceitar a mensagem
+    (ex.: ``{"a@x.com": [503, 429]}``); ``latency`` simula o tempo de resposta da API.
+    """
+
+    def __init__(self, api_key: str = "fake-key", latency: float = 0.0) -> None:
+        self.api_key = api_key
+        self.latency = latency
+        self.failures: dict[str, list[int]] = defaultdict(list)
+        self.messages: list[dict] = []
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> FakeSendGrid:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-sendgrid", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _respond(self, authorization: str | None, body: bytes) -> tuple[int, dict[str, str]]:
+        if self.latency:
+            time.sleep(self.latency)
+        if authorization != f"Bearer {self.api_key}":
+            return 401, {}
+        payload = json.loads(body)
+        recipient = payload["personalizations"][0]["to"][0]["email"]
+        with self._lock:
+            self.requests += 1
+            if self.failures.get(recipient):
+                status = self.failures[recipient].pop(0)
+                return status, {"Retry-After": "1"} if status == 429 else {}
+            self.messages.append(payload)
+        return 202, {"X-Message-Id": uuid4().hex}
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path != "/v3/mail/send":
+                    status, headers = 404, {}
+                else:
+                    status, headers = fake._respond(self.headers.get("Authorization"), body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *_args) -> None:
+                return
+
+        return Handler
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+
+def test_license_crud_round_trip_through_async_session(api_client: TestClient) -> None:
+    created = api_client.post(
+        "/licenses/",
+        json={
+            "name": "LO Fábrica",
+            "issuing_agency": "CETESB",
+            "expiry_date": "2030-01-01",
+            "conditions": [{"title": "Monitoramento"}],
+        },
+    )
+    assert created.status_code == 201
+    license_id = created.json()["id"]
+    assert [item["title"] for item in created.json()["conditions"]] == ["Monitoramento"]
+
+    updated = api_client.patch(f"/licenses/{license_id}", json={"notes": "Renovar"})
+    assert updated.status_code == 200
+    assert updated.json()["notes"] == "Renovar"
+    assert len(updated.json()["conditions"]) == 1
+
+    assert api_client.get(f"/licenses/{license_id}").json()["notes"] == "Renovar"
+    assert api_client.delete(f"/licenses/{license_id}").status_code == 204
+    assert api_client.get(f"/licenses/{license_id}").status_code == 404
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.crud.user import user_crud
+from app.models import User
+
+
+def test_login_runs_bcrypt_in_the_pool_and_rehashes_on_cost_change(
+    monkeypatch: pytest.MonkeyPatch, api_client: TestClient, db_session: Session
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    monkeypatch.setattr(settings, "password_hash_workers", 1)
+    credentials = {"email": "ana@example.com", "password": "senha-forte"}
+    response = api_client.post("/auth/register", json={**credentials, "full_name": "Ana"})
+    assert response.status_code == 201
+    user = db_session.get(User, response.json()["id"])
+    assert user.hashed_password.startswith("$2b$04$")
+
+    assert api_client.post("/auth/login", json=credentials).json()["access_token"]
+    form = {"username": credentials["email"], "password": credentials["password"]}
+    assert api_client.post("/auth/token", data=form).status_code == 200
+    assert api_client.post("/auth/login", json={**credentials, "password": "errada"}).status_code == 401
+
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+    assert api_client.post("/auth/login", json=credentials).status_code == 200
+    db_session.refresh(user)
+    assert user.hashed_password.startswith("$2b$05$")
+
+    user_crud.create_reset_token(db_session, user, "token-reset", datetime.utcnow() + timedelta(hours=1))
+    payload = {"token": "token-reset", "new_password": "nova-senha"}
+    assert api_client.post("/auth/password/reset/confirm", json=payload).status_code == 200
+    assert api_client.post("/auth/password/reset/confirm", json=payload).status_code == 400
+    assert api_client.post("/auth/login", json={**credentials, "password": "nova-senha"}).status_code == 200
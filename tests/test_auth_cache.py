@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_active_user, get_current_active_user_async
+from app.core.auth_cache import auth_cache
+from app.core.security import create_access_token
+from app.crud.user import user_crud
+from app.main import app
+from app.models import User
+from app.schemas.user import UserUpdate
+from tests.conftest import StatementCounter
+
+
+def test_current_user_is_cached_until_the_user_changes(
+    api_client: TestClient, db_engine: Engine, db_session: Session
+) -> None:
+    app.dependency_overrides.pop(get_current_active_user)
+    app.dependency_overrides.pop(get_current_active_user_async)
+    user = User(email="ana@example.com", full_name="Ana", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    counter = StatementCounter(db_engine)
+
+    assert api_client.get("/users/me", headers=headers).json()["full_name"] == "Ana"
+    assert counter.count == 1
+    assert api_client.get("/users/me", headers=headers).status_code == 200
+    assert counter.count == 1
+    assert api_client.get("/licenses/", headers=headers).status_code == 200
+
+    response = api_client.patch("/users/me", headers=headers, json={"full_name": "Ana Souza"})
+    assert response.status_code == 200
+    assert api_client.get("/users/me", headers=headers).json()["full_name"] == "Ana Souza"
+
+    db_session.refresh(user)
+    user_crud.update(db_session, user, UserUpdate(is_active=False))
+    assert api_client.get("/users/me", headers=headers).status_code == 400
+    assert api_client.get("/users/me", headers={"Authorization": "Bearer invalido"}).status_code == 401
+
+
+def test_cold_request_checks_the_user_cache_once(api_client: TestClient, db_session: Session) -> None:
+    app.dependency_overrides.pop(get_current_active_user)
+    app.dependency_overrides.pop(get_current_active_user_async)
+    user = User(email="bia@example.com", full_name="Bia", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+    for path in ("/licenses/", "/users/me"):
+        auth_cache.clear()
+        misses = auth_cache.users.misses
+        assert api_client.get(path, headers=headers).status_code == 200
+        assert auth_cache.users.misses == misses + 1
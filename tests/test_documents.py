@@ -0,0 +1,104 @@
+import hashlib
+import io
+import zipfile
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import License, Transporter
+from app.services.documents import RangeNotSatisfiableError, parse_byte_range
+
+CONTENT = b"%PDF-1.7 " + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def uploaded_license(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, api_client: TestClient, db_session: Session
+) -> int:
+    monkeypatch.setattr(get_settings(), "file_storage_dir", str(tmp_path / "uploads"))
+    license_obj = License(name="LO", issuing_agency="IBAMA", expiry_date=date(2030, 1, 1))
+    db_session.add(license_obj)
+    db_session.commit()
+    response = api_client.post(
+        f"/licenses/{license_obj.id}/upload", files={"file": ("scan.pdf", CONTENT, "application/pdf")}
+    )
+    assert response.status_code == 200
+    return license_obj.id
+
+
+def test_parse_byte_range() -> None:
+    assert parse_byte_range("bytes=0-9", 100) == (0, 9)
+    assert parse_byte_range("bytes=90-", 100) == (90, 99)
+    assert parse_byte_range("bytes=-10", 100) == (90, 99)
+    assert parse_byte_range("bytes=50-500", 100) == (50, 99)
+    assert parse_byte_range("bytes=0-1,5-6", 100) is None
+    assert parse_byte_range("items=0-1", 100) is None
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_byte_range("bytes=100-", 100)
+
+
+def test_document_validators_and_ranges(api_client: TestClient, uploaded_license: int) -> None:
+    url = f"/documents/licenses/{uploaded_license}"
+    etag = f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+
+    full = api_client.get(url)
+    assert full.status_code == 200
+    assert full.content == CONTENT
+    assert full.headers["etag"] == etag
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["cache-control"] == "private, no-cache"
+
+    partial = api_client.get(url, headers={"Range": "bytes=9-18"})
+    assert partial.status_code == 206
+    assert partial.content == CONTENT[9:19]
+    assert partial.headers["content-range"] == f"bytes 9-18/{len(CONTENT)}"
+
+    assert api_client.get(url, headers={"Range": "bytes=9-18", "If-Range": '"outro"'}).status_code == 200
+    assert api_client.get(url, headers={"Range": f"bytes={len(CONTENT)}-"}).status_code == 416
+    assert api_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    immutable = api_client.get(f"/documents/objects/{etag.strip(chr(34))}")
+    assert immutable.content == CONTENT
+    assert "immutable" in immutable.headers["cache-control"]
+
+    download = api_client.get(f"/licenses/{uploaded_license}/download")
+    assert download.headers["content-disposition"] == f'attachment; filename="licenca_{uploaded_license}.pdf"'
+
+
+def test_transporter_documents_and_missing_files(api_client: TestClient, db_session: Session) -> None:
+    transporter = Transporter(name="T", license_number="1")
+    db_session.add(transporter)
+    db_session.commit()
+
+    assert api_client.get(f"/documents/transporters/{transporter.id}").status_code == 404
+    assert api_client.get("/documents/unknown/1").status_code == 404
+    assert api_client.get(f"/documents/objects/{'0' * 64}").status_code == 404
+
+
+def test_zip_export_streams_filtered_documents(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, api_client: TestClient, db_session: Session
+) -> None:
+    monkeypatch.setattr(get_settings(), "file_storage_dir", str(tmp_path / "uploads"))
+    soon = License(name="Vence/logo", issuing_agency="IBAMA", expiry_date=date.today())
+    later = License(name="Vence depois", issuing_agency="IBAMA", expiry_date=date(2099, 1, 1))
+    lost = License(name="Sem arquivo", issuing_agency="IBAMA", expiry_date=date.today(), pdf_path="nao/existe.pdf")
+    db_session.add_all([soon, later, lost])
+    db_session.commit()
+    for license_obj in (soon, later):
+        api_client.post(
+            f"/licenses/{license_obj.id}/upload",
+            files={"file": ("scan.pdf", CONTENT + license_obj.name.encode(), "application/pdf")},
+        )
+
+    response = api_client.get("/licenses/export.zip", params={"days_until_expiry": 30})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.namelist() == [f"{soon.id}_Vence_logo.pdf", "arquivos_ausentes.txt"]
+        assert archive.read(f"{soon.id}_Vence_logo.pdf") == CONTENT + b"Vence/logo"
+        assert archive.read("arquivos_ausentes.txt").decode() == f"{lost.id}_Sem arquivo.pdf\n"
@@ -0,0 +1,132 @@
+import threading
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import get_settings
+from app.models import EmailMessage, EmailStatus, License, User
+from app.services.email import email_service
+from app.services.jobs import execute_job
+from tests.fake_sendgrid import FakeSendGrid
+
+
+@pytest.fixture
+def fake_sendgrid(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeSendGrid]:
+    with FakeSendGrid() as fake:
+        monkeypatch.setattr(email_service, "api_key", fake.api_key)
+        monkeypatch.setattr(email_service, "sender", "contato@example.com")
+        monkeypatch.setattr(email_service, "api_base_url", fake.url)
+        yield fake
+        email_service.shutdown()
+
+
+def test_password_reset_is_enqueued_and_delivered_by_the_job(
+    fake_sendgrid: FakeSendGrid, api_client: TestClient, db_session: Session
+) -> None:
+    db_session.add(User(email="ana@example.com", full_name="Ana", hashed_password="x"))
+    db_session.commit()
+
+    response = api_client.post("/auth/password/reset/request", json={"email": "ana@example.com"})
+    assert response.status_code == 202
+    assert fake_sendgrid.requests == 0
+    message = db_session.scalars(select(EmailMessage)).one()
+    assert message.status == EmailStatus.PENDING
+
+    assert execute_job("email-outbox", db_session)["sent"] == 1
+    db_session.refresh(message)
+    assert message.status == EmailStatus.SENT
+    assert message.attempts == 1
+    assert message.provider_message_id
+    assert fake_sendgrid.messages[0]["personalizations"] == [{"to": [{"email": "ana@example.com"}]}]
+    assert fake_sendgrid.messages[0]["subject"] == "Redefinição de senha"
+
+
+def test_transient_failures_are_retried_with_backoff(
+    fake_sendgrid: FakeSendGrid, api_client: TestClient, db_session: Session
+) -> None:
+    fake_sendgrid.failures["retry@example.com"] = [503]
+    fake_sendgrid.failures["invalid@example.com"] = [400]
+    for email in ("retry@example.com", "invalid@example.com", "ok@example.com"):
+        email_service.send_email([email], "Aviso", "<p>Olá</p>")
+    now = datetime(2030, 1, 1, 12, 0)
+
+    assert email_service.deliver_pending(db_session, now) == {"sent": 1, "retried": 1, "failed": 1}
+    messages = {message.recipients[0]: message for message in db_session.scalars(select(EmailMessage))}
+    retried = messages["retry@example.com"]
+    assert retried.status == EmailStatus.PENDING
+    assert retried.next_attempt_at > now
+    assert retried.last_error.startswith("HTTP 503")
+    assert messages["invalid@example.com"].status == EmailStatus.FAILED
+
+    assert email_service.deliver_pending(db_session, now)["sent"] == 0
+    assert email_service.deliver_pending(db_session, now + timedelta(hours=1))["sent"] == 1
+    assert retried.status == EmailStatus.SENT
+    assert retried.attempts == 2
+
+
+def test_overlapping_runs_deliver_each_message_once(
+    fake_sendgrid: FakeSendGrid,
+    api_client: TestClient,
+    session_factory: sessionmaker,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "email_batch_size", 5)
+    fake_sendgrid.latency = 0.02
+    for index in range(40):
+        email_service.send_email([f"destino{index}@example.com"], "Aviso", "<p>Olá</p>")
+    barrier = threading.Barrier(2)
+    results: list[dict[str, int]] = []
+
+    def run() -> None:
+        with session_factory() as session:
+            barrier.wait()
+            results.append(email_service.deliver_pending(session))
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    recipients = [message["personalizations"][0]["to"][0]["email"] for message in fake_sendgrid.messages]
+    assert sorted(recipients) == sorted(f"destino{index}@example.com" for index in range(40))
+    assert sum(result["sent"] for result in results) == 40
+    with session_factory() as session:
+        statuses = session.scalars(select(EmailMessage.status)).all()
+    assert statuses == [EmailStatus.SENT] * 40
+
+
+def test_bulk_notify_queues_one_message_per_license(
+    fake_sendgrid: FakeSendGrid, api_client: TestClient, db_session: Session
+) -> None:
+    today = date.today()
+    licenses = [
+        License(name=f"LO {index}", issuing_agency="CETESB", expiry_date=today + timedelta(days=10 * index))
+        for index in range(1, 6)
+    ]
+    db_session.add_all(licenses)
+    db_session.commit()
+
+    response = api_client.post(
+        "/licenses/notify", json={"emails": ["auditoria@example.com"], "days_until_expiry": 30}
+    )
+    assert response.status_code == 202
+    body = response.json()
+    assert body["queued"] == 3
+    assert [item["days_left"] for item in body["items"]] == [10, 20, 30]
+
+    ids = [licenses[0].id, licenses[4].id, 9999]
+    items = api_client.post("/licenses/notify", json={"emails": ["auditoria@example.com"], "license_ids": ids}).json()
+    assert [(item["license_id"], item["status"]) for item in items["items"]] == [
+        (licenses[0].id, "queued"),
+        (licenses[4].id, "queued"),
+        (9999, "not_found"),
+    ]
+    assert api_client.post("/licenses/notify", json={"emails": ["auditoria@example.com"]}).status_code == 422
+
+    assert execute_job("email-outbox", db_session)["sent"] == 5
+    assert fake_sendgrid.connections <= get_settings().email_send_concurrency
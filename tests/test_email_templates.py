@@ -0,0 +1,27 @@
+from datetime import date
+
+from app.services.email_templates import email_templates
+from app.services.notifications import ExpiryAlert
+
+
+def test_templates_escape_html_and_fall_back_by_locale() -> None:
+    subject, html = email_templates.render("license_expiry", license_name="<LO & Cia>", days_left=7)
+    assert subject == "Licença <LO & Cia> vence em 7 dia(s)"
+    assert "<strong>&lt;LO &amp; Cia&gt;</strong>" in html
+    assert '<html lang="pt-BR">' in html
+
+    assert email_templates.resolve("license_expiry", "en-US") == "email/en/license_expiry.html"
+    assert email_templates.resolve("license_expiry", "fr") == "email/pt_BR/license_expiry.html"
+    subject, html = email_templates.render("password_reset", "en_GB", reset_url="https://app/reset?t=1&u=2")
+    assert subject == "Password reset"
+    assert 'href="https://app/reset?t=1&amp;u=2"' in html
+
+    alerts = [ExpiryAlert("avcb", index, f"Galpão {index} & <b>", date(2030, 1, 5), 30, 30) for index in range(500)]
+    subject, html = email_templates.render("expiry_digest", alerts=alerts)
+    assert subject == "500 vencimento(s) próximo(s)"
+    assert html.count("<td>AVCB</td><td>Galpão") == 500
+    assert "<td>Galpão 7 &amp; &lt;b&gt;</td><td>05/01/2030</td>" in html
+    assert "<b>" not in html
+    subject, html = email_templates.render("expiry_digest", "en", alerts=alerts[:1])
+    assert subject == "1 upcoming expiration(s)"
+    assert "<td>Jan 5, 2030</td>" in html
@@ -0,0 +1,80 @@
+import csv
+import io
+import zipfile
+from datetime import date
+from xml.etree import ElementTree
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import License, LicenseCondition, LicenseStatus
+
+SHEET_NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _seed(db_session: Session) -> None:
+    db_session.add_all(
+        [
+            License(
+                name="LO; captação",
+                issuing_agency="CETESB",
+                expiry_date=date(2030, 1, 1),
+                status=LicenseStatus.ACTIVE,
+                conditions=[LicenseCondition(title="Monitorar <vazão>", due_date=date(2029, 6, 30))],
+            ),
+            License(
+                name="LO suspensa",
+                issuing_agency="IBAMA",
+                expiry_date=date(2031, 1, 1),
+                status=LicenseStatus.SUSPENDED,
+            ),
+        ]
+    )
+    db_session.commit()
+
+
+def test_csv_export_streams_filtered_rows(api_client: TestClient, db_session: Session) -> None:
+    _seed(db_session)
+    response = api_client.get("/exports/licenses.csv", params={"status_filter": "active"})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].startswith('attachment; filename="licencas_')
+    text = response.content.decode("utf-8-sig")
+    rows = list(csv.reader(io.StringIO(text), delimiter=";"))
+    assert rows[0][:3] == ["ID", "Nome", "Órgão emissor"]
+    assert [row[1] for row in rows[1:]] == ["LO; captação"]
+    assert rows[1][4:6] == ["2030-01-01", "active"]
+
+    assert api_client.get("/exports/licenses.csv", params={"status_filter": "x"}).status_code == 400
+    assert api_client.get("/exports/desconhecido.csv").status_code == 404
+
+
+def test_csv_export_neutralizes_formulas(api_client: TestClient, db_session: Session) -> None:
+    names = ['=HYPERLINK("http://x","y")', "+5", "-2+3", "@SUM(A1)", "LO - captação"]
+    db_session.add_all(License(name=name, issuing_agency="CETESB", expiry_date=date(2030, 1, 1)) for name in names)
+    db_session.commit()
+    text = api_client.get("/exports/licenses.csv").content.decode("utf-8-sig")
+    rows = list(csv.reader(io.StringIO(text), delimiter=";"))
+    assert [row[1] for row in rows[1:]] == [
+        '\'=HYPERLINK("http://x","y")',
+        "'+5",
+        "'-2+3",
+        "'@SUM(A1)",
+        "LO - captação",
+    ]
+
+
+def test_xlsx_export_is_a_valid_workbook(api_client: TestClient, db_session: Session) -> None:
+    _seed(db_session)
+    response = api_client.get("/exports/license_conditions.xlsx")
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as workbook:
+        assert workbook.testzip() is None
+        assert "[Content_Types].xml" in workbook.namelist()
+        sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+    rows = sheet.findall("x:sheetData/x:row", SHEET_NS)
+    assert len(rows) == 2
+    cells = {cell.get("r"): cell for cell in rows[1]}
+    assert cells["B2"].find("x:is/x:t", SHEET_NS).text == "LO; captação"
+    assert cells["C2"].find("x:is/x:t", SHEET_NS).text == "Monitorar <vazão>"
+    assert cells["F2"].get("s") == "1"
+    assert cells["F2"].find("x:v", SHEET_NS).text == str((date(2029, 6, 30) - date(1899, 12, 30)).days)
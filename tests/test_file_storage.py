@@ -0,0 +1,84 @@
+import hashlib
+import io
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import License, StoredFile, Transporter
+from app.utils.file_storage import UploadTooLargeError, object_path, save_upload
+
+
+@pytest.fixture
+def storage_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "file_storage_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "upload_chunk_bytes", 1024)
+    monkeypatch.setattr(settings, "upload_max_bytes", 8 * 1024)
+    return tmp_path
+
+
+def test_save_upload_streams_and_hashes(storage_dir: Path) -> None:
+    content = bytes(range(256)) * 20
+    stored = save_upload(UploadFile(io.BytesIO(content), filename="scan.pdf"))
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    assert stored.sha256 == sha256
+    assert stored.size == len(content)
+    assert stored.path == str(object_path(sha256))
+    assert stored.path.endswith(f"objects/{sha256[:2]}/{sha256[2:4]}/{sha256}.pdf")
+    assert Path(stored.path).read_bytes() == content
+    assert list((storage_dir / "objects" / ".tmp").iterdir()) == []
+
+
+def test_oversized_upload_is_rejected_without_leftovers(
+    storage_dir: Path, api_client: TestClient, db_session: Session
+) -> None:
+    with pytest.raises(UploadTooLargeError):
+        save_upload(UploadFile(io.BytesIO(b"x" * 9 * 1024), filename="scan.pdf"))
+    assert [path.name for path in (storage_dir / "objects").iterdir()] == [".tmp"]
+    assert list((storage_dir / "objects" / ".tmp").iterdir()) == []
+
+    transporter = Transporter(name="Transportadora", license_number="T-1")
+    db_session.add(transporter)
+    db_session.commit()
+    response = api_client.post(
+        f"/residues/transporters/{transporter.id}/upload",
+        files={"file": ("scan.pdf", b"x" * 9 * 1024, "application/pdf")},
+    )
+    assert response.status_code == 413
+
+
+def test_identical_uploads_share_one_object_with_reference_counts(
+    storage_dir: Path, api_client: TestClient, db_session: Session
+) -> None:
+    licenses = [License(name=f"L{index}", issuing_agency="IBAMA", expiry_date=date(2030, 1, 1)) for index in range(2)]
+    db_session.add_all(licenses)
+    db_session.commit()
+
+    def upload(license_id: int, content: bytes) -> str:
+        response = api_client.post(
+            f"/licenses/{license_id}/upload", files={"file": ("scan.pdf", content, "application/pdf")}
+        )
+        assert response.status_code == 200
+        return response.json()["pdf_path"]
+
+    def ref_count(path: str) -> int:
+        db_session.expire_all()
+        return db_session.query(StoredFile.ref_count).filter(StoredFile.path == path).scalar()
+
+    shared = upload(licenses[0].id, b"%PDF mesmo")
+    assert upload(licenses[1].id, b"%PDF mesmo") == shared
+    assert ref_count(shared) == 2
+    assert len(list((storage_dir / "objects").rglob("*.pdf"))) == 1
+
+    replacement = upload(licenses[1].id, b"%PDF novo")
+    assert ref_count(shared) == 1
+    assert ref_count(replacement) == 1
+
+    assert api_client.delete(f"/licenses/{licenses[0].id}").status_code == 204
+    assert ref_count(shared) == 0
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.main import app
+
+SLOW_QUERY_SECONDS = 1.0
+
+
+def test_slow_ui_query_does_not_stall_health_or_api(api_client: TestClient, db_engine: Engine) -> None:
+    query_started = threading.Event()
+    started_at: list[float] = []
+
+    def slow_license_query(_conn, _cursor, statement: str, *_args) -> None:
+        if "FROM licenses" in statement and not query_started.is_set():
+            started_at.append(time.perf_counter())
+            query_started.set()
+            time.sleep(SLOW_QUERY_SECONDS)
+
+    event.listen(db_engine, "before_cursor_execute", slow_license_query)
+
+    async def scenario() -> tuple[float, list[int]]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            ui_request = asyncio.create_task(client.get("/ui/licenses"))
+            assert await asyncio.to_thread(query_started.wait, 5)
+            health = await client.get("/health")
+            api = await client.get("/licenses/")
+            elapsed = time.perf_counter() - started_at[0]
+            ui = await ui_request
+        return elapsed, [health.status_code, api.status_code, ui.status_code]
+
+    elapsed, status_codes = asyncio.run(scenario())
+
+    assert status_codes == [200, 200, 200]
+    assert elapsed < SLOW_QUERY_SECONDS / 2
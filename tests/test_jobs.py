@@ -0,0 +1,73 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_active_user
+from app.main import app
+from app.models import Avcb, AvcbStatus, License, LicenseStatus, User
+from app.services.metrics import dashboard_metrics_service
+
+
+def test_expire_statuses_job_expires_only_outdated_active_records(
+    api_client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    today = date.today()
+    yesterday, tomorrow = today - timedelta(days=1), today + timedelta(days=1)
+    licenses = {
+        "ativa vencida": License(name="A", issuing_agency="CETESB", expiry_date=yesterday, status=LicenseStatus.ACTIVE),
+        "ativa hoje": License(name="B", issuing_agency="CETESB", expiry_date=today, status=LicenseStatus.ACTIVE),
+        "suspensa": License(name="C", issuing_agency="CETESB", expiry_date=yesterday, status=LicenseStatus.SUSPENDED),
+        "pendente": License(name="D", issuing_agency="CETESB", expiry_date=yesterday, status=LicenseStatus.PENDING),
+    }
+    avcbs = {
+        "válido vencido": Avcb(property_name="E", expiry_date=yesterday, status=AvcbStatus.VALID),
+        "válido futuro": Avcb(property_name="F", expiry_date=tomorrow, status=AvcbStatus.VALID),
+        "suspenso": Avcb(property_name="G", expiry_date=yesterday, status=AvcbStatus.SUSPENDED),
+    }
+    db_session.add_all([*licenses.values(), *avcbs.values()])
+    db_session.commit()
+    invalidations: list[None] = []
+    monkeypatch.setattr(dashboard_metrics_service, "invalidate", lambda: invalidations.append(None))
+
+    response = api_client.post("/jobs/expire-statuses/run")
+    assert response.status_code == 200
+    body = response.json()
+    assert {key: body[key] for key in ("licenses", "avcbs")} == {"licenses": 1, "avcbs": 1}
+    assert body["duration_ms"] >= 0
+    assert len(invalidations) == 1
+    db_session.expire_all()
+    assert {key: obj.status for key, obj in licenses.items()} == {
+        "ativa vencida": LicenseStatus.EXPIRED,
+        "ativa hoje": LicenseStatus.ACTIVE,
+        "suspensa": LicenseStatus.SUSPENDED,
+        "pendente": LicenseStatus.PENDING,
+    }
+    assert {key: obj.status for key, obj in avcbs.items()} == {
+        "válido vencido": AvcbStatus.EXPIRED,
+        "válido futuro": AvcbStatus.VALID,
+        "suspenso": AvcbStatus.SUSPENDED,
+    }
+
+    # Nada mudou na segunda execução: o cache do dashboard continua válido.
+    assert {key: api_client.post("/jobs/expire-statuses/run").json()[key] for key in ("licenses", "avcbs")} == {
+        "licenses": 0,
+        "avcbs": 0,
+    }
+    assert len(invalidations) == 1
+
+
+def test_job_endpoint_requires_superuser_and_known_job(api_client: TestClient) -> None:
+    assert api_client.post("/jobs/inexistente/run").status_code == 404
+
+    app.dependency_overrides[get_current_active_user] = lambda: User(
+        id=2,
+        email="usuario@example.com",
+        full_name="Usuário",
+        is_active=True,
+        is_superuser=False,
+        created_at=datetime.utcnow(),
+    )
+    assert api_client.post("/jobs/expire-statuses/run").status_code == 403
+    assert api_client.get("/jobs/").status_code == 403
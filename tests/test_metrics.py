@@ -0,0 +1,142 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.models import (
+    Avcb,
+    AvcbStatus,
+    License,
+    LicenseStatus,
+    Recipient,
+    Transporter,
+    WasteCode,
+)
+from app.services.metrics import dashboard_metrics_service
+from tests.conftest import StatementCounter
+
+
+@pytest.fixture
+def metrics_cache(monkeypatch: pytest.MonkeyPatch) -> TTLCache:
+    cache: TTLCache = TTLCache(60)
+    monkeypatch.setattr(dashboard_metrics_service, "cache", cache)
+    return cache
+
+
+def test_metrics_are_cached_until_a_committed_write(
+    metrics_cache: TTLCache, db_engine: Engine, db_session: Session
+) -> None:
+    counter = StatementCounter(db_engine)
+    assert dashboard_metrics_service.get_metrics(db_session)["licenses"]["total"] == 0
+    statements = counter.count
+    assert dashboard_metrics_service.get_metrics(db_session)["licenses"]["total"] == 0
+    assert counter.count == statements
+    assert (metrics_cache.hits, metrics_cache.misses) == (1, 1)
+
+    license_obj = License(name="LO", issuing_agency="CETESB", expiry_date=date.today() + timedelta(days=400))
+    db_session.add(license_obj)
+    db_session.commit()
+    assert dashboard_metrics_service.get_metrics(db_session)["licenses"]["total"] == 1
+
+    license_obj.status = LicenseStatus.ACTIVE
+    db_session.commit()
+    assert dashboard_metrics_service.get_metrics(db_session)["licenses"]["active"] == 1
+
+    db_session.delete(license_obj)
+    db_session.commit()
+    assert dashboard_metrics_service.get_metrics(db_session)["licenses"]["total"] == 0
+    assert (metrics_cache.misses, metrics_cache.invalidations) == (4, 3)
+
+    db_session.add(License(name="Rascunho", issuing_agency="CETESB", expiry_date=date.today()))
+    db_session.flush()
+    # A própria sessão enxerga a escrita pendente sem gravar o valor no cache compartilhado.
+    assert dashboard_metrics_service.get_metrics(db_session)["licenses"]["total"] == 1
+    db_session.rollback()
+    statements = counter.count
+    assert dashboard_metrics_service.get_metrics(db_session)["licenses"]["total"] == 0
+    assert counter.count == statements
+    assert metrics_cache.invalidations == 3
+
+
+def test_ttl_cache_entries_expire() -> None:
+    cache: TTLCache[int] = TTLCache(0.05)
+    assert cache.get_or_set("chave", lambda: 1) == 1
+    assert cache.get_or_set("chave", lambda: 2) == 1
+    time.sleep(0.06)
+    assert cache.get_or_set("chave", lambda: 3) == 3
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_compute_matches_per_entity_counts(db_session: Session) -> None:
+    today = date(2030, 6, 15)
+    offsets = (-10, 0, 1, 30, 31, 200)
+    statuses = (LicenseStatus.EXPIRED, LicenseStatus.ACTIVE, LicenseStatus.ACTIVE, LicenseStatus.PENDING)
+    db_session.add_all(
+        License(
+            name=f"LO {index}",
+            issuing_agency="CETESB",
+            expiry_date=today + timedelta(days=offset),
+            status=statuses[index % len(statuses)],
+        )
+        for index, offset in enumerate(offsets)
+    )
+    db_session.add_all(
+        [
+            Avcb(property_name="Galpão 1", expiry_date=today - timedelta(days=1), status=AvcbStatus.EXPIRED),
+            Avcb(property_name="Galpão 2", expiry_date=today + timedelta(days=30), status=AvcbStatus.VALID),
+            Avcb(property_name="Galpão 3", expiry_date=today + timedelta(days=31), status=AvcbStatus.VALID),
+            WasteCode(code="D099"),
+            WasteCode(code="F001"),
+            Transporter(name="Transp A", license_number="1", license_expiry_date=today),
+            Transporter(name="Transp B", license_number="2", license_expiry_date=today + timedelta(days=31)),
+            Transporter(name="Transp C", license_number="3"),
+            Recipient(name="Aterro", license_number="4", license_expiry_date=today + timedelta(days=29)),
+        ]
+    )
+    db_session.commit()
+
+    def count(model, *criteria) -> int:
+        return db_session.scalar(select(func.count()).select_from(model).where(*criteria))
+
+    boundary = today + timedelta(days=30)
+    expected = {
+        "licenses": {
+            "total": count(License),
+            "expiring_today": count(License, License.expiry_date <= today),
+            "expiring_30": count(License, License.expiry_date <= boundary),
+            "active": count(License, License.status == LicenseStatus.ACTIVE),
+            "expired": count(License, License.status == LicenseStatus.EXPIRED),
+        },
+        "avcbs": {
+            "total": count(Avcb),
+            "expiring_today": count(Avcb, Avcb.expiry_date <= today),
+            "expiring_30": count(Avcb, Avcb.expiry_date <= boundary),
+            "active": count(Avcb, Avcb.status == AvcbStatus.VALID),
+            "expired": count(Avcb, Avcb.status == AvcbStatus.EXPIRED),
+        },
+        "waste_codes": {"total": count(WasteCode), "expiring_today": 0, "expiring_30": 0, "active": 0, "expired": 0},
+        "transporters": {
+            "total": count(Transporter),
+            "expiring_today": count(Transporter, Transporter.license_expiry_date <= today),
+            "expiring_30": count(Transporter, Transporter.license_expiry_date <= boundary),
+            "active": 0,
+            "expired": 0,
+        },
+        "recipients": {
+            "total": count(Recipient),
+            "expiring_today": count(Recipient, Recipient.license_expiry_date <= today),
+            "expiring_30": count(Recipient, Recipient.license_expiry_date <= boundary),
+            "active": 0,
+            "expired": 0,
+        },
+    }
+    metrics = dashboard_metrics_service.compute(db_session, today)
+    assert metrics == expected
+    assert metrics["licenses"] == {"total": 6, "expiring_today": 2, "expiring_30": 4, "active": 3, "expired": 2}
+    assert metrics["avcbs"]["expiring_30"] == 2
+    assert metrics["transporters"] == {"total": 3, "expiring_today": 1, "expiring_30": 1, "active": 0, "expired": 0}
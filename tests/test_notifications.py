@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import (
+    Avcb,
+    ConditionStatus,
+    EmailMessage,
+    License,
+    LicenseCondition,
+    NotificationLedger,
+    Transporter,
+)
+from app.services.email import email_service
+from app.services.notifications import expiry_notification_service
+
+
+def test_expiry_digests_are_sent_once_per_lead_time(
+    monkeypatch: pytest.MonkeyPatch, db_session: Session
+) -> None:
+    monkeypatch.setattr(email_service, "api_key", "fake-key")
+    monkeypatch.setattr(email_service, "sender", "contato@example.com")
+    monkeypatch.setattr(get_settings(), "expiry_notification_emails", ["equipe@example.com"])
+    today = date(2030, 1, 1)
+    license_obj = License(name="LO Fábrica", issuing_agency="CETESB", expiry_date=today + timedelta(days=25))
+    license_obj.conditions = [
+        LicenseCondition(
+            title="Monitorar efluentes", responsible="ana@example.com", due_date=today + timedelta(days=50)
+        ),
+        LicenseCondition(title="Concluída", due_date=today + timedelta(days=5), status=ConditionStatus.COMPLETED),
+    ]
+    db_session.add_all(
+        [
+            license_obj,
+            License(name="Distante", issuing_agency="IBAMA", expiry_date=today + timedelta(days=200)),
+            Avcb(property_name="Galpão 2", expiry_date=today + timedelta(days=80)),
+            Transporter(
+                name="TransLog",
+                license_number="T-1",
+                license_expiry_date=today + timedelta(days=5),
+                contact_email="frota@translog.com",
+            ),
+        ]
+    )
+    db_session.commit()
+
+    assert expiry_notification_service.notify(db_session, today) == {"alerts": 4, "digests": 3}
+    messages = {message.recipients[0]: message for message in db_session.scalars(select(EmailMessage))}
+    assert messages["equipe@example.com"].subject == "4 vencimento(s) próximo(s)"
+    assert "Monitorar efluentes (LO Fábrica)" in messages["ana@example.com"].html_content
+    assert "TransLog" in messages["frota@translog.com"].html_content
+    ledger = db_session.execute(select(NotificationLedger.entity, NotificationLedger.lead_days)).tuples().all()
+    assert sorted(ledger) == [("avcb", 90), ("license_conditions", 60), ("licenses", 30), ("transporters", 7)]
+
+    assert expiry_notification_service.notify(db_session, today) == {"alerts": 0, "digests": 0}
+    assert expiry_notification_service.notify(db_session, today + timedelta(days=10))["alerts"] == 0
+    assert expiry_notification_service.notify(db_session, today + timedelta(days=18)) == {"alerts": 1, "digests": 1}
@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import License, Transporter
+
+
+def test_license_keyset_pages_cover_all_rows_in_order(api_client: TestClient, db_session: Session) -> None:
+    today = date.today()
+    for index in range(25):
+        db_session.add(License(name=f"L{index}", issuing_agency="IBAMA", expiry_date=today + timedelta(days=index % 4)))
+    db_session.commit()
+
+    seen: list[tuple[str, int]] = []
+    cursor = None
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        body = api_client.get("/licenses/", params=params).json()
+        seen.extend((item["expiry_date"], item["id"]) for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 25
+    assert seen == sorted(seen)
+
+
+def test_name_keyset_and_invalid_cursor(api_client: TestClient, db_session: Session) -> None:
+    for name in ["Beta", "Alfa", "Gama", "Alfa"]:
+        db_session.add(Transporter(name=name, license_number="X"))
+    db_session.commit()
+
+    first = api_client.get("/residues/transporters", params={"limit": 3}).json()
+    second = api_client.get("/residues/transporters", params={"limit": 3, "cursor": first["next_cursor"]}).json()
+
+    assert [item["name"] for item in first["items"]] == ["Alfa", "Alfa", "Beta"]
+    assert [item["name"] for item in second["items"]] == ["Gama"]
+    assert second["next_cursor"] is None
+    assert api_client.get("/residues/transporters", params={"cursor": "não-é-cursor"}).status_code == 400
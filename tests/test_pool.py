@@ -0,0 +1,54 @@
+import threading
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+
+from app.core.pool import TimedQueuePool, install_idle_pre_ping, pool_status
+from app.main import app
+
+
+def test_pool_status_reports_checkouts_and_wait_histogram(tmp_path: Path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool, pool_size=1, max_overflow=0
+    )
+    holder = engine.connect()
+    assert pool_status(engine.pool, 0)["checked_out"] == 1
+
+    releaser = threading.Timer(0.2, holder.close)
+    releaser.start()
+    with engine.connect():
+        pass
+    releaser.join()
+
+    status = pool_status(engine.pool, 0)
+    assert status["checked_out"] == 0
+    assert status["max_overflow"] == 0
+    assert status["idle"] == 1
+    assert status["checkout_wait"]["count"] == 2
+    assert status["checkout_wait"]["max_ms"] >= 150
+    assert status["checkout_wait"]["buckets_ms"]["100"] == 1
+    engine.dispose()
+
+
+def test_idle_pre_ping_only_pings_connections_idle_past_threshold(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ping.db'}", poolclass=TimedQueuePool, pool_size=1)
+    executed: list[str] = []
+    event.listen(engine, "connect", lambda dbapi_conn, _record: dbapi_conn.set_trace_callback(executed.append))
+    install_idle_pre_ping(engine, idle_seconds=0.1)
+
+    for pause in (0, 0.2):
+        time.sleep(pause)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 2"))
+
+    selects = [statement for statement in executed if statement.startswith("SELECT")]
+    assert selects == ["SELECT 2", "SELECT 1", "SELECT 2"]
+    engine.dispose()
+
+
+def test_health_db_endpoint_exposes_both_pools() -> None:
+    body = TestClient(app).get("/health/db").json()
+    assert set(body) == {"sync", "async"}
+    assert "checkout_wait" in body["sync"]
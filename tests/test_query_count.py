@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.models import Avcb, AvcbCondition, License, LicenseCondition
+from tests.conftest import StatementCounter
+
+MAX_LIST_STATEMENTS = 2
+
+
+def _seed(db: Session, rows: int) -> None:
+    due_date = date.today() + timedelta(days=60)
+    for index in range(rows):
+        db.add(
+            License(
+                name=f"Licença {index}",
+                issuing_agency="CETESB",
+                expiry_date=date.today() + timedelta(days=index),
+                conditions=[LicenseCondition(title=f"Item {item}", due_date=due_date) for item in range(3)],
+            )
+        )
+        db.add(
+            Avcb(
+                property_name=f"Imóvel {index}",
+                expiry_date=date.today() + timedelta(days=index),
+                conditions=[AvcbCondition(title=f"Item {item}", due_date=due_date) for item in range(3)],
+            )
+        )
+    db.commit()
+
+
+@pytest.mark.parametrize("path", ["/licenses/", "/avcb/"])
+def test_list_statement_count_does_not_grow_with_rows(
+    path: str, api_client: TestClient, async_db_engine: AsyncEngine, db_session: Session
+) -> None:
+    counter = StatementCounter(async_db_engine.sync_engine)
+    statement_counts = []
+    for rows in (5, 50):
+        _seed(db_session, rows)
+        counter.count = 0
+        response = api_client.get(path)
+        assert response.status_code == 200
+        assert all(len(item["conditions"]) == 3 for item in response.json()["items"])
+        statement_counts.append(counter.count)
+
+    assert statement_counts[0] == statement_counts[1]
+    assert statement_counts[1] <= MAX_LIST_STATEMENTS
@@ -0,0 +1,81 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from pypdf import PdfReader
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import Avcb, AvcbCondition, License, Transporter
+from app.services.reports import REPORTS, pdf_report_service, report_job_service, report_rows
+
+
+@pytest.fixture
+def licenses(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, db_session: Session) -> list[License]:
+    monkeypatch.setattr(get_settings(), "file_storage_dir", str(tmp_path / "uploads"))
+    monkeypatch.setattr(get_settings(), "report_workers", 1)
+    records = [
+        License(name=f"LO {index}", issuing_agency="CETESB", expiry_date=date(2030, 1, index + 1))
+        for index in range(3)
+    ]
+    db_session.add_all(records)
+    db_session.commit()
+    return records
+
+
+def test_identical_requests_share_one_render_until_data_changes(
+    api_client: TestClient, db_session: Session, licenses: list[License]
+) -> None:
+    first = api_client.post("/reports/licenses")
+    second = api_client.post("/reports/licenses")
+    assert first.status_code == second.status_code == 202
+    job_id = first.json()["id"]
+    assert second.json()["id"] == job_id
+    assert report_job_service.wait(job_id, timeout=60)["status"] == "done"
+
+    status_response = api_client.get(f"/reports/jobs/{job_id}").json()
+    assert status_response["download_url"] == f"/reports/jobs/{job_id}/download"
+    download = api_client.get(status_response["download_url"])
+    assert download.status_code == 200
+    assert download.content.startswith(b"%PDF")
+    assert api_client.post("/reports/licenses").json() == status_response
+
+    filtered = api_client.post("/reports/licenses", params={"days_until_expiry": 0})
+    assert filtered.status_code == 404
+
+    licenses[0].name = "LO renomeada"
+    db_session.commit()
+    assert api_client.post("/reports/licenses").json()["id"] != job_id
+
+
+def test_unknown_job_returns_404(api_client: TestClient) -> None:
+    assert api_client.get("/reports/jobs/desconhecido").status_code == 404
+    assert api_client.post("/reports/desconhecido").status_code == 404
+
+
+def test_table_reports_group_rows_and_repeat_headers(tmp_path: Path, db_session: Session) -> None:
+    agencies = ["IBAMA", "CETESB"]
+    db_session.add_all(
+        License(name=f"LO {index}", issuing_agency=agencies[index % 2], expiry_date=date(2030, 1, 1))
+        for index in range(120)
+    )
+    avcb = Avcb(property_name="Galpão", expiry_date=date(2031, 3, 1))
+    avcb.conditions = [AvcbCondition(title="Extintores", due_date=date(2030, 5, 10))]
+    db_session.add_all([avcb, Transporter(name="Transportadora", license_number="T-1")])
+    db_session.commit()
+
+    for report in REPORTS:
+        pdf_report_service.render_table(
+            REPORTS[report].layout, report_rows(db_session, report, {}), tmp_path / f"{report}.pdf"
+        )
+
+    pages = [page.extract_text() for page in PdfReader(tmp_path / "licenses.pdf").pages]
+    assert len(pages) > 1
+    assert all("Licença Validade Emissão Status" in page for page in pages)
+    text = "\n".join(pages)
+    assert text.index("Órgão emissor: CETESB") < text.index("Órgão emissor: IBAMA")
+    assert text.count("LO ") == 120
+    assert "Prazo: 05/2030" in PdfReader(tmp_path / "avcb_conditions.pdf").pages[0].extract_text()
+    assert "Vencimento: sem informação" in PdfReader(tmp_path / "transporters.pdf").pages[0].extract_text()
+    assert "Nenhum registro encontrado." in PdfReader(tmp_path / "recipients.pdf").pages[0].extract_text()
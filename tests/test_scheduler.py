@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.crud.avcb import avcb_crud
+from app.crud.license import license_crud
+from app.models import (
+    Avcb,
+    AvcbCondition,
+    AvcbConditionStatus,
+    ConditionStatus,
+    License,
+    LicenseCondition,
+)
+from app.services import scheduler as scheduler_module
+from app.services.scheduler import JobScheduler, LeaderLock
+
+
+def test_past_due_open_conditions_become_overdue(db_session: Session) -> None:
+    today = date(2030, 1, 10)
+    past, future = today - timedelta(days=1), today + timedelta(days=1)
+    license_obj = License(name="LO Fábrica", issuing_agency="CETESB", expiry_date=today + timedelta(days=365))
+    license_obj.conditions = [
+        LicenseCondition(title="Aberta vencida", due_date=past, status=ConditionStatus.OPEN),
+        LicenseCondition(title="Em andamento vencida", due_date=past, status=ConditionStatus.IN_PROGRESS),
+        LicenseCondition(title="Concluída", due_date=past, status=ConditionStatus.COMPLETED),
+        LicenseCondition(title="Já atrasada", due_date=past, status=ConditionStatus.OVERDUE),
+        LicenseCondition(title="Vence hoje", due_date=today, status=ConditionStatus.OPEN),
+        LicenseCondition(title="Futura", due_date=future, status=ConditionStatus.OPEN),
+        LicenseCondition(title="Sem prazo", status=ConditionStatus.OPEN),
+    ]
+    avcb = Avcb(property_name="Galpão 2", expiry_date=today + timedelta(days=365))
+    avcb.conditions = [
+        AvcbCondition(title="Extintores", due_date=past, status=AvcbConditionStatus.IN_PROGRESS),
+        AvcbCondition(title="Brigada", due_date=past, status=AvcbConditionStatus.COMPLETED),
+    ]
+    db_session.add_all([license_obj, avcb])
+    db_session.commit()
+
+    assert license_crud.mark_overdue_conditions(db_session, today) == 2
+    assert avcb_crud.mark_overdue_conditions(db_session, today) == 1
+    db_session.expire_all()
+    assert {condition.title: condition.status for condition in license_obj.conditions} == {
+        "Aberta vencida": ConditionStatus.OVERDUE,
+        "Em andamento vencida": ConditionStatus.OVERDUE,
+        "Concluída": ConditionStatus.COMPLETED,
+        "Já atrasada": ConditionStatus.OVERDUE,
+        "Vence hoje": ConditionStatus.OPEN,
+        "Futura": ConditionStatus.OPEN,
+        "Sem prazo": ConditionStatus.OPEN,
+    }
+    assert [condition.status for condition in avcb.conditions] == [
+        AvcbConditionStatus.OVERDUE,
+        AvcbConditionStatus.COMPLETED,
+    ]
+    assert license_crud.mark_overdue_conditions(db_session, today) == 0
+
+
+def test_leader_lock_is_exclusive(db_engine: Engine, tmp_path: Path) -> None:
+    first = LeaderLock(db_engine, tmp_path)
+    second = LeaderLock(db_engine, tmp_path)
+    assert first.acquire()
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
+
+
+def test_run_pending_respects_intervals_and_isolates_failures(
+    db_engine: Engine, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+
+    def fake_run_job(name: str) -> dict[str, int]:
+        calls.append(name)
+        if name == "falha":
+            raise RuntimeError("erro no job")
+        return {"ok": 1}
+
+    monkeypatch.setattr(scheduler_module, "run_job", fake_run_job)
+    scheduler = JobScheduler({"falha": 0, "horaria": 3600, "sempre": 0}, LeaderLock(db_engine, tmp_path), 1)
+    try:
+        scheduler.run_pending()
+        assert calls == ["falha", "horaria", "sempre"]
+        assert scheduler.last_results == {"horaria": {"ok": 1}, "sempre": {"ok": 1}}
+
+        scheduler.run_pending()
+        assert calls[3:] == ["falha", "sempre"]
+
+        other = JobScheduler({"sempre": 0}, LeaderLock(db_engine, tmp_path), 1)
+        other.run_pending()
+        assert calls[5:] == []
+    finally:
+        scheduler.stop()
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.schema import SchemaVersionError, check_schema_version, head_revision
+
+
+def test_check_schema_version(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    try:
+        with pytest.raises(SchemaVersionError, match="revisão inexistente"):
+            check_schema_version(engine)
+
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+            connection.execute(text("INSERT INTO alembic_version VALUES ('0001_antiga')"))
+        with pytest.raises(SchemaVersionError, match=f"revisão 0001_antiga, esperada {head_revision()}"):
+            check_schema_version(engine)
+
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE alembic_version SET version_num = :head"), {"head": head_revision()})
+        check_schema_version(engine)
+
+        # Outros erros do banco não são confundidos com "migrações nunca aplicadas".
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE alembic_version"))
+            connection.execute(text("CREATE TABLE alembic_version (revision VARCHAR(32))"))
+        with pytest.raises(OperationalError):
+            check_schema_version(engine)
+    finally:
+        engine.dispose()
@@ -0,0 +1,83 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from fpdf import FPDF
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import Avcb, DocumentText, License
+from app.services.search import document_search_service
+
+
+def _pdf(text: str) -> bytes:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.multi_cell(0, 10, text)
+    return bytes(pdf.output())
+
+
+def test_uploaded_pdf_is_indexed_and_searchable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, api_client: TestClient, db_session: Session
+) -> None:
+    monkeypatch.setattr(get_settings(), "file_storage_dir", str(tmp_path / "uploads"))
+    licenses = [
+        License(name=name, issuing_agency="ANA", expiry_date=date(2030, 1, 1)) for name in ("Outorga", "Cópia")
+    ]
+    db_session.add_all(licenses)
+    db_session.commit()
+    content = _pdf("Outorga de direito de uso para captação de água no Rio Paraíba do Sul.")
+    for license_obj in licenses:
+        response = api_client.post(
+            f"/licenses/{license_obj.id}/upload", files={"file": ("outorga.pdf", content, "application/pdf")}
+        )
+        assert response.status_code == 200
+    document_search_service.shutdown()
+
+    assert len(db_session.scalars(select(DocumentText)).all()) == 1
+
+    response = api_client.get("/search/documents", params={"q": "captação paraíba"})
+    assert response.status_code == 200
+    hits = response.json()["items"]
+    assert len(hits) == 1
+    assert "[captação]" in hits[0]["snippet"]
+    assert sorted(record["id"] for record in hits[0]["records"]) == sorted(obj.id for obj in licenses)
+    assert hits[0]["records"][0]["url"].startswith("/documents/licenses/")
+
+    assert api_client.get("/search/documents", params={"q": "caldeira"}).json()["items"] == []
+
+
+def test_reindex_backfills_existing_pdfs_and_limit_counts_only_linked_documents(
+    tmp_path: Path, api_client: TestClient, db_session: Session
+) -> None:
+    legacy_dir = tmp_path / "legado"
+    legacy_dir.mkdir()
+    paths = []
+    for index in range(3):
+        path = legacy_dir / f"laudo_{index}.pdf"
+        path.write_bytes(_pdf(f"Laudo de vistoria do corpo de bombeiros numero {index}."))
+        paths.append(str(path))
+    db_session.add_all(
+        [
+            License(name="LO antiga", issuing_agency="CETESB", expiry_date=date(2030, 1, 1), pdf_path=paths[0]),
+            Avcb(property_name="Galpão", expiry_date=date(2030, 1, 1), pdf_path=paths[1]),
+            License(
+                name="Sem arquivo", issuing_agency="CETESB", expiry_date=date(2030, 1, 1), pdf_path="/nao/existe.pdf"
+            ),
+        ]
+    )
+    # Texto indexado cujo PDF não está mais ligado a nenhum registro.
+    db_session.add(DocumentText(sha256="f" * 64, path=paths[2], content="Laudo de vistoria avulso", page_count=1))
+    db_session.commit()
+
+    stats = document_search_service.reindex(db_session)
+    assert stats == {"referenced": 3, "indexed": 2, "already_indexed": 0, "missing": 1, "unreadable": 0}
+    assert document_search_service.reindex(db_session)["already_indexed"] == 2
+
+    hits = api_client.get("/search/documents", params={"q": "vistoria", "limit": 2}).json()["items"]
+    assert sorted(hit["records"][0]["entity"] for hit in hits) == ["avcb", "licenses"]
+    hits = api_client.get("/search/documents", params={"q": "vistoria", "limit": 1}).json()["items"]
+    assert len(hits) == 1 and hits[0]["records"]
@@ -0,0 +1,65 @@
+import os
+import time
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import License, StoredFile
+from app.services.storage_gc import storage_garbage_collector
+
+OLD = time.time() - 90 * 86400
+
+
+def _write(path: Path, content: bytes = b"%PDF", mtime: float = OLD) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def storage_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "file_storage_dir", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "storage_gc_batch_size", 2)
+    return tmp_path / "uploads"
+
+
+def test_gc_removes_only_unreferenced_old_files(storage_dir: Path, db_session: Session) -> None:
+    referenced = _write(storage_dir / "licenses" / "legacy.pdf")
+    shared = _write(storage_dir / "objects" / "aa" / "bb" / "aabb.pdf")
+    orphan_object = _write(storage_dir / "objects" / "cc" / "dd" / "ccdd.pdf", b"%PDF orphan")
+    orphan_legacy = _write(storage_dir / "avcb" / "lost.pdf")
+    fresh_upload = _write(storage_dir / "objects" / ".tmp" / "upload-1.part", mtime=time.time())
+    old_report = _write(storage_dir / "reports" / "licenses_2020-01-01.pdf")
+    recent_report = _write(storage_dir / "reports" / "licenses_today.pdf", mtime=time.time() - 86400)
+    lock_file = _write(storage_dir / ".scheduler.lock")
+
+    db_session.add(License(name="L", issuing_agency="IBAMA", expiry_date=date(2030, 1, 1), pdf_path=str(referenced)))
+    db_session.add_all(
+        [
+            StoredFile(sha256="aabb", path=str(shared), size=4, ref_count=1),
+            StoredFile(sha256="ccdd", path=str(orphan_object), size=11, ref_count=0),
+        ]
+    )
+    db_session.commit()
+
+    preview = storage_garbage_collector.collect(db_session, dry_run=True)
+    assert preview["orphaned"] == 3
+    assert preview["deleted"] == 0
+    assert orphan_object.exists() and orphan_legacy.exists() and old_report.exists()
+
+    stats = storage_garbage_collector.collect(db_session)
+
+    assert stats["scanned"] == 7
+    assert stats["referenced"] == 2
+    assert stats["recent"] == 2
+    assert stats["deleted"] == 3
+    assert stats["freed_bytes"] == 19
+    assert stats["stale_rows"] == 1
+    assert not orphan_object.exists() and not orphan_legacy.exists() and not old_report.exists()
+    assert all(path.exists() for path in (referenced, shared, fresh_upload, recent_report, lock_file))
+    assert db_session.get(StoredFile, "ccdd") is None